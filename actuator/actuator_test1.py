@@ -1,53 +1,33 @@
-import lgpio as GPIO
 from time import sleep
 
-#define the pin for drv8833#1
-NSLEEP1 = 12  #Enabling signal pin for drv8833
-AN11 = 17
-AN12 = 27
-BN11 = 22
-BN12 = 23
-#define the pin for drv8833#2
-NSLEEP2 = 13
-AN21 = 24
-AN22 = 25
-BN21 = 26
-BN22 = 16
-
-h = None
+from hardware import gpio_registry
+from suction.drv8833 import DRV8833, PINS
+from suction.pwm_ramp import PwmRamp
+
+RAMP_TIME = 0.5  #seconds for a speed change to reach its new duty cycle
+
+claim = None
 temp1=1
-p1 = None
-p2 = None
+
+def _setup(h):
+    #Claim NSLEEP1/2 and AN11..BN22 as one group so the motors start stopped
+    drv = DRV8833(h, duty=20)
+    ramp = PwmRamp(drv)
+    ramp.start()
+    return drv, ramp
+
+def _teardown(device):
+    #Stop the ramp thread before the PWM and direction lines are freed
+    drv, ramp = device
+    ramp.stop()
+    drv.close()
 
 def init():
 
-    global h, p1, p2, temp1
-    h = GPIO.gpiochip_open(0)
-
-    #Define pin as output signal
-    GPIO.gpio_claim_output(h, NSLEEP1)
-    GPIO.gpio_claim_output(h, NSLEEP2)
-    GPIO.gpio_claim_output(h, AN11)
-    GPIO.gpio_claim_output(h, AN12)
-    GPIO.gpio_claim_output(h, BN11)
-    GPIO.gpio_claim_output(h, BN12)
-    GPIO.gpio_claim_output(h, AN21)
-    GPIO.gpio_claim_output(h, AN22)
-    GPIO.gpio_claim_output(h, BN21)
-    GPIO.gpio_claim_output(h, BN22)
-
-    #Initialize the motor drive signal so that the motor is in a stopped state
-    GPIO.gpio_write(h, AN11, 0)
-    GPIO.gpio_write(h, AN12, 0)
-    GPIO.gpio_write(h, BN11, 0)
-    GPIO.gpio_write(h, BN12, 0)
-    GPIO.gpio_write(h, AN21, 0)
-    GPIO.gpio_write(h, AN22, 0)
-    GPIO.gpio_write(h, BN21, 0)
-    GPIO.gpio_write(h, BN22, 0)
-
-    p1=GPIO.tx_pwm(h, NSLEEP1, 1000, 20)#Define p1 as a pulse signal of 1000 Hz and duty cycle of 30%
-    p2=GPIO.tx_pwm(h, NSLEEP2, 1000, 20)#Define p2 as a pulse signal of 1000 Hz and duty cycle of 30%
+    global claim
+    #Reserve the motor HAT pins; the shared gpiochip handle is opened and the
+    #driver set up the first time a motor command is sent
+    claim = gpio_registry.declare("motor_hat", reserved=PINS, setup=_setup, teardown=_teardown)
 
 
 print("\n")
@@ -57,98 +37,76 @@ print("\n")
 
 def control_motor(x):
 
-    global p1, p2, temp1
+    global claim, temp1
 
-    if h is None:
+    if claim is None:
         raise RuntimeError("Motor system not initialized. Call init() first.")
+    drv, ramp = claim.device
 
-    
+    # every direction command is a single masked group write across both bridges
     if x=='r':
         print("run")
         if(temp1==1):
-         GPIO.gpio_write(h, AN11, 1)
-         GPIO.gpio_write(h, AN12, 0)
-         GPIO.gpio_write(h, BN11, 1)
-         GPIO.gpio_write(h, BN12, 0)
-         GPIO.gpio_write(h, AN21, 1)
-         GPIO.gpio_write(h, AN22, 0)
-         GPIO.gpio_write(h, BN21, 1)
-         GPIO.gpio_write(h, BN22, 0)
+         drv.set_all('f')
          x='z'
         else:
-         GPIO.gpio_write(h, AN11, 0)
-         GPIO.gpio_write(h, AN12, 1)
-         GPIO.gpio_write(h, BN11, 0)
-         GPIO.gpio_write(h, BN12, 1)
-         GPIO.gpio_write(h, AN21, 0)
-         GPIO.gpio_write(h, AN22, 1)
-         GPIO.gpio_write(h, BN21, 0)
-         GPIO.gpio_write(h, BN22, 1)
+         drv.set_all('b')
          print("forward")
          x='z'
 
 
     elif x=='s':
         print("stop")
-        GPIO.gpio_write(h, AN11, 0)
-        GPIO.gpio_write(h, AN12, 0)
-        GPIO.gpio_write(h, BN11, 0)
-        GPIO.gpio_write(h, BN12, 0)
-        GPIO.gpio_write(h, AN21, 0)
-        GPIO.gpio_write(h, AN22, 0)
-        GPIO.gpio_write(h, BN21, 0)
-        GPIO.gpio_write(h, BN22, 0)
+        drv.stop()
         x='z'
 
     elif x=='b':
         print("backward")
-        GPIO.gpio_write(h, AN11, 0)
-        GPIO.gpio_write(h, AN12, 1)
-        GPIO.gpio_write(h, BN11, 0)
-        GPIO.gpio_write(h, BN12, 1)
-        GPIO.gpio_write(h, AN21, 0)
-        GPIO.gpio_write(h, AN22, 1)
-        GPIO.gpio_write(h, BN21, 0)
-        GPIO.gpio_write(h, BN22, 1)
+        drv.set_all('b')
         temp1=0
         x='z'
 
     elif x=='f':
         print("forward")
-        GPIO.gpio_write(h, AN11, 1)
-        GPIO.gpio_write(h, AN12, 0)
-        GPIO.gpio_write(h, BN11, 1)
-        GPIO.gpio_write(h, BN12, 0)
-        GPIO.gpio_write(h, AN21, 1)
-        GPIO.gpio_write(h, AN22, 0)
-        GPIO.gpio_write(h, BN21, 1)
-        GPIO.gpio_write(h, BN22, 0)
+        drv.set_all('f')
         temp1=1
         x='z'
         
     elif x=='l':
         print("low")
-        p1=GPIO.tx_pwm(h, NSLEEP1, 1000, 30) #Set the P1 pulse signal duty cycle to 30%
-        p2=GPIO.tx_pwm(h, NSLEEP2, 1000, 30) #Set the P2 pulse signal duty cycle to 30%
+        ramp.ramp_all(30, RAMP_TIME) #Ramp the NSLEEP1/NSLEEP2 pulse signal duty cycle to 30%
         x='z'
     elif x=='m':
         print("medium")
-        p1=GPIO.tx_pwm(h, NSLEEP1, 1000, 60) #Set the P1 pulse signal duty cycle to 60%
-        p2=GPIO.tx_pwm(h, NSLEEP2, 1000, 60) #Set the P2 pulse signal duty cycle to 60%
+        ramp.ramp_all(60, RAMP_TIME) #Ramp the NSLEEP1/NSLEEP2 pulse signal duty cycle to 60%
         x='z'
     elif x=='h':
         print("high")
-        p1=GPIO.tx_pwm(h, NSLEEP1, 1000, 90) #Set the P1 pulse signal duty cycle to 90%
-        p2=GPIO.tx_pwm(h, NSLEEP2, 1000, 90) #Set the P2 pulse signal duty cycle to 90%
+        ramp.ramp_all(90, RAMP_TIME) #Ramp the NSLEEP1/NSLEEP2 pulse signal duty cycle to 90%
         x='z'
     elif x=='e':
-        GPIO.gpiochip_close(h)
+        # release() stops the ramp and closes the driver (_teardown)
+        claim.release()
+        claim = None
         print("User stopped")
     else:
         print("<<<  wrong data  >>>")
         print("please enter the defined data to continue.....")
 
 
+def set_duty(duty, ramp_time=RAMP_TIME, channel=None):
+    #ramp NSLEEP1 (channel 1), NSLEEP2 (channel 2) or both to any duty cycle 0-100%
+    #without blocking, e.g. to spin up while the arm is still moving
+    if claim is None:
+        raise RuntimeError("Motor system not initialized. Call init() first.")
+    drv, ramp = claim.device
+
+    if channel is None:
+        ramp.ramp_all(duty, ramp_time)
+    else:
+        ramp.ramp(channel, duty, ramp_time)
+
+
 
 init()
 control_motor("h")
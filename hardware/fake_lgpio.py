@@ -0,0 +1,187 @@
+# Stand-in for the lgpio module so the benchmarks can run off the Pi.
+#
+# Every call counts as one syscall and spins for `syscall_us`; opening the
+# chip costs `open_ms`. Pin levels and groups are tracked so callers can
+# check what would have reached the hardware. add_echo() wires a simulated
+# HC-SR04 to a TRIG/ECHO pair: the ECHO level follows the pulse and alert
+# callbacks get exact edge timestamps, like the kernel's.
+#
+#   from hardware import fake_lgpio
+#   GPIO = fake_lgpio.install(5.0)   # 5 us per lgpio call
+
+import random
+import sys
+import threading
+import time
+
+BOTH_EDGES = 3
+RISING_EDGE = 1
+FALLING_EDGE = 2
+
+syscall_us = 0.0
+open_ms = 0.0
+calls = 0
+opened = 0
+levels = {}
+groups = {}
+callbacks = {}   # gpio -> [(edge, func)]
+echoes = {}      # trig -> (echo, distance_fn, jitter_us)
+pulses = {}      # echo -> (t_rise_ns, t_fall_ns) of the latest echo pulse
+
+
+def install(syscall_cost_us=0.0, open_cost_ms=0.0):
+    """Register this module as `lgpio` and reset its counters."""
+    global syscall_us, open_ms
+    syscall_us = syscall_cost_us
+    open_ms = open_cost_ms
+    reset()
+    sys.modules["lgpio"] = sys.modules[__name__]
+    return sys.modules[__name__]
+
+
+def reset():
+    global calls, opened
+    calls = 0
+    opened = 0
+    levels.clear()
+    groups.clear()
+    callbacks.clear()
+    echoes.clear()
+    pulses.clear()
+
+
+def _spin(seconds):
+    t_end = time.perf_counter() + seconds
+    while time.perf_counter() < t_end:
+        pass
+
+
+def _syscall():
+    global calls
+    calls += 1
+    if syscall_us:
+        _spin(syscall_us / 1e6)
+
+
+def gpiochip_open(chip):
+    global opened
+    _syscall()
+    _spin(open_ms / 1e3)
+    opened += 1
+    return opened
+
+
+def gpiochip_close(h):
+    _syscall()
+
+
+def gpio_claim_output(h, gpio, level=0, lFlags=0):
+    _syscall()
+    levels[gpio] = level
+
+
+def gpio_claim_input(h, gpio, lFlags=0):
+    _syscall()
+    levels.setdefault(gpio, 0)
+
+
+def gpio_free(h, gpio):
+    _syscall()
+
+
+def gpio_write(h, gpio, level):
+    _syscall()
+    was = levels.get(gpio, 0)
+    levels[gpio] = level
+    if gpio in echoes and was == 1 and level == 0:
+        _fire_echo(*echoes[gpio])
+
+
+def gpio_read(h, gpio):
+    _syscall()
+    if gpio in pulses:
+        # echo levels follow the clock, not the (GIL-bound) pulse thread
+        t_rise, t_fall = pulses[gpio]
+        return int(t_rise <= time.monotonic_ns() < t_fall)
+    return levels.get(gpio, 0)
+
+
+def group_claim_output(h, gpios, levels_=[0], lFlags=0):
+    _syscall()
+    groups[gpios[0]] = list(gpios)
+    for i, gpio in enumerate(gpios):
+        levels[gpio] = levels_[i] if i < len(levels_) else 0
+
+
+def group_free(h, gpio):
+    _syscall()
+    groups.pop(gpio, None)
+
+
+def group_write(h, gpio, bits, mask=0xFFFFFFFFFFFFFFFF):
+    _syscall()
+    for i, pin in enumerate(groups[gpio]):
+        if mask >> i & 1:
+            levels[pin] = bits >> i & 1
+
+
+def tx_pwm(h, gpio, freq, duty, offset=0, cycles=0):
+    _syscall()
+    return 0
+
+
+def gpio_claim_alert(h, gpio, eFlags, lFlags=0, notify_handle=None):
+    _syscall()
+    levels.setdefault(gpio, 0)
+
+
+class _Callback:
+    def __init__(self, gpio, entry):
+        self.gpio = gpio
+        self.entry = entry
+
+    def cancel(self):
+        if self.entry in callbacks.get(self.gpio, []):
+            callbacks[self.gpio].remove(self.entry)
+
+
+def callback(h, gpio, edge=RISING_EDGE, func=None):
+    entry = (edge, func)
+    callbacks.setdefault(gpio, []).append(entry)
+    return _Callback(gpio, entry)
+
+
+# ── Simulated HC-SR04 ─────────────────────────────────────────
+ECHO_DELAY_US = 450   # trigger falling edge to echo rising edge
+
+
+def add_echo(trig, echo, distance_fn, jitter_us=0.0):
+    """Answer each TRIG pulse on `trig` with an echo pulse on `echo`.
+
+    `distance_fn()` returns the true distance in cm for the next ping, or
+    None for a missed echo (ECHO never rises).
+    """
+    echoes[trig] = (echo, distance_fn, jitter_us)
+    levels.setdefault(echo, 0)
+
+
+def _fire_echo(echo, distance_fn, jitter_us):
+    distance = distance_fn()
+    if distance is None:
+        return
+    t_rise = time.monotonic_ns() + ECHO_DELAY_US * 1000
+    width_ns = int(distance / 17150 * 1e9 + random.gauss(0, jitter_us) * 1000)
+    pulses[echo] = (t_rise, t_rise + width_ns)
+    threading.Thread(target=_echo_pulse, args=(echo, t_rise, t_rise + width_ns), daemon=True).start()
+
+
+def _echo_pulse(echo, t_rise, t_fall):
+    for level, t_ns in ((1, t_rise), (0, t_fall)):
+        delay = (t_ns - time.monotonic_ns()) / 1e9
+        if delay > 0:
+            time.sleep(delay)
+        levels[echo] = level
+        edge = RISING_EDGE if level else FALLING_EDGE
+        for want, func in list(callbacks.get(echo, [])):
+            if want & edge:
+                func(0, echo, level, t_ns)
@@ -0,0 +1,153 @@
+# Process-wide registry for the Pi's gpiochip.
+#
+# Device modules declare the pins they need at import time, which is cheap
+# and catches pin conflicts between devices (e.g. the xarm_ultra sensor on
+# 23/24 vs BN12/AN21 of the motor HAT). The chip is opened once, on first
+# use, and each device's lines are only claimed when that device is first
+# touched, so composite scripts don't pay for hardware a run never uses.
+#
+# Set HOPE_GPIO_REGISTRY=0 to get the old behaviour back (one gpiochip
+# handle per device, everything claimed up front) for startup comparisons.
+
+import os
+import threading
+
+import lgpio as GPIO
+
+CHIP = 0
+ENABLED = os.environ.get("HOPE_GPIO_REGISTRY", "1") != "0"
+
+_lock = threading.RLock()
+_handle = None
+_owners = {}   # pin -> claim name
+_claims = {}   # claim name -> Claim
+
+
+class PinConflictError(RuntimeError):
+    pass
+
+
+def handle():
+    """Return the shared gpiochip handle, opening the chip on first call."""
+    global _handle
+    with _lock:
+        if _handle is None:
+            _handle = GPIO.gpiochip_open(CHIP)
+        return _handle
+
+
+class Claim:
+    """Pins reserved by one device; lines are claimed on first use.
+
+    `outputs` and `inputs` are claimed by the registry. `reserved` pins are
+    only protected against conflicts, for devices that claim their own lines
+    (lgpio groups, alerts, PWM). `setup(h)` runs once after the claim and its
+    result is available as `device`; release() undoes it with
+    `teardown(device)`, or `device.close()` if no teardown was given.
+    """
+
+    def __init__(self, name, outputs=(), inputs=(), reserved=(), setup=None, teardown=None):
+        self.name = name
+        self.outputs = list(outputs)
+        self.inputs = list(inputs)
+        self.reserved = list(reserved)
+        self.setup = setup
+        self.teardown = teardown
+        self.claimed = False
+        self._h = None
+        self._device = None
+
+    @property
+    def pins(self):
+        return self.outputs + self.inputs + self.reserved
+
+    @property
+    def h(self):
+        if not self.claimed:
+            self._claim()
+        return self._h
+
+    @property
+    def device(self):
+        if not self.claimed:
+            self._claim()
+        return self._device
+
+    def _claim(self):
+        with _lock:
+            if self.claimed:
+                return
+            h = handle() if ENABLED else GPIO.gpiochip_open(CHIP)
+            for pin in self.outputs:
+                GPIO.gpio_claim_output(h, pin)
+            for pin in self.inputs:
+                GPIO.gpio_claim_input(h, pin)
+            self._h = h
+            self.claimed = True
+            if self.setup is not None:
+                self._device = self.setup(h)
+
+    def release(self):
+        """Stop the device, free its lines and give its pins back to the registry."""
+        with _lock:
+            if self.claimed:
+                try:
+                    if self.teardown is not None:
+                        self.teardown(self._device)
+                    elif hasattr(self._device, "close"):
+                        self._device.close()
+                finally:
+                    for pin in self.outputs + self.inputs:
+                        GPIO.gpio_free(self._h, pin)
+                    if not ENABLED:
+                        GPIO.gpiochip_close(self._h)
+            self.claimed = False
+            self._h = None
+            self._device = None
+            for pin in self.pins:
+                if _owners.get(pin) == self.name:
+                    del _owners[pin]
+            _claims.pop(self.name, None)
+
+
+def declare(name, outputs=(), inputs=(), reserved=(), setup=None, teardown=None):
+    """Reserve pins for device `name` and return its (lazy) Claim.
+
+    Declaring the same name twice with the same pins, setup and teardown
+    returns the existing claim; anything different raises PinConflictError,
+    as does a pin already held by another device.
+    """
+    with _lock:
+        if name in _claims:
+            claim = _claims[name]
+            if (claim.outputs, claim.inputs, claim.reserved, claim.setup, claim.teardown) != \
+                    (list(outputs), list(inputs), list(reserved), setup, teardown):
+                raise PinConflictError(f"{name} is already declared with different pins or setup")
+            return claim
+        claim = Claim(name, outputs, inputs, reserved, setup, teardown)
+        taken = {pin: _owners[pin] for pin in claim.pins if pin in _owners}
+        if taken:
+            details = ", ".join(f"GPIO{pin} ({owner})" for pin, owner in sorted(taken.items()))
+            raise PinConflictError(f"{name} needs pins already claimed: {details}")
+        for pin in claim.pins:
+            _owners[pin] = name
+        _claims[name] = claim
+        if not ENABLED:
+            claim._claim()
+        return claim
+
+
+def owner(pin):
+    with _lock:
+        return _owners.get(pin)
+
+
+def close():
+    """Release every claim and close the shared chip handle."""
+    global _handle
+    with _lock:
+        for claim in list(_claims.values()):
+            claim.release()
+        if _handle is not None:
+            GPIO.gpiochip_close(_handle)
+            _handle = None
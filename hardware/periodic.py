@@ -0,0 +1,92 @@
+# Fixed-rate loop timing on absolute deadlines.
+#
+# A loop of `work(); time.sleep(interval)` runs at interval + work time, so
+# its rate drifts with load (a CMD_VEL keep-alive at 5 Hz loses margin on
+# the Teensy's 500 ms watchdog every time a write is slow). Periodic sleeps
+# until t0 + k * period on the monotonic clock instead; a slow iteration
+# makes the next one start sooner rather than pushing every later one back.
+# If a whole period is lost, the skipped deadlines are counted as missed and
+# the loop rejoins the grid instead of firing a burst to catch up.
+#
+#   timer = Periodic(5)
+#   for _ in timer.ticks(2.5):
+#       ser.write(b"CMD_VEL 0.1 0 0\n")
+#   print(timer.summary())
+
+import time
+
+
+class Periodic:
+    """Deadline-driven timer for one fixed-rate loop, with timing stats."""
+
+    def __init__(self, hz, clock=time.monotonic, sleep=time.sleep):
+        if hz <= 0:
+            raise ValueError(f"rate must be positive, got {hz}")
+        self.period = 1.0 / hz
+        self.clock = clock
+        self.sleep = sleep
+        self.deadline = None
+        self.reset()
+
+    def reset(self):
+        """Forget the schedule and the stats; the next wait() starts a new grid."""
+        self.deadline = None
+        self.count = 0         # ticks run
+        self.missed = 0        # deadlines skipped because a whole period was lost
+        self.late_sum = 0.0
+        self.late_max = 0.0
+        self.worst_gap = 0.0   # longest time between two ticks
+        self.last = None
+
+    def wait(self):
+        """Sleep until the next deadline and return how late this tick is (s)."""
+        now = self.clock()
+        if self.deadline is None:
+            self.deadline = now
+        elif now < self.deadline:
+            self.sleep(self.deadline - now)
+            now = self.clock()
+        late = now - self.deadline
+        # rejoin the grid at the newest deadline already passed
+        skipped = max(0, int(late // self.period))
+        self.missed += skipped
+        self.deadline += (skipped + 1) * self.period
+
+        self.count += 1
+        self.late_sum += late
+        self.late_max = max(self.late_max, late)
+        if self.last is not None:
+            self.worst_gap = max(self.worst_gap, now - self.last)
+        self.last = now
+        return late
+
+    def ticks(self, duration=None):
+        """Yield the tick number on every deadline for `duration` seconds
+        (forever if None), then sleep out the rest of the duration."""
+        self.wait()
+        t_end = None if duration is None else self.last + duration
+        k = 0
+        while True:
+            yield k
+            k += 1
+            # a little slack so float error can't add a tick at t_end
+            if t_end is not None and self.deadline >= t_end - 1e-9:
+                break
+            self.wait()
+        remaining = t_end - self.clock()
+        if remaining > 0:
+            self.sleep(remaining)
+
+    @property
+    def late_mean(self):
+        return self.late_sum / self.count if self.count else 0.0
+
+    @property
+    def stats(self):
+        return {"ticks": self.count, "missed": self.missed, "late_mean": self.late_mean,
+                "late_max": self.late_max, "worst_gap": self.worst_gap}
+
+    def summary(self):
+        return (f"{self.count} ticks at {1.0 / self.period:g} Hz, "
+                f"late mean {self.late_mean * 1000:.2f} ms / max {self.late_max * 1000:.2f} ms, "
+                f"{self.missed} missed, worst gap {self.worst_gap * 1000:.1f} ms")
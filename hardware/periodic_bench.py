@@ -0,0 +1,71 @@
+# Keep-alive timing: write-then-sleep loop vs Periodic.
+#
+# Each tick "writes" for a random 2-40 ms (a loaded Pi, a USB-serial
+# hiccup), once in a while stalls for STALL_S. The sleep loop's period is
+# interval + write time, so its rate drops and its gaps grow with the
+# write time; Periodic holds the rate and only the stall itself shows up
+# as a long gap, counted as missed deadlines.
+#
+#   python3 -m hardware.periodic_bench [seconds]
+
+import random
+import sys
+import time
+
+import numpy as np
+
+from hardware.periodic import Periodic
+
+HZ = 5
+DURATION = 5.0
+WATCHDOG = 0.5
+STALL_EVERY = 12
+STALL_S = 0.35
+
+
+def write(i, rng):
+    time.sleep(STALL_S if i % STALL_EVERY == STALL_EVERY - 1 else rng.uniform(0.002, 0.040))
+
+
+def sleep_loop(duration, rng):
+    # send_vel() before
+    times = []
+    interval = 1.0 / HZ
+    t0 = time.time()
+    i = 0
+    while time.time() - t0 < duration:
+        times.append(time.monotonic())
+        write(i, rng)
+        i += 1
+        time.sleep(interval)
+    return times
+
+
+def periodic_loop(duration, rng):
+    times = []
+    timer = Periodic(HZ)
+    for i in timer.ticks(duration):
+        times.append(time.monotonic())
+        write(i, rng)
+    return times, timer
+
+
+def report(name, times, duration):
+    gaps = np.diff(times)
+    print(f"  {name:10s}: {len(times)} sent ({len(times) / duration:.2f} Hz), "
+          f"gap mean {gaps.mean() * 1000:6.1f} ms, worst {gaps.max() * 1000:6.1f} ms, "
+          f"{np.sum(gaps > WATCHDOG * 0.8)} gaps within 20% of the watchdog")
+
+
+def main():
+    duration = float(sys.argv[1]) if len(sys.argv) > 1 else DURATION
+    old = sleep_loop(duration, random.Random(1))
+    new, timer = periodic_loop(duration, random.Random(1))
+    print(f"{HZ} Hz keep-alive for {duration:.1f} s, 2-40 ms writes, a {STALL_S * 1000:.0f} ms stall every {STALL_EVERY}")
+    report("sleep loop", old, duration)
+    report("Periodic", new, duration)
+    print(f"  Periodic stats: {timer.summary()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# Startup cost of a composite script with the GPIO registry on and off.
+#
+# Each mode runs in a fresh interpreter on hardware.fake_lgpio, doing what
+# x_s_u_abdomen1.py does before its first arm move: import the suction and
+# ultrasonic modules and call suction_test1.init(). It then times the first
+# motor command, which is where the registry pays for the lazy claim.
+#
+#   python -m hardware.registry_bench [open_ms] [syscall_us]
+
+import json
+import os
+import subprocess
+import sys
+
+OPEN_MS = 5.0
+SYSCALL_US = 20.0
+
+CHILD = """
+import contextlib, io, json, sys, time
+from hardware import fake_lgpio
+GPIO = fake_lgpio.install({syscall_us}, {open_ms})
+t0 = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+    from suction import suction_test1
+    from ultrasonic import ultrasonic_test2
+    suction_test1.init()
+t_ready = time.perf_counter()
+calls_ready = GPIO.calls
+with contextlib.redirect_stdout(io.StringIO()):
+    suction_test1.control_motor("s")
+t_first = time.perf_counter()
+print(json.dumps({{
+    "startup_ms": (t_ready - t0) * 1e3,
+    "first_command_ms": (t_first - t_ready) * 1e3,
+    "handles": GPIO.opened,
+    "calls_at_startup": calls_ready,
+}}))
+"""
+
+
+def run(enabled, open_ms, syscall_us):
+    env = dict(os.environ, HOPE_GPIO_REGISTRY="1" if enabled else "0")
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    out = subprocess.run(
+        [sys.executable, "-c", CHILD.format(open_ms=open_ms, syscall_us=syscall_us)],
+        cwd=root, env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    open_ms = float(sys.argv[1]) if len(sys.argv) > 1 else OPEN_MS
+    syscall_us = float(sys.argv[2]) if len(sys.argv) > 2 else SYSCALL_US
+
+    print(f"mock gpiochip_open: {open_ms:.1f} ms, syscall: {syscall_us:.1f} us")
+    for enabled in (False, True):
+        r = run(enabled, open_ms, syscall_us)
+        label = "registry on " if enabled else "registry off"
+        print(f"  {label}: startup {r['startup_ms']:7.2f} ms  "
+              f"first command {r['first_command_ms']:6.2f} ms  "
+              f"{r['handles']} chip handle(s)  {r['calls_at_startup']} lgpio calls at startup")
+
+
+if __name__ == "__main__":
+    main()
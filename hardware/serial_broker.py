@@ -0,0 +1,428 @@
+#!/usr/bin/env python3
+"""
+serial_broker.py
+Long-lived owner of the robot's serial ports, shared over a Unix socket.
+
+PURPOSE: The Teensy and the Arduinos reset when their port is opened, so
+         every script that opens /dev/ttyACM0 itself waits ~2 s, and two
+         scripts can't use the same board at once. Run the broker once; it
+         opens each port on first use (paying the reset wait once, on a
+         worker thread so the ports already open keep flowing) and keeps
+         it open. Clients connect to SOCKET_PATH and name a port:
+
+           client -> broker   OPEN <device> <baud>\n
+           broker -> client   OK\n   (or ERR <reason>\n and the connection closes)
+
+         OK is held until the port is open and past its reset wait. After
+         it, everything the client sends is written to the port (each
+         write whole, so commands from several clients don't interleave)
+         and every line the board prints is sent to all clients of that
+         port. A client that stops reading is dropped once MAX_BACKLOG
+         bytes are waiting for it, so it can't stall the others.
+
+         open_serial() is the drop-in for `serial.Serial(...); time.sleep(2)`:
+         it returns a BrokerPort (readline/read/write/in_waiting/
+         reset_input_buffer/fileno/close, like serial.Serial) when the
+         broker is running, otherwise opens the port directly and waits out
+         the reset.
+
+USAGE:
+    python3 -m hardware.serial_broker [/dev/ttyACM0:115200 ...]   # pre-open ports
+
+    ser = open_serial("/dev/ttyACM0", 115200, timeout=0.1)
+"""
+
+import argparse
+import os
+import queue
+import select
+import selectors
+import socket
+import threading
+import time
+
+import serial
+
+# ── Configuration ─────────────────────────────────────────────
+SOCKET_PATH = "/tmp/hope_serial_broker.sock"
+RESET_WAIT = 2.0                 # s, boards reset when the port opens
+HANDSHAKE_TIMEOUT = RESET_WAIT + 3.0
+MAX_BACKLOG = 1 << 20            # bytes queued for one client before it is dropped
+
+
+class _Port:
+    def __init__(self, device, baud):
+        self.device = device
+        self.baud = baud
+        self.ser = None          # serial.Serial once open and past the reset wait
+        self.clients = set()
+        self.waiting = []        # clients whose OK waits for the port to open
+        self.partial = b""       # bytes after the last complete line
+
+
+class _Client:
+    def __init__(self, sock):
+        self.sock = sock
+        self.port = None         # _Port once OPEN succeeded
+        self.opening = None      # _Port it waits on while that opens
+        self.inbuf = b""         # handshake bytes, then anything sent before OK
+        self.outbuf = b""        # lines not yet accepted by the socket
+
+
+class SerialBroker:
+    """Holds serial ports open and multiplexes them to socket clients."""
+
+    def __init__(self, path=SOCKET_PATH, reset_wait=RESET_WAIT, sleep=time.sleep):
+        self.path = path
+        self.reset_wait = reset_wait
+        self.sleep = sleep
+        self.ports = {}          # device -> _Port
+        self.running = True
+        if os.path.exists(path):
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(path)
+            except OSError:
+                os.unlink(path)  # left behind by a broker that died
+            else:
+                raise RuntimeError(f"a serial broker is already running on {path}")
+            finally:
+                probe.close()
+        self.listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.listener.bind(path)
+        self.listener.listen()
+        self.listener.setblocking(False)
+        self.selector = selectors.DefaultSelector()
+        self.selector.register(self.listener, selectors.EVENT_READ, None)
+        # opener threads hand their result back through _opened and wake the loop
+        self._opened = queue.Queue()
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self.selector.register(self._wake_r, selectors.EVENT_READ, self._opened)
+
+    # ── Ports ──
+    def open_port(self, device, baud):
+        """The _Port for device; a new one is opened on a worker thread and
+        has ser None until it is ready."""
+        port = self.ports.get(device)
+        if port is not None:
+            if port.baud != baud:
+                raise ValueError(f"{device} is open at {port.baud} baud, not {baud}")
+            return port
+        port = _Port(device, baud)
+        self.ports[device] = port
+        threading.Thread(target=self._open, args=(port,), daemon=True).start()
+        return port
+
+    def _open(self, port):
+        # worker thread: the open and the reset wait stay off the select loop
+        try:
+            result = serial.Serial(port.device, port.baud, timeout=0)
+            self.sleep(self.reset_wait)
+        except (serial.SerialException, OSError) as e:
+            result = e
+        self._opened.put((port, result))
+        try:
+            self._wake_w.send(b"\0")
+        except OSError:
+            pass                 # broker closed meanwhile; _on_opened won't run
+
+    def _on_opened(self):
+        try:
+            self._wake_r.recv(4096)
+        except BlockingIOError:
+            pass
+        while not self._opened.empty():
+            port, result = self._opened.get_nowait()
+            waiting, port.waiting = port.waiting, []
+            if isinstance(result, Exception):
+                del self.ports[port.device]
+                for client in waiting:
+                    client.opening = None
+                    self._queue(client, f"ERR {result}\n".encode())
+                    self._drop(client)
+                continue
+            port.ser = result
+            self.selector.register(result.fileno(), selectors.EVENT_READ, port)
+            print(f"serial_broker: opened {port.device} at {port.baud} baud")
+            for client in waiting:
+                self._admit(client, port)
+
+    def _close_port(self, port):
+        self.selector.unregister(port.ser.fileno())
+        port.ser.close()
+        del self.ports[port.device]
+        for client in list(port.clients):
+            self._drop(client)
+        print(f"serial_broker: lost {port.device}")
+
+    def _on_port(self, port):
+        try:
+            data = port.ser.read(port.ser.in_waiting or 1)
+        except (serial.SerialException, OSError):
+            self._close_port(port)
+            return
+        data = port.partial + data
+        end = data.rfind(b"\n") + 1
+        port.partial = data[end:]
+        if end:
+            for client in list(port.clients):
+                self._queue(client, data[:end])
+
+    # ── Clients ──
+    def _accept(self):
+        sock, _ = self.listener.accept()
+        sock.setblocking(False)
+        self.selector.register(sock, selectors.EVENT_READ, _Client(sock))
+
+    def _on_client(self, client, mask):
+        if mask & selectors.EVENT_WRITE:
+            self._flush(client)
+        if not mask & selectors.EVENT_READ:
+            return
+        try:
+            data = client.sock.recv(65536)
+        except OSError:
+            data = b""
+        if not data:
+            self._drop(client)
+            return
+        if client.port is None:
+            client.inbuf += data
+            if client.opening is None and b"\n" in client.inbuf:
+                line, client.inbuf = client.inbuf.split(b"\n", 1)
+                self._handshake(client, line.decode("utf-8", errors="replace").split())
+            return
+        self._write(client.port, data)
+
+    def _write(self, port, data):
+        try:
+            port.ser.write(data)
+        except (serial.SerialException, OSError):
+            self._close_port(port)
+
+    def _handshake(self, client, words):
+        try:
+            if len(words) != 3 or words[0] != "OPEN":
+                raise ValueError(f"expected 'OPEN <device> <baud>', got {' '.join(words)!r}")
+            port = self.open_port(words[1], int(words[2]))
+        except ValueError as e:
+            self._queue(client, f"ERR {e}\n".encode())
+            self._drop(client)
+            return
+        if port.ser is None:
+            client.opening = port
+            port.waiting.append(client)
+        else:
+            self._admit(client, port)
+
+    def _admit(self, client, port):
+        client.opening = None
+        client.port = port
+        port.clients.add(client)
+        self._queue(client, b"OK\n")
+        data, client.inbuf = client.inbuf, b""
+        if data and port.device in self.ports:
+            self._write(port, data)
+
+    def _queue(self, client, data):
+        client.outbuf += data
+        self._flush(client)
+        if len(client.outbuf) > MAX_BACKLOG:
+            self._drop(client)
+
+    def _flush(self, client):
+        try:
+            sent = client.sock.send(client.outbuf) if client.outbuf else 0
+        except BlockingIOError:
+            sent = 0
+        except OSError:
+            self._drop(client)
+            return
+        client.outbuf = client.outbuf[sent:]
+        events = selectors.EVENT_READ | (selectors.EVENT_WRITE if client.outbuf else 0)
+        try:
+            self.selector.modify(client.sock, events, client)
+        except (KeyError, ValueError):
+            pass                 # already dropped
+
+    def _drop(self, client):
+        if client.port is not None:
+            client.port.clients.discard(client)
+        if client.opening is not None and client in client.opening.waiting:
+            client.opening.waiting.remove(client)
+        try:
+            self.selector.unregister(client.sock)
+        except (KeyError, ValueError):
+            pass
+        client.sock.close()
+
+    # ── Loop ──
+    def serve_forever(self):
+        while self.running:
+            for key, mask in self.selector.select(timeout=0.5):
+                if key.data is None:
+                    self._accept()
+                elif key.data is self._opened:
+                    self._on_opened()
+                elif isinstance(key.data, _Port):
+                    if key.data.device in self.ports:
+                        self._on_port(key.data)
+                elif key.fileobj.fileno() >= 0:
+                    self._on_client(key.data, mask)
+
+    def close(self):
+        self.running = False
+        for key in list(self.selector.get_map().values()):
+            if isinstance(key.data, _Client):
+                self._drop(key.data)
+        for port in list(self.ports.values()):
+            if port.ser is not None:
+                self.selector.unregister(port.ser.fileno())
+                port.ser.close()
+        self.ports.clear()
+        while not self._opened.empty():
+            _, result = self._opened.get_nowait()
+            if not isinstance(result, Exception):
+                result.close()
+        self.selector.close()
+        self.listener.close()
+        self._wake_r.close()
+        self._wake_w.close()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+
+class BrokerPort:
+    """One client's view of a brokered port, used like serial.Serial."""
+
+    def __init__(self, device, baud, timeout=None, path=SOCKET_PATH):
+        self.port = device
+        self.baudrate = baud
+        self.timeout = timeout
+        self._buffer = b""
+        self._lock = threading.Lock()        # _buffer and reads
+        self._write_lock = threading.Lock()  # whole writes, one at a time
+        # the socket stays blocking; read timeouts are select() timeouts
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self.sock.connect(path)
+            self.sock.sendall(f"OPEN {device} {baud}\n".encode())
+            deadline = time.monotonic() + HANDSHAKE_TIMEOUT
+            while b"\n" not in self._buffer:
+                if not self._fill(max(deadline - time.monotonic(), 0.0)):
+                    raise serial.SerialException(f"serial broker did not answer OPEN {device}")
+        except BaseException:
+            self.sock.close()
+            raise
+        reply, self._buffer = self._buffer.split(b"\n", 1)
+        if reply != b"OK":
+            self.sock.close()
+            raise serial.SerialException(f"serial broker: {reply.decode(errors='replace')}")
+
+    def _fill(self, timeout):
+        """Receive into the buffer; False if nothing arrived within timeout
+        (None waits for ever). Called with self._lock held, or before the
+        port is shared."""
+        try:
+            readable, _, _ = select.select([self.sock], [], [], timeout)
+            if not readable:
+                return False
+            data = self.sock.recv(65536)
+        except (OSError, ValueError) as e:
+            raise serial.SerialException(f"serial broker connection failed: {e}")
+        if not data:
+            raise serial.SerialException(f"serial broker closed {self.port}")
+        self._buffer += data
+        return True
+
+    def _drain(self):
+        while self._fill(0):
+            pass
+
+    def _read_until(self, done):
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        while not done():
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0.0)
+            if not self._fill(remaining) and deadline is not None:
+                break
+
+    def read(self, size=1):
+        with self._lock:
+            self._read_until(lambda: len(self._buffer) >= size)
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+            return data
+
+    def readline(self):
+        with self._lock:
+            self._read_until(lambda: b"\n" in self._buffer)
+            end = self._buffer.find(b"\n") + 1 or len(self._buffer)
+            data, self._buffer = self._buffer[:end], self._buffer[end:]
+            return data
+
+    @property
+    def in_waiting(self):
+        with self._lock:
+            self._drain()
+            return len(self._buffer)
+
+    def reset_input_buffer(self):
+        with self._lock:
+            self._drain()
+            self._buffer = b""
+
+    def write(self, data):
+        try:
+            with self._write_lock:
+                self.sock.sendall(data)
+        except OSError as e:
+            raise serial.SerialException(f"serial broker connection failed: {e}")
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def fileno(self):
+        return self.sock.fileno()
+
+    @property
+    def is_open(self):
+        return self.sock.fileno() >= 0
+
+    def close(self):
+        self.sock.close()
+
+
+def open_serial(device, baud, timeout=None, reset_wait=RESET_WAIT, sleep=time.sleep, path=SOCKET_PATH):
+    """The port through the broker if one is running (no reset wait), else
+    serial.Serial opened directly followed by reset_wait."""
+    try:
+        return BrokerPort(device, baud, timeout, path)
+    except (FileNotFoundError, ConnectionRefusedError):
+        pass
+    ser = serial.Serial(device, baud, timeout=timeout)
+    sleep(reset_wait)
+    return ser
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hold serial ports open and share them over a Unix socket.")
+    parser.add_argument("ports", nargs="*", metavar="DEVICE:BAUD", help="ports to open at start-up")
+    parser.add_argument("--socket", default=SOCKET_PATH)
+    args = parser.parse_args()
+
+    broker = SerialBroker(args.socket)
+    for spec in args.ports:
+        device, baud = spec.rsplit(":", 1)
+        broker.open_port(device, int(baud))
+    print(f"serial_broker: listening on {args.socket}")
+    try:
+        broker.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        broker.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# Time from "script starts" to the first PONG, opening the Teensy directly
+# vs through the serial broker, against the pty Teensy stand-in.
+#
+# Direct: serial.Serial + the 2 s reset wait, every run. Brokered: the
+# broker pays the reset once; every later run only connects to the socket.
+# Then two clients share the one port at the same time, and one client keeps
+# pinging its board while another board's port opens (and resets) through
+# the same broker.
+#
+#   python3 -m hardware.serial_broker_bench [runs]
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from hardware.serial_broker import SerialBroker, BrokerPort, open_serial
+from wheels.teensy_emulator import TeensyEmulator
+
+RUNS = 5
+BAUD = 115200
+
+
+def saw(ser, word, timeout=1.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if word in ser.readline():
+            return True
+    return False
+
+
+def ping(ser):
+    ser.write(b"PING\n")
+    saw(ser, b"PONG")
+
+
+def script_run(port, path):
+    t0 = time.perf_counter()
+    ser = open_serial(port, BAUD, timeout=1.0, path=path)
+    ping(ser)
+    elapsed = time.perf_counter() - t0
+    ser.close()
+    return elapsed
+
+
+def worst_ping_while_opening(port, other, path):
+    """Longest PING -> PONG on `port` while the broker opens `other`."""
+    ser = BrokerPort(port, BAUD, timeout=1.0, path=path)
+    opener = threading.Thread(target=lambda: BrokerPort(other, BAUD, timeout=1.0, path=path).close())
+    opener.start()
+    worst = 0.0
+    while opener.is_alive():
+        t0 = time.perf_counter()
+        ping(ser)
+        worst = max(worst, time.perf_counter() - t0)
+    ser.close()
+    return worst
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else RUNS
+    emu = TeensyEmulator()
+    emu.start()
+    other = TeensyEmulator()
+    other.start()
+    path = os.path.join(tempfile.mkdtemp(), "broker.sock")
+    try:
+        direct = [script_run(emu.port, path) for _ in range(runs)]   # no broker yet
+
+        broker = SerialBroker(path)
+        loop = threading.Thread(target=broker.serve_forever, daemon=True)
+        loop.start()
+        brokered = [script_run(emu.port, path) for _ in range(runs)]
+
+        a = BrokerPort(emu.port, BAUD, timeout=1.0, path=path)
+        b = BrokerPort(emu.port, BAUD, timeout=1.0, path=path)
+        a.write(b"PING\n")
+        shared = all(saw(s, b"PONG") for s in (a, b))
+        a.close()
+        b.close()
+        worst = worst_ping_while_opening(emu.port, other.port, path)
+        broker.running = False
+        loop.join()
+        broker.close()
+    finally:
+        emu.stop()
+        other.stop()
+
+    print(f"open + first PONG, {runs} script runs:")
+    print(f"  direct   : " + "  ".join(f"{t * 1000:7.1f}" for t in direct) + "  ms")
+    print(f"  brokered : " + "  ".join(f"{t * 1000:7.1f}" for t in brokered) + "  ms  (first run opens the port)")
+    print(f"  two clients on one port, both saw the PONG: {shared}")
+    print(f"  slowest PONG while a second port opened: {worst * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+# Scan-to-scan point-to-line ICP for correcting the Teensy's odometry.
+#
+# Each scan becomes 2-D points in the sensor frame, ordered by bearing.
+# The reference scan also gets a surface normal per point from its two
+# neighbours. Correspondences are found by bearing: a transformed point
+# is looked up in the reference bearings with searchsorted and the
+# nearest of the few reference points around it is taken, a 1-D grid
+# lookup that needs no KD-tree. Every iteration is then one small
+# least-squares solve for (tx, ty, theta) minimising point-to-line
+# distances, with the worst residuals trimmed.
+#
+# Poses are (x, y, yaw) in metres / radians, robot x forward, y left,
+# yaw counter-clockwise, with the LiDAR at the robot origin.
+
+import numpy as np
+
+MAX_RANGE = 6.0          # metres
+MAX_ITERATIONS = 30
+MAX_CORRESPONDENCE = 0.3 # metres between a point and its match
+MAX_NEIGHBOUR_GAP = 0.3  # metres; wider gaps give no normal
+WINDOW = 3               # reference points either side of the bearing looked at
+TRIM = 0.8               # fraction of the best matches used each iteration
+MIN_MATCHES = 30
+TOLERANCE = 1e-4         # metres / radians of update that counts as converged
+
+
+def wrap(angle):
+    return (angle + np.pi) % (2 * np.pi) - np.pi
+
+
+def compose(a, b):
+    """Pose b, given in frame a, in a's parent frame."""
+    x, y, yaw = a
+    c, s = np.cos(yaw), np.sin(yaw)
+    return (x + c * b[0] - s * b[1], y + s * b[0] + c * b[1], wrap(yaw + b[2]))
+
+
+def relative(a, b):
+    """Pose b in frame a."""
+    dx, dy = b[0] - a[0], b[1] - a[1]
+    c, s = np.cos(a[2]), np.sin(a[2])
+    return (c * dx + s * dy, -s * dx + c * dy, wrap(b[2] - a[2]))
+
+
+def scan_points(scan, max_range=MAX_RANGE):
+    """(N, 2) sensor-frame points of a (quality, angle, distance mm) scan, sorted by bearing."""
+    scan = np.asarray(scan, dtype=float).reshape(-1, 3)
+    d = scan[:, 2] / 1000.0
+    keep = (d > 0) & (d < max_range)
+    bearing = wrap(-np.radians(scan[keep, 1]))
+    order = np.argsort(bearing)
+    d, bearing = d[keep][order], bearing[order]
+    return np.column_stack((d * np.cos(bearing), d * np.sin(bearing)))
+
+
+class Reference:
+    """A scan prepared for matching against: points, bearings and normals."""
+
+    def __init__(self, points):
+        self.points = points
+        self.bearings = np.arctan2(points[:, 1], points[:, 0])
+        prev = np.roll(points, 1, axis=0)
+        nxt = np.roll(points, -1, axis=0)
+        tangent = nxt - prev
+        length = np.hypot(tangent[:, 0], tangent[:, 1])
+        gaps_ok = ((np.hypot(*(points - prev).T) < MAX_NEIGHBOUR_GAP)
+                   & (np.hypot(*(nxt - points).T) < MAX_NEIGHBOUR_GAP) & (length > 0))
+        self.normals = np.column_stack((-tangent[:, 1], tangent[:, 0])) / np.where(length > 0, length, 1.0)[:, None]
+        self.has_normal = gaps_ok
+        self.offsets = np.arange(-WINDOW, WINDOW + 1)
+
+    def __len__(self):
+        return len(self.points)
+
+    def match(self, q, max_distance):
+        """(query index, reference index) pairs for points q in the reference frame."""
+        n = len(self.points)
+        idx = np.searchsorted(self.bearings, np.arctan2(q[:, 1], q[:, 0]))
+        candidates = (idx[:, None] + self.offsets[None, :]) % n
+        d2 = ((self.points[candidates] - q[:, None, :]) ** 2).sum(axis=2)
+        d2[~self.has_normal[candidates]] = np.inf
+        best = d2.argmin(axis=1)
+        close = d2[np.arange(len(q)), best] < max_distance ** 2
+        return np.flatnonzero(close), candidates[close, best[close]]
+
+
+def icp(reference, points, guess=(0.0, 0.0, 0.0), max_iterations=MAX_ITERATIONS,
+        max_distance=MAX_CORRESPONDENCE):
+    """Pose of the scan `points` in the frame of `reference` (a Reference).
+
+    Returns (pose, info) where info has iterations, matches and rmse
+    (point-to-line, metres), or (None, info) if too few points matched.
+    """
+    x, y, yaw = guess
+    info = {"iterations": 0, "matches": 0, "rmse": None}
+    if len(reference) < MIN_MATCHES or len(points) < MIN_MATCHES:
+        return None, info
+    for iteration in range(1, max_iterations + 1):
+        c, s = np.cos(yaw), np.sin(yaw)
+        q = points @ np.array([[c, s], [-s, c]]) + (x, y)
+        qi, ri = reference.match(q, max_distance)
+        if len(qi) < MIN_MATCHES:
+            return None, info
+        q, r, n = q[qi], reference.points[ri], reference.normals[ri]
+        residual = ((q - r) * n).sum(axis=1)
+        keep = np.abs(residual) <= np.quantile(np.abs(residual), TRIM)
+        q, n, residual = q[keep], n[keep], residual[keep]
+
+        # linearised point-to-line: n . (q + dtheta * perp(q) + dt - r) = 0
+        A = np.column_stack((n[:, 0], n[:, 1], n[:, 1] * q[:, 0] - n[:, 0] * q[:, 1]))
+        dx, dy, dtheta = np.linalg.lstsq(A, -residual, rcond=None)[0]
+        c, s = np.cos(dtheta), np.sin(dtheta)
+        x, y = c * x - s * y + dx, s * x + c * y + dy
+        yaw = wrap(yaw + dtheta)
+
+        info = {"iterations": iteration, "matches": int(keep.sum()),
+                "rmse": float(np.sqrt(np.mean(residual ** 2)))}
+        if np.hypot(dx, dy) < TOLERANCE and abs(dtheta) < TOLERANCE:
+            break
+    return (float(x), float(y), float(yaw)), info
+
+
+class IcpOdometry:
+    """Corrects odometry poses scan by scan.
+
+    update() takes each scan with the odometry pose it was taken at, uses
+    the odometry motion since the previous scan as the ICP initial guess,
+    and chains the matched motions into a corrected pose. When a match
+    fails the odometry motion is used as is. Starts from `pose`, or from
+    the first odometry pose if none is given.
+    """
+
+    def __init__(self, pose=None, max_range=MAX_RANGE):
+        self.pose = pose
+        self.max_range = max_range
+        self.reference = None
+        self.odom = None
+        self.matched = 0
+        self.failed = 0
+        self.info = None
+
+    def update(self, scan, odom_pose):
+        """Corrected pose for a scan taken at `odom_pose`."""
+        points = scan_points(scan, self.max_range)
+        if self.reference is not None:
+            guess = relative(self.odom, odom_pose)
+            motion, self.info = icp(self.reference, points, guess)
+            if motion is None:
+                motion = guess
+                self.failed += 1
+            else:
+                self.matched += 1
+            self.pose = compose(self.pose, motion)
+        elif self.pose is None:
+            self.pose = odom_pose
+        self.reference = Reference(points)
+        self.odom = odom_pose
+        return self.pose
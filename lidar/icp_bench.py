@@ -0,0 +1,86 @@
+# Time per scan match and pose error of lidar.icp against drifting odometry.
+#
+# Synthetic: the robot drives the loop from occupancy_bench inside the
+# 4 x 3 m room; odometry over-reads distance by ODOM_SCALE (the Phase 2
+# odometry check accepts anything from 0.15 to 0.50 m for 0.30 m) and
+# picks up a yaw bias. IcpOdometry corrects it scan by scan.
+#
+# Recorded: with a scan log, consecutive scans are matched with zero
+# initial guess to time the matcher on real data.
+#
+#   python -m lidar.icp_bench [log]
+
+import sys
+import time
+
+import numpy as np
+
+from lidar.icp import IcpOdometry, Reference, compose, icp, relative, scan_points, wrap
+from lidar.occupancy_bench import room_scan, trajectory
+from lidar.scan_log import ScanLog
+
+N_SCANS = 200
+ODOM_SCALE = 1.3
+YAW_BIAS = 0.004      # radians per scan
+SCAN_RATE = 10.0
+
+
+def drifting_odometry(truth, rng):
+    odom = [tuple(truth[0])]
+    for a, b in zip(truth[:-1], truth[1:]):
+        dx, dy, dyaw = relative(a, b)
+        step = (dx * ODOM_SCALE + rng.normal(0, 0.002), dy * ODOM_SCALE + rng.normal(0, 0.002),
+                dyaw + YAW_BIAS + rng.normal(0, 0.002))
+        odom.append(compose(odom[-1], step))
+    return np.array(odom)
+
+
+def pose_error(poses, truth):
+    d = np.hypot(poses[:, 0] - truth[:, 0], poses[:, 1] - truth[:, 1])
+    yaw = np.abs(wrap(poses[:, 2] - truth[:, 2]))
+    return d, yaw
+
+
+def synthetic():
+    rng = np.random.default_rng(1)
+    truth = trajectory(N_SCANS)
+    scans = [room_scan(p, rng) for p in truth]
+    odom = drifting_odometry(truth, rng)
+
+    tracker = IcpOdometry(pose=tuple(truth[0]))
+    corrected = []
+    t0 = time.perf_counter()
+    for scan, pose in zip(scans, odom):
+        corrected.append(tracker.update(scan, tuple(pose)))
+    per_match = (time.perf_counter() - t0) / (len(scans) - 1)
+
+    odom_d, odom_yaw = pose_error(odom, truth)
+    icp_d, icp_yaw = pose_error(np.array(corrected), truth)
+    print(f"synthetic loop, {N_SCANS} scans, odometry scale {ODOM_SCALE}, yaw bias {YAW_BIAS} rad/scan")
+    print(f"  odometry : final error {odom_d[-1]:6.3f} m {np.degrees(odom_yaw[-1]):6.2f} deg, "
+          f"max {odom_d.max():6.3f} m")
+    print(f"  ICP      : final error {icp_d[-1]:6.3f} m {np.degrees(icp_yaw[-1]):6.2f} deg, "
+          f"max {icp_d.max():6.3f} m  ({tracker.matched} matched, {tracker.failed} fell back)")
+    print(f"  {per_match * 1000:.2f} ms per match (update incl. preprocessing), "
+          f"{1 / per_match:.0f} matches/s vs {SCAN_RATE:.0f} Hz scans")
+
+
+def recorded(path):
+    log = ScanLog(path)
+    points = [scan_points(log.as_tuples(i)) for i in range(len(log))]
+    times, iterations = [], []
+    for a, b in zip(points[:-1], points[1:]):
+        t0 = time.perf_counter()
+        pose, info = icp(Reference(a), b)
+        times.append(time.perf_counter() - t0)
+        iterations.append(info["iterations"])
+    times = np.array(times) * 1000
+    print(f"{path}: {len(times)} matches, {np.mean(times):.2f} ms mean, "
+          f"{np.percentile(times, 95):.2f} ms p95, {np.mean(iterations):.1f} iterations")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        recorded(sys.argv[1])
+    else:
+        synthetic()
@@ -0,0 +1,58 @@
+# builds an occupancy grid from live scans at the Teensy's odometry pose,
+# corrected scan to scan with ICP.
+# drive the base around (phase 2 tests, or CMD_VEL from another tool),
+# Ctrl+C to stop; the map is saved as lidar/map_<timestamp>.npz
+import datetime
+
+import numpy as np
+
+from lidar.icp import IcpOdometry
+from lidar.occupancy import OccupancyGrid
+from lidar.replay import open_lidar
+from lidar.scan_reader import ScanReader
+from wheels.test_phase2_all_wheels import TeensyLink, PORT, BAUD
+
+PORT_NAME = '/dev/ttyUSB0'
+
+
+def run(lidar, link, grid):
+    reader = ScanReader(lidar)
+    reader.start()
+    tracker = IcpOdometry()
+    seq = 0
+    try:
+        while reader.running:
+            got = reader.after(seq)
+            if got is None:
+                continue
+            seq, t_scan, scan = got
+            # odometry interpolated to when the scan completed, not the newest report
+            odom = link.odom.pose_at(t_scan)
+            if odom is None:
+                continue
+            grid.integrate(scan, tracker.update(scan, odom))
+            if grid.scans % 50 == 0:
+                print(f"{grid.scans} scans, {len(grid.tiles)} tiles, {grid.changed} cells last scan, "
+                      f"{reader.stats['dropped']} dropped, "
+                      f"{tracker.failed} ICP fallbacks")
+    finally:
+        reader.stop()
+
+
+if __name__ == "__main__":
+    lidar = open_lidar(PORT_NAME, baudrate = 115200, timeout=3)
+    link = TeensyLink(PORT, BAUD)
+    grid = OccupancyGrid()
+    try:
+        run(lidar, link, grid)
+    except KeyboardInterrupt:
+        print("stopping.")
+    finally:
+        lidar.stop()
+        lidar.stop_motor()
+        lidar.disconnect()
+        link.close()
+    timestamp = datetime.datetime.now().strftime('%Y%m%d_%H:%M:%S')
+    log_odds, origin = grid.to_array()
+    np.savez_compressed(f"lidar/map_{timestamp}.npz", log_odds=log_odds, origin=origin,
+                        resolution=grid.resolution)
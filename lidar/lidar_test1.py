@@ -1,9 +1,10 @@
 #code modeled after Dave Astels' RPILidar tutorial on Adafruit.
 
 import os
-from math import cos, sin, pi, floor
 import pygame
-from adafruit_rplidar import RPLidar
+from lidar.replay import open_lidar
+
+from lidar.raster import ScanRaster
 
 
 # set up pygame and the display
@@ -16,38 +17,24 @@ pygame.display.update()
 
 # set up the RPLidar
 PORT_NAME = '/dev/ttyUSB0'
-lidar = RPLidar(None, PORT_NAME, timeout=3)
-
-# scale data to fit on screen
-max_distance = 0
+lidar = open_lidar(PORT_NAME, timeout=3)
 
-# buffer to keep distance data each item stores measurement
-# at each degree. Maintains most recent measurements.
-scan_data = [0]*360
+# buffer to keep distance data, one bin per RESOLUTION degrees.
+# Maintains most recent measurements. The cos/sin of every bin is
+# computed once, and whole scans are converted to pixels with NumPy.
+RESOLUTION = 1.0
+raster = ScanRaster(lcd.get_size(), resolution=RESOLUTION)
 
 # using the iter_scans function, measurements can be accumulated
 # and provide the angle and distance.
 
-# once there's a scan, can step through each data point.
-# the floor of the angle is taken and used as an index for
-# the measurement. 
-
 # process_data() can accomplish any number of functions,
 # so long as it's as fast as possible.
-# in this case it will display distance data.
-def process_data(data):
-    global max_distance
-    lcd.fill((0,0,0))
-    for angle in range(360):
-        distance = data[angle]
-        if distance > 0: 
-             # ignore initially ungathered data
-             max_distance = max([min([5000, distance]), max_distance])
-             radians = angle * pi / 180.0
-             x = distance * cos(radians)
-             y = distance * sin(radians)
-             point = (160 + int(x / max_distance * 119), 120 + int(y / max_distance * 119))
-             lcd.set_at(point, pygame.Color(255, 255, 255))
+# in this case it will display distance data: the frame is rendered
+# as an array and blitted to the screen in one go.
+def process_data(scan):
+    raster.update(scan)
+    pygame.surfarray.blit_array(lcd, raster.render())
     pygame.display.update()
 
 
@@ -55,9 +42,7 @@ def process_data(data):
 try:
     print(lidar.info)
     for scan in lidar.iter_scans():
-        for (_, angle, distance) in scan:
-            scan_data[min([359, floor(angle)])] = distance
-        process_data(scan_data)
+        process_data(scan)
 except KeyboardInterrupt:
     print("stopping.")
 lidar.stop()
@@ -1,9 +1,12 @@
 # remember, xarm_venv must be activated for code to work.
 import os
 import datetime
+import time
 
 
-from adafruit_rplidar import RPLidar
+from lidar.replay import open_lidar
+from lidar.scan_reader import ScanReader
+from lidar.shm_channel import ScanChannel
 
 import matplotlib
 matplotlib.use('Agg')
@@ -12,10 +15,11 @@ import matplotlib.pyplot as plt
 import matplotlib.animation as animation
 import numpy as np
 
+from lidar.scan_log import ScanRecorder, log_base
 
 # set up the RPLidar
 PORT_NAME = '/dev/ttyUSB0'
-lidar = RPLidar(None, PORT_NAME, baudrate = 115200, timeout=3)
+lidar = open_lidar(PORT_NAME, baudrate = 115200, timeout=3)
 
 d_max: int = 1000
 i_min: int = 0
@@ -45,16 +49,40 @@ def make_ani(update):
 
     timestamp = datetime.datetime.now().strftime('%Y%m%d_%H:%M:%S')
 
-    iterator = lidar.iter_scans(max_buf_meas = 5000)
+    # newest complete scan per frame; scans that arrive while a frame renders are dropped
+    reader = ScanReader(lidar)
+    reader.start()
+    iterator = reader.scans()
     ani = animation.FuncAnimation(fig, update, frames = 150, fargs = (iterator, line), interval = 50, blit= False, cache_frame_data = False)
-    ani.save(f"lidar/lidar_{timestamp}.mp4", writer = "ffmpeg", fps = 15)
+    try:
+        ani.save(f"lidar/lidar_{timestamp}.mp4", writer = "ffmpeg", fps = 15)
+    finally:
+        reader.stop()
+
+
+def record(n_scans = 150, base = None, channel = None):
+    # raw scans to lidar/lidar_<timestamp>.scans/.sidx; render offline with
+    # python -m lidar.scan_export <base>. If `channel` names a ScanChannel,
+    # every scan is also published there for other processes.
+    base = base or log_base()
+    shared = ScanChannel(channel) if channel else None
+    with ScanRecorder(base) as recorder:
+        for i, scan in enumerate(lidar.iter_scans(max_buf_meas = 5000)):
+            t = time.monotonic()
+            recorder.append(scan, t)
+            if shared:
+                shared.publish(scan, t)
+            if i + 1 >= n_scans:
+                break
+    if shared:
+        shared.close()
+    return base
 
-     
 
 if __name__ == "__main__":
 
     try:
-        make_ani(update_line)
+        print(record())
         print("done")
 
 
@@ -1,8 +1,8 @@
-from adafruit_rplidar import RPLidar
+from lidar.replay import open_lidar
 
 PORT_NAME = '/dev/ttyUSB0'
 
-lidar = RPLidar(None, PORT_NAME, baudrate=115200)
+lidar = open_lidar(PORT_NAME, baudrate=115200)
 
 print(lidar.info)
 print(lidar.health)
@@ -1,10 +1,13 @@
 # remember, xarm_venv must be activated for code to work.
 # this code is NOT functional due to issues with the imports.
+import concurrent.futures
 import os
 import serial
 import time
 
-from adafruit_rplidar import RPLidar
+from lidar.replay import open_lidar
+from lidar.scan_reader import ScanReader
+from lidar.proximity_guard import ProximityGuard, from_reader, arduino_send
 
 import matplotlib
 matplotlib.use('Agg')
@@ -14,12 +17,14 @@ import matplotlib.animation as animation
 import numpy as np
 
 # set up wheels code
-from wheels import wheels_test1
+from wheels.wheel_client import WheelClient
+
+wheels = WheelClient()
 
 
 # set up the RPLidar
 PORT_NAME = '/dev/ttyUSB0'
-lidar = RPLidar(None, PORT_NAME, baudrate = 115200, timeout=3)
+lidar = open_lidar(PORT_NAME, baudrate = 115200, timeout=3)
 
 d_max: int = 1000
 i_min: int = 0
@@ -35,7 +40,7 @@ def update_line(num, iterator, line):
     line.set_array(intents)
     return line
 
-def make_ani(update):
+def make_ani(update, guard = None):
     plt.rcParams["toolbar"] = "None"
     fig = plt.figure()
 
@@ -46,22 +51,41 @@ def make_ani(update):
 
     ax.grid(True)
 
-    iterator = lidar.iter_scans(max_buf_meas = 5000)
+    # newest complete scan per frame; scans that arrive while a frame renders are dropped
+    reader = ScanReader(lidar)
+    reader.start()
+    if guard:
+        guard.watch(from_reader(reader))
+    iterator = reader.scans()
     ani = animation.FuncAnimation(fig, update, frames = 75, fargs = (iterator, line), interval = 50, blit= False, cache_frame_data = False)
-    ani.save("lidar/lidar4.mp4", writer = "ffmpeg", fps = 15)
+    try:
+        ani.save("lidar/lidar4.mp4", writer = "ffmpeg", fps = 15)
+    finally:
+        if guard:
+            guard.stop()
+            print(guard.latency.report())
+        reader.stop()
 
      
 
 if __name__ == "__main__":
 
     try:
-        wheels_test1.control_wheels('1')
-        make_ani(update_line)
-        wheels_test1.control_wheels('0')
+        # wheels forward through the guard, which stops them if anything gets close
+        guard = ProximityGuard(arduino_send(wheels))
+        guard.vel(1.0, 0.0, 0.0)
+        make_ani(update_line, guard)
+        try:
+            wheels.stop().result(timeout=1.0)
+        except (concurrent.futures.TimeoutError, serial.SerialException) as e:
+            print(f"wheels did not acknowledge stop: {e!r}")
 
 
     except KeyboardInterrupt:
         print("stopping.")
+        wheels.stop()
         lidar.stop()
         lidar.stop_motor()
-        lidar.disconnect()
\ No newline at end of file
+        lidar.disconnect()
+    finally:
+        wheels.close()
\ No newline at end of file
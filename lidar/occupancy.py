@@ -0,0 +1,151 @@
+# Incremental log-odds occupancy grid built from RPLidar scans and odometry.
+#
+# The map is a dict of TILE x TILE float32 tiles, created the first time a
+# ray touches them, so it grows with the area driven instead of being sized
+# up front. A scan is integrated at the robot pose (x, y, yaw in metres /
+# radians, as in the Teensy's ODOM lines) in one vectorized pass: every beam
+# is sampled once per cell along its length, the samples are reduced to
+# unique free and hit cells, and only those cells are updated, tile by tile.
+#
+# Frames: robot x forward, y left, yaw counter-clockwise. RPLidar angles
+# are degrees clockwise from the sensor's front.
+
+import numpy as np
+
+RESOLUTION = 0.05     # metres per cell
+TILE = 64             # cells per tile side, a power of two
+MAX_RANGE = 6.0       # metres; longer beams only clear space up to here
+LIDAR_POSE = (0.0, 0.0, 0.0)   # sensor mount on the base: x, y (m), yaw (rad)
+
+# log-odds increments and clamps
+L_OCC = 0.85          # p = 0.7
+L_FREE = -0.4         # p = 0.4
+L_MIN = -4.0
+L_MAX = 4.0
+
+_SHIFT = TILE.bit_length() - 1
+_OFF = 1 << 30        # keeps packed cell coordinates non-negative in int64
+
+
+def _pack(cx, cy):
+    return ((cx + _OFF) << 32) | (cy + _OFF)
+
+
+def _unpack(keys):
+    return (keys >> 32) - _OFF, (keys & 0xFFFFFFFF) - _OFF
+
+
+def interpolate_pose(t, times, poses):
+    """Pose at time `t` from (N,) times and (N, 3) x, y, yaw poses, linear
+    in x/y and along the shorter way round in yaw."""
+    poses = np.asarray(poses, dtype=float)
+    yaw = np.unwrap(poses[:, 2])
+    return (float(np.interp(t, times, poses[:, 0])),
+            float(np.interp(t, times, poses[:, 1])),
+            float(np.interp(t, times, yaw)))
+
+
+class OccupancyGrid:
+    """Sparse tiled log-odds grid; 0 = unknown, > 0 occupied, < 0 free."""
+
+    def __init__(self, resolution=RESOLUTION, max_range=MAX_RANGE, lidar_pose=LIDAR_POSE):
+        self.resolution = resolution
+        self.max_range = max_range
+        self.lidar_pose = lidar_pose
+        self.tiles = {}          # (tx, ty) -> (TILE, TILE) float32, indexed [lx, ly]
+        self.dirty = set()       # tiles changed since the last take_dirty()
+        self.scans = 0
+        self.changed = 0         # cells updated by the last scan
+
+    def _sensor_pose(self, pose):
+        x, y, yaw = pose
+        mx, my, myaw = self.lidar_pose
+        c, s = np.cos(yaw), np.sin(yaw)
+        return x + c * mx - s * my, y + s * mx + c * my, yaw + myaw
+
+    def cells(self, scan, pose):
+        """Packed keys of the (free, hit) cells a scan at `pose` touches."""
+        scan = np.asarray(scan, dtype=float).reshape(-1, 3)
+        d = scan[:, 2] / 1000.0
+        valid = d > 0
+        d = d[valid]
+        hit = d < self.max_range
+        d = np.minimum(d, self.max_range)
+
+        x, y, yaw = self._sensor_pose(pose)
+        theta = yaw - np.radians(scan[valid, 1])
+        # everything in cell units from here on
+        ox, oy = x / self.resolution, y / self.resolution
+        r = d / self.resolution
+        ex = ox + r * np.cos(theta)
+        ey = oy + r * np.sin(theta)
+
+        # one sample per cell of length along each beam, endpoint excluded
+        n = np.maximum(np.ceil(r).astype(np.int64), 1)
+        starts = np.cumsum(n) - n
+        beam = np.repeat(np.arange(len(n)), n)
+        f = (np.arange(n.sum()) - starts[beam]) / n[beam]
+        fx = np.floor(ox + f * (ex[beam] - ox)).astype(np.int64)
+        fy = np.floor(oy + f * (ey[beam] - oy)).astype(np.int64)
+
+        hits = np.unique(_pack(np.floor(ex[hit]).astype(np.int64), np.floor(ey[hit]).astype(np.int64)))
+        free = np.setdiff1d(np.unique(_pack(fx, fy)), hits, assume_unique=True)
+        return free, hits
+
+    def _apply(self, keys, delta):
+        if not len(keys):
+            return
+        cx, cy = _unpack(keys)
+        tx, ty = cx >> _SHIFT, cy >> _SHIFT
+        lx, ly = cx & (TILE - 1), cy & (TILE - 1)
+        tile_keys = _pack(tx, ty)
+        order = np.argsort(tile_keys, kind="stable")
+        bounds = np.flatnonzero(np.diff(tile_keys[order])) + 1
+        for group in np.split(order, bounds):
+            key = (int(tx[group[0]]), int(ty[group[0]]))
+            tile = self.tiles.get(key)
+            if tile is None:
+                tile = self.tiles[key] = np.zeros((TILE, TILE), dtype=np.float32)
+            gx, gy = lx[group], ly[group]
+            tile[gx, gy] = np.clip(tile[gx, gy] + delta, L_MIN, L_MAX)
+            self.dirty.add(key)
+
+    def integrate(self, scan, pose):
+        """Add one scan of (quality, angle, distance mm) taken at `pose`."""
+        free, hits = self.cells(scan, pose)
+        self._apply(free, L_FREE)
+        self._apply(hits, L_OCC)
+        self.scans += 1
+        self.changed = len(free) + len(hits)
+        return self.changed
+
+    def take_dirty(self):
+        """Tiles changed since the last call, for incremental consumers."""
+        dirty, self.dirty = self.dirty, set()
+        return dirty
+
+    def log_odds(self, x, y):
+        """Log-odds at world point (x, y); 0 if never observed."""
+        cx = int(np.floor(x / self.resolution))
+        cy = int(np.floor(y / self.resolution))
+        tile = self.tiles.get((cx >> _SHIFT, cy >> _SHIFT))
+        return 0.0 if tile is None else float(tile[cx & (TILE - 1), cy & (TILE - 1)])
+
+    def to_array(self):
+        """(grid, origin): the whole map as one dense [x, y] log-odds array and
+        the world (x, y) of its cell [0, 0]."""
+        if not self.tiles:
+            return np.zeros((0, 0), dtype=np.float32), (0.0, 0.0)
+        keys = np.array(list(self.tiles))
+        t0 = keys.min(axis=0)
+        shape = (keys.max(axis=0) - t0 + 1) * TILE
+        grid = np.zeros(shape, dtype=np.float32)
+        for (tx, ty), tile in self.tiles.items():
+            ix, iy = (tx - t0[0]) * TILE, (ty - t0[1]) * TILE
+            grid[ix:ix + TILE, iy:iy + TILE] = tile
+        origin = tuple(float(v) for v in t0 * TILE * self.resolution)
+        return grid, origin
+
+    def probability(self):
+        grid, origin = self.to_array()
+        return 1.0 - 1.0 / (1.0 + np.exp(grid)), origin
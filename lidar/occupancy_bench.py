@@ -0,0 +1,88 @@
+# Scans per second the occupancy grid can integrate, against the RPLidar's
+# ~10 Hz, plus the old-style alternative of tracing every beam cell by
+# cell in Python for comparison.
+#
+# The robot drives a loop inside a 4 x 3 m room; scans are ray-cast
+# against the walls from each pose, 360 beams with 10 mm noise, in the
+# RPLidar's (quality, clockwise angle deg, distance mm) form.
+#
+#   python -m lidar.occupancy_bench [n_scans]
+
+import sys
+import time
+from math import floor
+
+import numpy as np
+
+from lidar.occupancy import OccupancyGrid, RESOLUTION, MAX_RANGE, L_FREE, L_OCC
+
+N_SCANS = 200
+HALF_W, HALF_H = 2.0, 1.5
+SCAN_RATE = 10.0
+
+
+def trajectory(n):
+    s = np.linspace(0, 2 * np.pi, n, endpoint=False)
+    return np.column_stack((1.2 * np.cos(s), 0.8 * np.sin(s), s + np.pi / 2))
+
+
+def room_scan(pose, rng, points=360):
+    x, y, yaw = pose
+    angle = np.sort(rng.uniform(0, 360, points))
+    theta = yaw - np.radians(angle)
+    c, s = np.cos(theta), np.sin(theta)
+    with np.errstate(divide="ignore"):
+        tx = (np.where(c > 0, HALF_W, -HALF_W) - x) / c
+        ty = (np.where(s > 0, HALF_H, -HALF_H) - y) / s
+    distance = np.minimum(tx, ty) * 1000 + rng.normal(0, 10, points)
+    quality = rng.integers(10, 16, points)
+    return np.column_stack((quality, angle, distance))
+
+
+def naive_integrate(cells, scan, pose):
+    # per-beam Python loop over a dict of cells, one step per cell
+    x, y, yaw = pose
+    for _, angle, distance in scan:
+        d = min(distance / 1000.0, MAX_RANGE)
+        theta = yaw - angle * np.pi / 180.0
+        steps = max(1, int(d / RESOLUTION))
+        for k in range(steps):
+            px = x + d * k / steps * np.cos(theta)
+            py = y + d * k / steps * np.sin(theta)
+            key = (floor(px / RESOLUTION), floor(py / RESOLUTION))
+            cells[key] = cells.get(key, 0.0) + L_FREE
+        key = (floor((x + d * np.cos(theta)) / RESOLUTION), floor((y + d * np.sin(theta)) / RESOLUTION))
+        cells[key] = cells.get(key, 0.0) + L_OCC
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else N_SCANS
+    rng = np.random.default_rng(0)
+    poses = trajectory(n)
+    scans = [room_scan(p, rng) for p in poses]
+
+    grid = OccupancyGrid()
+    changed = []
+    t0 = time.perf_counter()
+    for scan, pose in zip(scans, poses):
+        changed.append(grid.integrate(scan, pose))
+    fast = n / (time.perf_counter() - t0)
+
+    n_naive = max(1, n // 20)
+    cells = {}
+    t0 = time.perf_counter()
+    for scan, pose in zip(scans[:n_naive], poses[:n_naive]):
+        naive_integrate(cells, scan, pose)
+    slow = n_naive / (time.perf_counter() - t0)
+
+    print(f"{n} scans of {len(scans[0])} beams, {RESOLUTION * 100:.0f} cm cells")
+    print(f"  per-beam Python loop : {slow:8.1f} scans/s")
+    print(f"  OccupancyGrid        : {fast:8.1f} scans/s  ({fast / SCAN_RATE:.0f}x the 10 Hz scan rate)")
+    print(f"  cells changed / scan : {np.mean(changed):8.0f}   tiles allocated: {len(grid.tiles)}")
+    # walls should come out occupied, the middle of the room free
+    print(f"  wall {grid.log_odds(HALF_W - 0.01, 0.3):+.2f}  centre {grid.log_odds(0.0, 0.0):+.2f}  "
+          f"outside {grid.log_odds(3.5, 0.0):+.2f}")
+
+
+if __name__ == "__main__":
+    main()
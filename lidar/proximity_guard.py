@@ -0,0 +1,244 @@
+# LiDAR proximity guard between the drive commands and the wheel controller.
+#
+# Drive code sends velocities through guard.vel() instead of straight to
+# the Teensy. Every scan is reduced to the minimum range per angular
+# sector in one NumPy pass; if a sector in the direction of travel is
+# closer than SLOW_DISTANCE the command is scaled down, and under
+# STOP_DISTANCE a CMD_STOP goes out immediately. A stop is latched: the
+# base stays stopped after the obstacle clears until the drive code calls
+# vel() again. If scans stop arriving for SCAN_TIMEOUT while watching, the
+# guard is blind and stops the base the same way; and vel() only moves the
+# base once there is a scan no older than SCAN_TIMEOUT to judge by.
+# Scan-arrival-to-command latency is kept in a histogram.
+#
+# Sector 0 is centred on the front; sectors follow RPLidar angles
+# (clockwise). Velocities are robot frame: vx forward, vy left.
+
+import threading
+import time
+
+import numpy as np
+
+SECTORS = 8
+STOP_DISTANCE = 250.0   # mm
+SLOW_DISTANCE = 600.0   # mm
+EASE_STEP = 0.05        # smallest speed-up that is worth a new command
+SCAN_TIMEOUT = 1.0      # s without a scan before the guard stops the base
+CONE = 60.0             # degrees either side of the direction of travel that are watched
+LATENCY_EDGES_MS = (0.25, 0.5, 1, 2, 5, 10, 20, 50, 100)
+
+
+def sector_minima(scan, sectors=SECTORS):
+    """Minimum distance (mm) per sector of a (quality, angle, distance) scan; inf where empty."""
+    scan = np.asarray(scan, dtype=float).reshape(-1, 3)
+    valid = scan[:, 2] > 0
+    width = 360.0 / sectors
+    idx = (((scan[valid, 1] + width / 2) % 360.0) // width).astype(int)
+    minima = np.full(sectors, np.inf)
+    np.minimum.at(minima, idx, scan[valid, 2])
+    return minima
+
+
+class LatencyHistogram:
+    """Counts of latencies (s) in fixed millisecond bins."""
+
+    def __init__(self, edges_ms=LATENCY_EDGES_MS):
+        self.edges = np.asarray(edges_ms, dtype=float) / 1000.0
+        self.counts = np.zeros(len(self.edges) + 1, dtype=int)
+        self.worst = 0.0
+        self.total = 0.0
+
+    def add(self, latency):
+        self.counts[np.searchsorted(self.edges, latency, side="right")] += 1
+        self.worst = max(self.worst, latency)
+        self.total += latency
+
+    @property
+    def n(self):
+        return int(self.counts.sum())
+
+    def report(self):
+        if not self.n:
+            return "  no samples"
+        edges_ms = self.edges * 1000
+        labels = [f"< {edges_ms[0]:g} ms"]
+        labels += [f"{lo:g}-{hi:g} ms" for lo, hi in zip(edges_ms[:-1], edges_ms[1:])]
+        labels += [f">= {edges_ms[-1]:g} ms"]
+        width = 40 / self.counts.max()
+        lines = [f"  {label:>12s} {count:6d} {'#' * int(round(count * width))}"
+                 for label, count in zip(labels, self.counts) if count]
+        lines.append(f"  mean {self.total / self.n * 1000:.3f} ms, worst {self.worst * 1000:.3f} ms, n = {self.n}")
+        return "\n".join(lines)
+
+
+class ProximityGuard:
+    """Scales or stops velocity commands sent through it when scans show an obstacle ahead."""
+
+    def __init__(self, send, stop_distance=STOP_DISTANCE, slow_distance=SLOW_DISTANCE,
+                 sectors=SECTORS, cone=CONE, scan_timeout=SCAN_TIMEOUT):
+        self.send = send   # e.g. TeensyLink.send
+        self.stop_distance = stop_distance
+        self.slow_distance = slow_distance
+        self.sectors = sectors
+        self.cone = cone
+        self.scan_timeout = scan_timeout
+        self.centres = np.arange(sectors) * 360.0 / sectors
+        self.desired = (0.0, 0.0, 0.0)
+        self.scale = 1.0
+        self.minima = np.full(sectors, np.inf)
+        self.latency = LatencyHistogram()
+        self.stops = 0
+        self.blind_stops = 0     # stops because the scans stopped coming
+        self.latched = False     # a stop was sent; nothing resumes until vel()
+        self.t_last = None       # arrival time of the latest scan
+        self.lock = threading.Lock()
+        self.running = False
+        self.thread = None
+
+    def _watched(self, vx, vy, omega):
+        # sectors facing the direction of travel; all of them when turning on the spot
+        if vx == 0 and vy == 0:
+            return np.ones(self.sectors, dtype=bool) if omega else np.zeros(self.sectors, dtype=bool)
+        heading = -np.degrees(np.arctan2(vy, vx)) % 360.0
+        off = np.abs((self.centres - heading + 180.0) % 360.0 - 180.0)
+        return off <= self.cone + 180.0 / self.sectors
+
+    def _scale(self, minima):
+        watched = self._watched(*self.desired)
+        if not watched.any():
+            return 1.0
+        nearest = minima[watched].min()
+        if nearest <= self.stop_distance:
+            return 0.0
+        if nearest >= self.slow_distance:
+            return 1.0
+        return (nearest - self.stop_distance) / (self.slow_distance - self.stop_distance)
+
+    def _command(self, scale):
+        if scale == 0.0:
+            return "CMD_STOP"
+        vx, vy, omega = (v * scale for v in self.desired)
+        return f"CMD_VEL {vx:.4f} {vy:.4f} {omega:.4f}"
+
+    def vel(self, vx, vy, omega):
+        """Send a velocity, scaled by what the last scan allows; clears a latched stop."""
+        with self.lock:
+            self.desired = (vx, vy, omega)
+            if self.t_last is None:
+                # no scan yet: send nothing, the first scan starts the base
+                # if the way is clear
+                self.scale = 0.0
+                self.latched = False
+                return
+            if time.monotonic() - self.t_last > self.scan_timeout:
+                # scans have stopped: hold still until the next one
+                self.scale = 0.0
+                self.latched = False
+                self.send("CMD_STOP")
+                return
+            self.scale = self._scale(self.minima)
+            self.latched = self.scale == 0.0
+            self.send(self._command(self.scale))
+
+    def check(self, scan, t_scan):
+        """Update from a scan that arrived at monotonic time `t_scan`; returns
+        the command sent, or None if nothing changed."""
+        minima = sector_minima(scan, self.sectors)
+        with self.lock:
+            self.minima = minima
+            self.t_last = t_scan
+            if self.latched:
+                return None
+            scale = self._scale(minima)
+            # act on any tightening straight away; ease off in EASE_STEP steps
+            easing = scale > self.scale
+            if scale == self.scale or (easing and scale < 1.0 and scale - self.scale < EASE_STEP):
+                return None
+            self.scale = scale
+            self.latched = scale == 0.0
+            cmd = self._command(scale)
+            self.send(cmd)
+        self.latency.add(time.monotonic() - t_scan)
+        if scale == 0.0:
+            self.stops += 1
+        return cmd
+
+    def blind(self):
+        """Stop the base because there are no scans to judge the way ahead by."""
+        with self.lock:
+            if self.latched:
+                return
+            self.scale = 0.0
+            self.latched = True
+            self.send("CMD_STOP")
+        self.blind_stops += 1
+
+    def watch(self, next_scan):
+        """Check scans from next_scan() -> (scan, t_scan) or None on a background
+        thread; stop the base if they stop arriving for scan_timeout seconds."""
+        self.running = True
+
+        def loop():
+            stalled = False
+            while self.running:
+                item = next_scan()
+                if item is not None:
+                    stalled = False
+                    self.check(*item)
+                elif (not stalled and self.t_last is not None
+                      and time.monotonic() - self.t_last > self.scan_timeout):
+                    # once per stall, so a vel() during it can still resume
+                    # the base when scans come back
+                    stalled = True
+                    self.blind()
+        self.thread = threading.Thread(target=loop, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        if self.thread is not None:
+            self.thread.join()
+
+
+def from_reader(reader, timeout=0.5):
+    """next_scan for ProximityGuard.watch() from a lidar.scan_reader.ScanReader."""
+    last = [0]
+
+    def next_scan():
+        item = reader.after(last[0], timeout)
+        if item is None:
+            if not reader.running:
+                time.sleep(timeout)
+            return None
+        last[0], t, scan = item
+        return scan, t
+    return next_scan
+
+
+def from_channel(subscriber, timeout=0.5):
+    """next_scan for ProximityGuard.watch() from a lidar.shm_channel.ScanSubscriber."""
+    def next_scan():
+        item = subscriber.latest() if subscriber.lag > 1 else subscriber.next(timeout)
+        if item is None:
+            return None
+        seq, t, points = item
+        return points, t
+    return next_scan
+
+
+def arduino_send(wheels):
+    """send() for the '1'/'0' wheels sketch (sketch_feb25a) through a
+    wheels.wheel_client.WheelClient: CMD_STOP -> '0', any other command ->
+    '1'. The sketch has no speed control, so slowing down is not possible;
+    only the stop takes effect. Nor can it resume: its stop() pulls the EN
+    pins high and '1' never pulls them low again, so every '1' after a '0'
+    is dropped and the base stays stopped until the sketch is reset."""
+    stopped = [False]
+
+    def send(cmd):
+        if cmd == "CMD_STOP":
+            stopped[0] = True
+            wheels.stop()
+        elif not stopped[0]:
+            wheels.start()
+    return send
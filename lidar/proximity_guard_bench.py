@@ -0,0 +1,85 @@
+# Proximity guard on a replayed approach to a wall.
+#
+# Synthetic 10 Hz scans of the robot driving straight at the +x wall of a
+# 4 x 3 m room are replayed in real time through a ScanReader; the guard
+# watches them while "driving" forward and its commands go to a recorder
+# instead of the Teensy. Reports where it slowed and stopped, the
+# scan-arrival-to-command latency histogram, and the cost of the
+# per-sector reduction against a Python loop over the points.
+#
+#   python -m lidar.proximity_guard_bench [speed]
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from lidar.occupancy_bench import room_scan, HALF_W
+from lidar.proximity_guard import ProximityGuard, from_reader, sector_minima, SECTORS
+from lidar.replay import ReplayLidar
+from lidar.scan_log import ScanRecorder
+from lidar.scan_reader import ScanReader
+
+SCAN_RATE = 10.0
+N_SCANS = 60
+
+
+def approach_log(n=N_SCANS):
+    base = os.path.join(tempfile.mkdtemp(), "approach")
+    rng = np.random.default_rng(0)
+    xs = np.linspace(0.0, HALF_W - 0.1, n)
+    with ScanRecorder(base) as recorder:
+        for i, x in enumerate(xs):
+            recorder.append(room_scan((x, 0.0, 0.0), rng), t=i / SCAN_RATE)
+    return base, (HALF_W - xs) * 1000
+
+
+def loop_minima(scan, sectors=SECTORS):
+    width = 360.0 / sectors
+    minima = [float("inf")] * sectors
+    for _, angle, distance in scan:
+        if distance > 0:
+            i = int(((angle + width / 2) % 360.0) // width)
+            minima[i] = min(minima[i], distance)
+    return minima
+
+
+def per_scan(fn, scans):
+    t0 = time.perf_counter()
+    for scan in scans:
+        fn(scan)
+    return (time.perf_counter() - t0) / len(scans) * 1e6
+
+
+def main():
+    speed = float(sys.argv[1]) if len(sys.argv) > 1 else 1.0
+    path, front = approach_log()
+
+    sent = []
+    guard = ProximityGuard(lambda cmd: sent.append((time.monotonic(), cmd)))
+    reader = ScanReader(ReplayLidar(path, speed=speed))
+    reader.start()
+    guard.watch(from_reader(reader))
+    guard.vel(0.2, 0.0, 0.0)
+    t0 = time.monotonic()
+    reader.join()
+    guard.stop()
+
+    # which scan each command answered, by replay time
+    print(f"approach from {front[0]:.0f} mm to {front[-1]:.0f} mm, {len(front)} scans, speed {speed:g}")
+    for t, cmd in sent[1:]:
+        i = min(len(front) - 1, int(round((t - t0) * speed * SCAN_RATE)))
+        print(f"  {cmd:34s} wall at ~{front[i]:5.0f} mm")
+    print("scan arrival -> command latency")
+    print(guard.latency.report())
+
+    scans = [room_scan((0.0, 0.0, 0.0), np.random.default_rng(i)) for i in range(200)]
+    lists = [s.tolist() for s in scans]
+    print(f"sector minima per scan: numpy {per_scan(sector_minima, scans):6.1f} us, "
+          f"python loop {per_scan(loop_minima, lists):6.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+# Vectorized scan-to-pixel stage for the LiDAR display.
+#
+# Keeps the latest distance per angular bin (like scan_data in
+# lidar_test1), with the bin width configurable instead of fixed at 1
+# degree. Whole scans are binned and projected at once with NumPy using
+# cos/sin tables computed up front, into a reusable RGB frame that can be
+# blitted to a pygame surface in one call.
+
+import numpy as np
+
+MAX_DISTANCE = 5000  # mm, clamp for the display scale
+WHITE = 255
+
+
+class ScanRaster:
+    """Accumulate (quality, angle, distance) scans and render them as points."""
+
+    def __init__(self, size=(320, 240), resolution=1.0, center=(160, 120), radius=119):
+        self.width, self.height = size
+        self.resolution = resolution
+        self.bins = int(round(360.0 / resolution))
+        self.center = center
+        self.radius = radius
+
+        # lookup tables: one cos/sin per bin, at the bin's lower edge
+        radians = np.arange(self.bins) * resolution * np.pi / 180.0
+        self.cos = np.cos(radians)
+        self.sin = np.sin(radians)
+
+        # most recent distance per bin, 0 = not yet gathered
+        self.distances = np.zeros(self.bins)
+        self.max_distance = 0.0
+        self.frame = np.zeros((self.width, self.height, 3), dtype=np.uint8)
+
+    def update(self, scan):
+        """Write a scan (sequence or (N, 3) array of quality, angle, distance) into the bins."""
+        scan = np.asarray(scan, dtype=float)
+        if not len(scan):
+            return
+        idx = np.minimum((scan[:, 1] / self.resolution).astype(int), self.bins - 1)
+        self.distances[idx] = scan[:, 2]
+
+    def pixels(self):
+        """Screen coordinates (x, y) of every gathered bin."""
+        gathered = self.distances > 0
+        d = self.distances[gathered]
+        if len(d):
+            self.max_distance = max(min(MAX_DISTANCE, d.max()), self.max_distance)
+        scale = self.radius / self.max_distance if self.max_distance else 0.0
+        x = (self.center[0] + (d * self.cos[gathered] * scale).astype(int))
+        y = (self.center[1] + (d * self.sin[gathered] * scale).astype(int))
+        inside = (x >= 0) & (x < self.width) & (y >= 0) & (y < self.height)
+        return x[inside], y[inside]
+
+    def render(self):
+        """Return the frame with every gathered point drawn in white."""
+        self.frame.fill(0)
+        x, y = self.pixels()
+        self.frame[x, y] = WHITE
+        return self.frame
@@ -0,0 +1,85 @@
+# Frames per second of the scan-to-pixel stage: the old per-point loop from
+# lidar_test1.process_data() against lidar.raster.ScanRaster.
+#
+# Both render into an in-memory 320x240 RGB frame, so no display or pygame
+# is needed. Scans are synthetic RPLidar-like sweeps of a 4 x 3 m room.
+#
+#   python -m lidar.raster_bench [n_frames] [resolution_deg]
+
+import sys
+import time
+from math import cos, sin, pi, floor
+
+import numpy as np
+
+from lidar.raster import ScanRaster
+
+N_FRAMES = 300
+SIZE = (320, 240)
+
+
+def synthetic_scans(n, points=360, seed=0):
+    """(quality, angle, distance) scans of a rectangular room, with noise."""
+    rng = np.random.default_rng(seed)
+    half_w, half_h = 2000.0, 1500.0
+    scans = []
+    for _ in range(n):
+        angle = np.sort(rng.uniform(0, 360, points))
+        rad = np.radians(angle)
+        with np.errstate(divide="ignore"):
+            to_wall = np.minimum(np.abs(half_w / np.cos(rad)), np.abs(half_h / np.sin(rad)))
+        distance = to_wall + rng.normal(0, 10, points)
+        quality = rng.integers(10, 16, points)
+        scans.append(list(zip(quality.tolist(), angle.tolist(), distance.tolist())))
+    return scans
+
+
+def legacy_frames(scans):
+    # the old lidar_test1 path: 360-entry list, per-point trig, per-pixel writes
+    frame = np.zeros(SIZE + (3,), dtype=np.uint8)
+    scan_data = [0] * 360
+    max_distance = 0
+    for scan in scans:
+        for (_, angle, distance) in scan:
+            scan_data[min([359, floor(angle)])] = distance
+        frame.fill(0)
+        for angle in range(360):
+            distance = scan_data[angle]
+            if distance > 0:
+                max_distance = max([min([5000, distance]), max_distance])
+                radians = angle * pi / 180.0
+                x = distance * cos(radians)
+                y = distance * sin(radians)
+                point = (160 + int(x / max_distance * 119), 120 + int(y / max_distance * 119))
+                if 0 <= point[0] < SIZE[0] and 0 <= point[1] < SIZE[1]:
+                    frame[point] = 255
+
+
+def raster_frames(scans, resolution):
+    raster = ScanRaster(SIZE, resolution=resolution)
+    for scan in scans:
+        raster.update(scan)
+        raster.render()
+
+
+def fps(fn, *args):
+    t0 = time.perf_counter()
+    fn(*args)
+    return len(args[0]) / (time.perf_counter() - t0)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else N_FRAMES
+    resolution = float(sys.argv[2]) if len(sys.argv) > 2 else 1.0
+    scans = synthetic_scans(n)
+
+    old = fps(legacy_frames, scans)
+    new = fps(raster_frames, scans, resolution)
+    print(f"{n} scans of {len(scans[0])} points, {SIZE[0]}x{SIZE[1]} frame")
+    print(f"  per-point loop      : {old:8.1f} frames/s")
+    print(f"  ScanRaster {resolution:4.2f} deg : {new:8.1f} frames/s")
+    print(f"  speed-up            : {new / old:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
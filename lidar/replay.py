@@ -0,0 +1,126 @@
+# Replay a recorded scan log (lidar.scan_log) through the RPLidar interface.
+#
+# ReplayLidar has the parts of adafruit_rplidar.RPLidar the scripts use:
+# iter_scans(), iter_measurements(), info, health, stop(), stop_motor(),
+# disconnect(). Scans come out on their recorded schedule divided by
+# `speed`: 1.0 is real time, 2.0 twice as fast, None (or 0) as fast as
+# the consumer takes them.
+#
+# open_lidar() is what the lidar scripts call instead of RPLidar(...):
+# with HOPE_LIDAR_REPLAY=<log> (and optionally HOPE_LIDAR_SPEED) they run
+# against a recording, without the device on /dev/ttyUSB0.
+
+import os
+import time
+
+from lidar.scan_log import ScanLog
+
+REAL_TIME = 1.0
+
+
+class ReplayLidar:
+    """RPLidar stand-in that plays back a scan log."""
+
+    def __init__(self, path, speed=REAL_TIME, loop=False):
+        self.log = ScanLog(path)
+        self.speed = speed or None
+        self.loop = loop
+        self.motor_running = True
+        self.scanning = False
+        self.scans = 0      # scans handed out so far
+        self.behind = 0.0   # how late the consumer was on the last scan, seconds
+
+    @property
+    def info(self):
+        return {
+            "model": 0,
+            "firmware": (0, 0),
+            "hardware": 0,
+            "serialnumber": "replay:" + os.path.basename(self.log.base),
+        }
+
+    @property
+    def health(self):
+        return ("Good", 0)
+
+    def _schedule(self):
+        # (index, seconds after the start of playback) for every scan to play
+        if not len(self.log):
+            return
+        times = self.log.times
+        t0 = float(times[0])
+        # a looped log restarts one mean scan period after its last scan
+        period = self.log.duration / (len(self.log) - 1) if len(self.log) > 1 else 0.1
+        offset = 0.0
+        while True:
+            for i in range(len(self.log)):
+                yield i, offset + float(times[i]) - t0
+            if not self.loop:
+                return
+            offset += self.log.duration + period
+
+    def _play(self):
+        self.scanning = True
+        start = time.monotonic()
+        for i, t in self._schedule():
+            if not self.scanning:
+                return
+            if self.speed:
+                due = start + t / self.speed
+                delay = due - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                self.behind = max(0.0, -delay)
+            self.scans += 1
+            yield i
+
+    def iter_scans(self, max_buf_meas=500, min_len=5):
+        """Yield scans as lists of (quality, angle, distance), like RPLidar.
+
+        There is no serial buffer to overflow, so max_buf_meas is ignored;
+        a slow consumer shows up in `behind` instead.
+        """
+        for i in self._play():
+            scan = self.log.as_tuples(i)
+            if len(scan) >= min_len:
+                yield scan
+
+    def iter_measurements(self, max_buf_meas=500, scan_type=None):
+        """Yield (new_scan, quality, angle, distance) per measurement, like RPLidar."""
+        for i in self._play():
+            for n, (quality, angle, distance) in enumerate(self.log.as_tuples(i)):
+                yield (n == 0, quality, angle, distance)
+
+    # rplidar-style alias
+    iter_measures = iter_measurements
+
+    def connect(self):
+        pass
+
+    def clear_input(self):
+        pass
+
+    def reset(self):
+        self.stop()
+
+    def start_motor(self):
+        self.motor_running = True
+
+    def stop_motor(self):
+        self.motor_running = False
+
+    def stop(self):
+        self.scanning = False
+
+    def disconnect(self):
+        self.stop()
+
+
+def open_lidar(port, **kwargs):
+    """RPLidar on `port`, or a ReplayLidar when HOPE_LIDAR_REPLAY names a log."""
+    path = os.environ.get("HOPE_LIDAR_REPLAY")
+    if path:
+        speed = float(os.environ.get("HOPE_LIDAR_SPEED", REAL_TIME))
+        return ReplayLidar(path, speed=speed)
+    from adafruit_rplidar import RPLidar
+    return RPLidar(None, port, **kwargs)
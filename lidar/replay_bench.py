@@ -0,0 +1,94 @@
+# Offline throughput of the LiDAR consumers, fed by lidar.replay.ReplayLidar.
+#
+# Replays a log (a recording, or synthetic 10 Hz room scans written to a
+# temporary log) as fast as possible through:
+#   - nothing, to get the replay's own ceiling
+#   - the per-scan conversion in lidar_test2.update_line()
+#   - the ScanRaster stage of lidar_test1.process_data()
+# and then checks the timing of real-time and scaled playback.
+#
+#   python -m lidar.replay_bench [log] [n_scans]
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from lidar.raster import ScanRaster
+from lidar.raster_bench import synthetic_scans
+from lidar.replay import ReplayLidar
+from lidar.scan_log import ScanRecorder
+
+N_SCANS = 300
+SCAN_RATE = 10.0  # Hz, RPLidar A1 at default motor speed
+TIMED_SCANS = 20
+
+
+def synthetic_log(n):
+    base = os.path.join(tempfile.mkdtemp(), "synthetic")
+    with ScanRecorder(base) as recorder:
+        for i, scan in enumerate(synthetic_scans(n)):
+            recorder.append(scan, t=i / SCAN_RATE)
+    return base
+
+
+def drain(scan):
+    pass
+
+
+def update_line_convert(scan):
+    # lidar_test2.update_line() without the matplotlib artist
+    np.array([(np.radians(meas[1]), meas[2]) for meas in scan])
+    np.array([meas[0] for meas in scan])
+
+
+def raster_consumer():
+    raster = ScanRaster((320, 240))
+
+    def consume(scan):
+        raster.update(scan)
+        raster.render()
+    return consume
+
+
+def throughput(path, consume):
+    lidar = ReplayLidar(path, speed=None)
+    t0 = time.perf_counter()
+    n = 0
+    for scan in lidar.iter_scans():
+        consume(scan)
+        n += 1
+    return n / (time.perf_counter() - t0)
+
+
+def timing(path, speed, n=TIMED_SCANS):
+    lidar = ReplayLidar(path, speed=speed)
+    t0 = time.monotonic()
+    for i, scan in enumerate(lidar.iter_scans()):
+        if i + 1 >= n:
+            break
+    elapsed = time.monotonic() - t0
+    expected = (lidar.log.times[n - 1] - lidar.log.times[0]) / speed
+    return elapsed, expected
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else None
+    n = int(sys.argv[2]) if len(sys.argv) > 2 else N_SCANS
+    path = path or synthetic_log(n)
+
+    print(f"log {path}")
+    for name, consume in (("replay only", drain),
+                          ("update_line conversion", update_line_convert),
+                          ("ScanRaster (process_data)", raster_consumer())):
+        print(f"  {name:26s}: {throughput(path, consume):8.1f} scans/s")
+
+    for speed in (1.0, 4.0):
+        elapsed, expected = timing(path, speed)
+        print(f"  speed {speed:3.1f}: {TIMED_SCANS} scans in {elapsed:5.3f} s (schedule {expected:5.3f} s)")
+
+
+if __name__ == "__main__":
+    main()
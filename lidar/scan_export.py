@@ -0,0 +1,153 @@
+# Offline video export of recorded scan logs.
+#
+# Renders the same polar scatter plot lidar_test2 used to produce live,
+# but from a log after the run, so capture never waits on matplotlib or
+# ffmpeg. Frames are drawn with the Agg backend across a process pool
+# (each worker keeps one figure and reuses it) and streamed in order as
+# raw RGBA into a single ffmpeg encoder.
+#
+#   python -m lidar.scan_export [-j JOBS] [--fps FPS] [--force] LOG_OR_DIR...
+#
+# A directory converts every log in it that doesn't have an mp4 yet.
+
+import argparse
+import glob
+import multiprocessing
+import os
+import subprocess
+import time
+
+import matplotlib
+matplotlib.use('Agg')
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+from lidar.scan_log import ScanLog, INDEX_EXT
+
+d_max: int = 1000
+i_min: int = 0
+i_max: int = 100
+FPS = 15
+FIGSIZE = (6.4, 4.8)   # inches
+DPI = 100              # 640 x 480 frames
+CHUNKSIZE = 4          # frames handed to a worker at a time
+
+# per-process figure and open logs, created on first use
+_state = {}
+
+
+def update_scan(num, log, line):
+    scan = log[num]
+    offsets = np.column_stack((np.radians(scan["angle"]), scan["distance"]))
+    line.set_offsets(offsets)
+    line.set_array(scan["quality"].astype(float))
+    return line
+
+
+def _figure():
+    plt.rcParams["toolbar"] = "None"
+    fig = plt.figure(figsize=FIGSIZE, dpi=DPI)
+
+    ax = plt.subplot(111, projection="polar")
+    line = ax.scatter([0,0], [0,0], s=5, c=[i_min, i_max], cmap=plt.cm.Greys_r, lw=0)
+
+    ax.set_rmax(d_max)
+
+    ax.grid(True)
+    return fig, line
+
+
+def _log(path):
+    logs = _state.setdefault("logs", {})
+    if path not in logs:
+        logs[path] = ScanLog(path)
+    return logs[path]
+
+
+def render_frame(task):
+    """RGBA bytes of frame `i` of the log at `path`; task is (path, i)."""
+    path, i = task
+    if "fig" not in _state:
+        _state["fig"], _state["line"] = _figure()
+    fig = _state["fig"]
+    update_scan(i, _log(path), _state["line"])
+    fig.canvas.draw()
+    return bytes(fig.canvas.buffer_rgba())
+
+
+def frame_size():
+    return int(FIGSIZE[0] * DPI), int(FIGSIZE[1] * DPI)
+
+
+def _encoder(out, fps):
+    width, height = frame_size()
+    command = ["ffmpeg", "-y", "-loglevel", "error",
+               "-f", "rawvideo", "-pix_fmt", "rgba", "-s", f"{width}x{height}", "-r", str(fps),
+               "-i", "-", "-c:v", "libx264", "-pix_fmt", "yuv420p", out]
+    return subprocess.Popen(command, stdin=subprocess.PIPE)
+
+
+def export_video(path, out=None, fps=FPS, pool=None):
+    """Encode the log at `path` to `out` (default <log>.mp4), rendering on
+    `pool` if given, else in this process."""
+    log = ScanLog(path)
+    out = out or log.base + ".mp4"
+    tasks = [(log.base, i) for i in range(len(log))]
+    frames = pool.imap(render_frame, tasks, CHUNKSIZE) if pool else map(render_frame, tasks)
+
+    encoder = _encoder(out, fps)
+    try:
+        for frame in frames:
+            encoder.stdin.write(frame)
+    finally:
+        encoder.stdin.close()
+        encoder.wait()
+    if encoder.returncode:
+        raise RuntimeError(f"ffmpeg failed on {out} (exit {encoder.returncode})")
+    return out
+
+
+def find_logs(paths, force=False):
+    """Log base paths among `paths` (logs or directories of logs); directory
+    entries that already have an mp4 are skipped unless `force`."""
+    logs = []
+    for path in paths:
+        if not os.path.isdir(path):
+            logs.append(path)
+            continue
+        for index in sorted(glob.glob(os.path.join(path, "*" + INDEX_EXT))):
+            base = index[:-len(INDEX_EXT)]
+            if force or not os.path.exists(base + ".mp4"):
+                logs.append(base)
+    return logs
+
+
+def export_all(paths, jobs=None, fps=FPS, force=False):
+    """Export every log in `paths` with one pool of `jobs` renderers."""
+    jobs = jobs or os.cpu_count()
+    pool = multiprocessing.Pool(jobs) if jobs > 1 else None
+    done = []
+    try:
+        for base in find_logs(paths, force):
+            n = len(ScanLog(base))
+            t0 = time.perf_counter()
+            out = export_video(base, fps=fps, pool=pool)
+            elapsed = time.perf_counter() - t0
+            print(f"{out}: {n} frames in {elapsed:.1f} s ({n / elapsed:.1f} frames/s, {jobs} jobs)")
+            done.append(out)
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+    return done
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render scan logs to mp4")
+    parser.add_argument("paths", nargs="+", help="scan logs or directories of them")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="render processes (default: all cores)")
+    parser.add_argument("--fps", type=int, default=FPS)
+    parser.add_argument("--force", action="store_true", help="re-export logs that already have an mp4")
+    args = parser.parse_args()
+    export_all(args.paths, args.jobs, args.fps, args.force)
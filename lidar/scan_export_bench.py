@@ -0,0 +1,59 @@
+# Scaling of the scan export's frame rendering with worker processes.
+#
+# Records a synthetic log (lidar.raster_bench scans of a 4 x 3 m room),
+# then renders every frame through scan_export.render_frame on a pool of
+# 1..cpu_count workers, the way export_video does, and reports frames/s
+# and the speed-up over one worker. Frames are rendered and dropped; the
+# ffmpeg encoder is a single process fed in order and is not part of the
+# sweep.
+#
+#   python -m lidar.scan_export_bench [n_frames] [max_jobs]
+
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+from lidar import scan_export
+from lidar.raster_bench import synthetic_scans
+from lidar.scan_log import ScanRecorder
+
+N_FRAMES = 240
+
+
+def synthetic_log(n):
+    base = os.path.join(tempfile.mkdtemp(), "export_bench")
+    with ScanRecorder(base) as recorder:
+        for i, scan in enumerate(synthetic_scans(n)):
+            recorder.append(scan, t=i / 10.0)
+    return base
+
+
+def render_rate(base, n, jobs):
+    tasks = [(base, i) for i in range(n)]
+    with multiprocessing.Pool(jobs) as pool:
+        # one frame per worker first, so figure setup isn't timed
+        pool.map(scan_export.render_frame, tasks[:jobs], 1)
+        t0 = time.perf_counter()
+        for _ in pool.imap(scan_export.render_frame, tasks, scan_export.CHUNKSIZE):
+            pass
+        return n / (time.perf_counter() - t0)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else N_FRAMES
+    max_jobs = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count()
+    base = synthetic_log(n)
+    print(f"{n} frames of {scan_export.frame_size()[0]}x{scan_export.frame_size()[1]}, "
+          f"{os.cpu_count()} cores")
+    single = None
+    for jobs in range(1, max_jobs + 1):
+        rate = render_rate(base, n, jobs)
+        single = single or rate
+        print(f"  {jobs:2d} jobs: {rate:7.1f} frames/s  {rate / single:5.2f}x  "
+              f"({rate / single / jobs * 100:3.0f}% of linear)")
+
+
+if __name__ == "__main__":
+    main()
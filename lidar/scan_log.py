@@ -0,0 +1,162 @@
+# Compact binary log of raw RPLidar scans.
+#
+# A log is two files next to each other:
+#   <base>.scans  every measurement back to back as MEAS_DTYPE (9 bytes)
+#   <base>.sidx   a header, then one INDEX_DTYPE record per scan with its
+#                 monotonic timestamp, offset and point count
+#
+# ScanRecorder appends scans and flushes them in chunks, data before index,
+# so a reader never sees an index entry for data that isn't on disk.
+# ScanLog memory-maps both files: scan i is one index lookup plus a slice
+# (O(1)), and the scan at a given time is a binary search on the index.
+
+import datetime
+import os
+import time
+
+import numpy as np
+
+MAGIC = b"HOPESCAN"
+VERSION = 1
+CHUNK = 32  # scans buffered before each write
+
+MEAS_DTYPE = np.dtype([("quality", "u1"), ("angle", "<f4"), ("distance", "<f4")])
+INDEX_DTYPE = np.dtype([("t", "<f8"), ("offset", "<u8"), ("count", "<u4")])
+# magic, version, wall-clock time of the first scan (unix seconds)
+HEADER_DTYPE = np.dtype([("magic", "S8"), ("version", "<u4"), ("pad", "<u4"), ("t_wall", "<f8")])
+
+DATA_EXT = ".scans"
+INDEX_EXT = ".sidx"
+
+
+def log_base(directory="lidar"):
+    """Default base path, named like the old lidar_YYYYMMDD_HH:MM:SS.mp4 files."""
+    timestamp = datetime.datetime.now().strftime('%Y%m%d_%H:%M:%S')
+    return os.path.join(directory, f"lidar_{timestamp}")
+
+
+def _base(path):
+    for ext in (DATA_EXT, INDEX_EXT):
+        if path.endswith(ext):
+            return path[:-len(ext)]
+    return path
+
+
+class ScanRecorder:
+    """Append (quality, angle, distance) scans to a log at `base`."""
+
+    def __init__(self, base, chunk=CHUNK):
+        self.base = _base(base)
+        self.chunk = chunk
+        self.data = open(self.base + DATA_EXT, "wb")
+        self.index = open(self.base + INDEX_EXT, "wb")
+        self.offset = 0
+        self.count = 0
+        self.pending = []
+        # written now so a recording stopped before its first scan is still
+        # a readable (empty) log; t_wall is corrected on the first scan
+        self._write_header(time.time())
+        self.index.flush()
+        self.started = False
+
+    def _write_header(self, t_wall):
+        header = np.zeros(1, dtype=HEADER_DTYPE)
+        header["magic"] = MAGIC
+        header["version"] = VERSION
+        header["t_wall"] = t_wall
+        self.index.seek(0)
+        self.index.write(header.tobytes())
+
+    def append(self, scan, t=None):
+        """Add one scan, timestamped with time.monotonic() unless `t` is given."""
+        t = time.monotonic() if t is None else t
+        if not self.started:
+            # nothing but the header is in the index yet
+            self._write_header(time.time() - (time.monotonic() - t))
+            self.started = True
+        points = np.asarray(scan, dtype=float).reshape(-1, 3)
+        meas = np.zeros(len(points), dtype=MEAS_DTYPE)
+        meas["quality"] = points[:, 0]
+        meas["angle"] = points[:, 1]
+        meas["distance"] = points[:, 2]
+        self.pending.append((t, meas))
+        if len(self.pending) >= self.chunk:
+            self.flush()
+
+    def flush(self):
+        if not self.pending:
+            return
+        entries = np.zeros(len(self.pending), dtype=INDEX_DTYPE)
+        for i, (t, meas) in enumerate(self.pending):
+            entries[i] = (t, self.offset, len(meas))
+            self.data.write(meas.tobytes())
+            self.offset += len(meas)
+        self.data.flush()
+        self.index.write(entries.tobytes())
+        self.index.flush()
+        self.count += len(self.pending)
+        self.pending = []
+
+    def close(self):
+        self.flush()
+        self.data.close()
+        self.index.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ScanLog:
+    """Read-only, memory-mapped view of a scan log."""
+
+    def __init__(self, path):
+        self.base = _base(path)
+        header = np.fromfile(self.base + INDEX_EXT, dtype=HEADER_DTYPE, count=1)
+        if not len(header) or header["magic"][0] != MAGIC:
+            raise ValueError(f"{self.base + INDEX_EXT} is not a scan log")
+        self.t_wall = float(header["t_wall"][0])
+
+        index_bytes = os.path.getsize(self.base + INDEX_EXT) - HEADER_DTYPE.itemsize
+        n = index_bytes // INDEX_DTYPE.itemsize
+        self.index = (np.memmap(self.base + INDEX_EXT, dtype=INDEX_DTYPE, mode="r",
+                                offset=HEADER_DTYPE.itemsize, shape=(n,))
+                      if n else np.zeros(0, INDEX_DTYPE))
+        n_meas = os.path.getsize(self.base + DATA_EXT) // MEAS_DTYPE.itemsize
+        self.data = (np.memmap(self.base + DATA_EXT, dtype=MEAS_DTYPE, mode="r", shape=(n_meas,))
+                     if n_meas else np.zeros(0, MEAS_DTYPE))
+
+    def __len__(self):
+        return len(self.index)
+
+    def __getitem__(self, i):
+        """Scan `i` as a structured array view (quality, angle, distance)."""
+        entry = self.index[i]
+        start = int(entry["offset"])
+        return self.data[start:start + int(entry["count"])]
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    @property
+    def times(self):
+        return self.index["t"]
+
+    @property
+    def duration(self):
+        return float(self.times[-1] - self.times[0]) if len(self) else 0.0
+
+    def index_at(self, t):
+        """Index of the last scan recorded at or before monotonic time `t`."""
+        return max(0, int(np.searchsorted(self.times, t, side="right")) - 1)
+
+    def scan_at(self, t):
+        return self[self.index_at(t)]
+
+    def as_tuples(self, i):
+        """Scan `i` in the RPLidar iter_scans() form: a list of (quality, angle, distance)."""
+        scan = self[i]
+        return list(zip(scan["quality"].tolist(), scan["angle"].tolist(), scan["distance"].tolist()))
@@ -0,0 +1,143 @@
+# Background LiDAR reader that always has the newest complete scan.
+#
+# A thread decodes measurements from the driver as fast as they arrive and
+# fills one of two NumPy scan buffers; when a rotation completes the
+# buffers swap, so consumers copy the newest scan out of the other one and
+# never see a half-written scan. A slow consumer (a matplotlib frame, a
+# pygame blit) just skips scans instead of letting the serial buffer back
+# up, and `dropped` counts what it skipped.
+
+import threading
+import time
+
+import numpy as np
+
+MAX_POINTS = 1024     # per scan; an RPLidar A1 gives ~360 at 10 Hz
+MIN_LEN = 5           # shorter scans are discarded, as in RPLidar.iter_scans()
+MAX_BUF_MEAS = 5000
+MAX_RESTARTS = 5      # consecutive driver errors before the reader gives up
+
+
+class ScanReader(threading.Thread):
+    """Reads `lidar` (RPLidar or ReplayLidar) continuously in the background."""
+
+    def __init__(self, lidar, max_points=MAX_POINTS, min_len=MIN_LEN, max_buf_meas=MAX_BUF_MEAS):
+        super().__init__(daemon=True)
+        self.lidar = lidar
+        self.min_len = min_len
+        self.max_buf_meas = max_buf_meas
+        # rows of (quality, angle, distance); back is being filled, front is published
+        self.buffers = [np.zeros((max_points, 3)), np.zeros((max_points, 3))]
+        self.back = 0
+        self.front = 1
+        self.front_len = 0
+        self.t = None        # monotonic time the front scan completed
+        self.seq = 0         # complete scans published
+        self.read_seq = 0    # seq of the last scan handed to a consumer
+        self.dropped = 0     # scans replaced before any consumer read them
+        self.overruns = 0    # scans truncated at max_points, plus driver buffer errors
+        self.error = None    # last driver exception
+        self.running = True
+        self.lock = threading.Lock()
+        self.fresh = threading.Condition(self.lock)
+
+    def run(self):
+        restarts = 0
+        seq = self.seq
+        while self.running:
+            try:
+                self._read()
+                break   # the source ran out (end of a replay)
+            except Exception as exc:
+                if not self.running:
+                    break
+                self.error = exc
+                self.overruns += 1
+                restarts = 1 if self.seq != seq else restarts + 1
+                seq = self.seq
+                if restarts > MAX_RESTARTS:
+                    break
+                # the input buffer overflowed or desynced: flush and restart the scan
+                self.lidar.stop()
+                self.lidar.clear_input()
+        self.running = False
+        with self.fresh:
+            self.fresh.notify_all()
+
+    def _read(self):
+        buf = self.buffers[self.back]
+        n = 0
+        truncated = False
+        for new_scan, quality, angle, distance in self.lidar.iter_measurements(max_buf_meas=self.max_buf_meas):
+            if not self.running:
+                return
+            if new_scan:
+                if n >= self.min_len:
+                    self._publish(n)
+                buf = self.buffers[self.back]
+                n = 0
+                truncated = False
+            if quality > 0 and distance > 0:
+                if n < len(buf):
+                    buf[n] = (quality, angle, distance)
+                    n += 1
+                elif not truncated:
+                    truncated = True
+                    self.overruns += 1
+        if n >= self.min_len:
+            self._publish(n)
+
+    def _publish(self, n):
+        with self.fresh:
+            if self.seq > self.read_seq:
+                self.dropped += 1
+            self.front, self.back = self.back, self.front
+            self.front_len = n
+            self.t = time.monotonic()
+            self.seq += 1
+            self.fresh.notify_all()
+
+    def latest(self, max_age=None):
+        """(scan, age in s) for the newest complete scan, or None if there is
+        none (or it is older than max_age). scan is an (N, 3) array of
+        quality, angle, distance rows, owned by the caller."""
+        with self.lock:
+            if not self.seq:
+                return None
+            age = time.monotonic() - self.t
+            if max_age is not None and age > max_age:
+                return None
+            self.read_seq = self.seq
+            return self.buffers[self.front][:self.front_len].copy(), age
+
+    def wait_next(self, timeout=1.0):
+        """Block until a scan newer than the last one read lands; False on timeout."""
+        with self.fresh:
+            self.fresh.wait_for(lambda: self.seq > self.read_seq or not self.running, timeout)
+            return self.seq > self.read_seq
+
+    def after(self, seq, timeout=1.0):
+        """(seq, t, scan) for the newest scan published after `seq`, waiting up
+        to `timeout`; None if none arrives. Unlike latest() this doesn't mark
+        the scan read, so a second consumer (a proximity guard next to the
+        display) can follow the reader without stealing its scans."""
+        with self.fresh:
+            self.fresh.wait_for(lambda: self.seq > seq or not self.running, timeout)
+            if self.seq <= seq:
+                return None
+            return self.seq, self.t, self.buffers[self.front][:self.front_len].copy()
+
+    def scans(self, timeout=1.0):
+        """Yield the newest scan each time one is ready, skipping any missed
+        in between. A drop-in for iter_scans() in a frame callback."""
+        while self.running or self.seq > self.read_seq:
+            if self.wait_next(timeout):
+                yield self.latest()[0]
+
+    @property
+    def stats(self):
+        return {"scans": self.seq, "dropped": self.dropped, "overruns": self.overruns}
+
+    def stop(self):
+        self.running = False
+        self.lidar.stop()
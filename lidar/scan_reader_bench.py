@@ -0,0 +1,61 @@
+# Age of the scans a slow consumer sees: reading iter_scans() directly vs
+# taking the newest scan from lidar.scan_reader.ScanReader.
+#
+# A synthetic log is replayed in real time at 10 Hz into a consumer that
+# spends FRAME_TIME per scan, like a matplotlib frame. Read directly, each
+# scan waits behind all the ones before it (on the device, in the serial
+# buffer); through the reader, stale scans are dropped instead.
+#
+#   python -m lidar.scan_reader_bench [frame_time_s] [n_frames]
+
+import sys
+import time
+
+import numpy as np
+
+from lidar.replay import ReplayLidar
+from lidar.replay_bench import synthetic_log
+from lidar.scan_reader import ScanReader
+
+FRAME_TIME = 0.25
+N_FRAMES = 12
+
+
+def direct(path, frame_time, n):
+    lidar = ReplayLidar(path)
+    ages = []
+    for i, scan in enumerate(lidar.iter_scans()):
+        ages.append(lidar.behind)
+        time.sleep(frame_time)
+        if i + 1 >= n:
+            break
+    return np.array(ages)
+
+
+def threaded(path, frame_time, n):
+    reader = ScanReader(ReplayLidar(path))
+    reader.start()
+    ages = []
+    while len(ages) < n and reader.wait_next(1.0):
+        scan, age = reader.latest()
+        ages.append(age)
+        time.sleep(frame_time)
+    reader.stop()
+    return np.array(ages), reader.stats
+
+
+def main():
+    frame_time = float(sys.argv[1]) if len(sys.argv) > 1 else FRAME_TIME
+    n = int(sys.argv[2]) if len(sys.argv) > 2 else N_FRAMES
+    path = synthetic_log(int(n * frame_time * 10) + 20)
+
+    old = direct(path, frame_time, n)
+    new, stats = threaded(path, frame_time, n)
+    print(f"10 Hz scans, consumer takes {frame_time:.2f} s per frame, {n} frames")
+    print(f"  iter_scans() : scan age mean {old.mean():5.2f} s, last {old[-1]:5.2f} s")
+    print(f"  ScanReader   : scan age mean {new.mean():5.2f} s, last {new[-1]:5.2f} s"
+          f"  ({stats['dropped']} stale scans dropped)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+# Shared-memory ring of LiDAR scans for multiprocess consumers.
+#
+# One producer process publishes scans into a fixed layout in a
+# multiprocessing.shared_memory block:
+#
+#   header     magic, head sequence number, ring geometry
+#   consumers  one record per subscriber: name, pid, cursor, missed
+#   slots      `slots` records of (seq, t, count, points[max_points, 3])
+#
+# Scan n goes to slot (n - 1) % slots. A slot's seq is cleared while it is
+# being written and set to n afterwards, then the head moves on; readers
+# check the slot seq before and after reading, so a scan the producer
+# lapped mid-read is discarded rather than returned torn. Consumers read
+# scans in place (copy=False) or copy them out; nothing is pickled.
+#
+# Each subscriber keeps its cursor in the consumers table, so the producer
+# (or anyone attached) can report how far behind every consumer is.
+
+import os
+import time
+
+import numpy as np
+from multiprocessing import resource_tracker, shared_memory
+
+CHANNEL = "hope_lidar"
+MAGIC = b"HOPESHM1"
+SLOTS = 16
+MAX_POINTS = 1024
+MAX_CONSUMERS = 8
+POLL = 0.002   # seconds between checks while waiting for a scan
+
+HEADER_DTYPE = np.dtype([("magic", "S8"), ("seq", "<u8"), ("slots", "<u4"),
+                         ("max_points", "<u4"), ("max_consumers", "<u4"), ("pad", "<u4")])
+CONSUMER_DTYPE = np.dtype([("name", "S24"), ("pid", "<u4"), ("active", "<u4"),
+                           ("cursor", "<u8"), ("missed", "<u8")])
+
+
+def slot_dtype(max_points):
+    return np.dtype([("seq", "<u8"), ("t", "<f8"), ("count", "<u4"), ("pad", "<u4"),
+                     ("points", "<f4", (max_points, 3))])
+
+
+def _attach(name):
+    # Before Python 3.13 every SharedMemory attach is registered with the
+    # resource tracker, which unlinks the block when the attaching process
+    # exits. Only the creator should own it.
+    register = resource_tracker.register
+    resource_tracker.register = lambda *args, **kwargs: None
+    try:
+        return shared_memory.SharedMemory(name)
+    finally:
+        resource_tracker.register = register
+
+
+class ScanChannel:
+    """Create (create=True) or attach to the scan ring called `name`."""
+
+    def __init__(self, name=CHANNEL, create=False, slots=SLOTS, max_points=MAX_POINTS,
+                 max_consumers=MAX_CONSUMERS):
+        if create:
+            size = (HEADER_DTYPE.itemsize + max_consumers * CONSUMER_DTYPE.itemsize
+                    + slots * slot_dtype(max_points).itemsize)
+            self.shm = shared_memory.SharedMemory(name, create=True, size=size)
+        else:
+            self.shm = _attach(name)
+        self.name = name
+        self.owner = create
+
+        self.header = np.ndarray((), dtype=HEADER_DTYPE, buffer=self.shm.buf)
+        if create:
+            self.header[()] = (MAGIC, 0, slots, max_points, max_consumers, 0)
+        elif self.header["magic"] != MAGIC:
+            self.shm.close()
+            raise ValueError(f"shared memory {name!r} is not a scan channel")
+        self.n_slots = int(self.header["slots"])
+        self.max_points = int(self.header["max_points"])
+
+        offset = HEADER_DTYPE.itemsize
+        self.consumers = np.ndarray(int(self.header["max_consumers"]), dtype=CONSUMER_DTYPE,
+                                    buffer=self.shm.buf, offset=offset)
+        offset += self.consumers.nbytes
+        slots = np.ndarray(self.n_slots, dtype=slot_dtype(self.max_points),
+                           buffer=self.shm.buf, offset=offset)
+        self.slot_seq = slots["seq"]
+        self.slot_t = slots["t"]
+        self.slot_count = slots["count"]
+        self.slot_points = slots["points"]
+
+    @property
+    def head(self):
+        """Sequence number of the newest published scan (0 = none yet)."""
+        return int(self.header["seq"])
+
+    def publish(self, scan, t=None):
+        """Write a scan ((N, 3) array or list of (quality, angle, distance)); returns its seq."""
+        points = np.asarray(scan, dtype=np.float32).reshape(-1, 3)[:self.max_points]
+        seq = self.head + 1
+        i = (seq - 1) % self.n_slots
+        self.slot_seq[i] = 0
+        self.slot_points[i, :len(points)] = points
+        self.slot_count[i] = len(points)
+        self.slot_t[i] = time.monotonic() if t is None else t
+        self.slot_seq[i] = seq
+        self.header["seq"] = seq
+        return seq
+
+    def read(self, seq, copy=True):
+        """(seq, t, points) for scan `seq`, or None if it has been overwritten.
+
+        With copy=False, points is a view into shared memory that stays
+        valid until the producer laps the ring; valid(seq) tells whether it
+        still holds.
+        """
+        i = (seq - 1) % self.n_slots
+        if self.slot_seq[i] != seq:
+            return None
+        t = float(self.slot_t[i])
+        points = self.slot_points[i, :int(self.slot_count[i])]
+        if copy:
+            points = points.copy()
+        if self.slot_seq[i] != seq:
+            return None
+        return seq, t, points
+
+    def valid(self, seq):
+        return self.slot_seq[(seq - 1) % self.n_slots] == seq
+
+    def latest(self, copy=True):
+        seq = self.head
+        return self.read(seq, copy) if seq else None
+
+    def subscribe(self, name):
+        return ScanSubscriber(self, name)
+
+    def lags(self):
+        """{consumer name: (scans behind the head, scans missed)} for every active subscriber."""
+        head = self.head
+        return {c["name"].decode(): (head - int(c["cursor"]), int(c["missed"]))
+                for c in self.consumers if c["active"]}
+
+    def close(self):
+        # drop our views first, or SharedMemory.close() refuses
+        self.header = self.consumers = None
+        self.slot_seq = self.slot_t = self.slot_count = self.slot_points = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+class ScanSubscriber:
+    """One consumer's cursor into a ScanChannel, starting at the newest scan."""
+
+    def __init__(self, channel, name):
+        self.channel = channel
+        self.name = name
+        table = channel.consumers
+        free = [i for i, c in enumerate(table) if not c["active"] or c["name"] == name.encode()]
+        if not free:
+            raise RuntimeError(f"scan channel {channel.name!r} has no free consumer slots")
+        self.i = free[0]
+        table[self.i] = (name.encode(), os.getpid(), 1, channel.head, 0)
+
+    @property
+    def cursor(self):
+        return int(self.channel.consumers["cursor"][self.i])
+
+    @property
+    def lag(self):
+        return self.channel.head - self.cursor
+
+    @property
+    def missed(self):
+        return int(self.channel.consumers["missed"][self.i])
+
+    def _advance(self, seq, missed=0):
+        self.channel.consumers["cursor"][self.i] = seq
+        if missed:
+            self.channel.consumers["missed"][self.i] += missed
+
+    def next(self, timeout=1.0, copy=True):
+        """Next scan after the cursor as (seq, t, points), or None on timeout.
+        Scans the producer has already overwritten are skipped and counted
+        in `missed`."""
+        deadline = time.monotonic() + timeout
+        while True:
+            head = self.channel.head
+            cursor = self.cursor
+            if head > cursor:
+                seq = max(cursor + 1, head - self.channel.n_slots + 1)
+                scan = self.channel.read(seq, copy)
+                if scan is not None:
+                    self._advance(seq, seq - cursor - 1)
+                    return scan
+                continue   # lapped while reading, try the new oldest
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(POLL)
+
+    def latest(self, copy=True):
+        """Newest scan, moving the cursor to it (skipped scans aren't counted as missed)."""
+        while True:
+            seq = self.channel.head
+            if not seq:
+                return None
+            scan = self.channel.read(seq, copy)
+            if scan is not None:
+                self._advance(seq)
+                return scan
+
+    def close(self):
+        if self.channel.consumers is not None:
+            self.channel.consumers["active"][self.i] = 0
@@ -0,0 +1,105 @@
+# Fan-out of LiDAR scans to consumer processes: one multiprocessing.Queue
+# per consumer (each scan pickled once per consumer) against one
+# lidar.shm_channel.ScanChannel that every consumer reads in place.
+#
+# The producer pushes N synthetic 360-point scans as fast as it can to
+# CONSUMERS processes; the clock stops when the last consumer has read the
+# last scan. The ring is sized to hold every scan so no consumer misses any.
+# For the ring, ScanChannel.lags() is sampled while publishing to report how
+# far behind the head each consumer fell.
+#
+#   python -m lidar.shm_channel_bench [n_scans] [consumers]
+
+import multiprocessing
+import sys
+import time
+
+import numpy as np
+
+from lidar.raster_bench import synthetic_scans
+from lidar.shm_channel import ScanChannel
+
+N_SCANS = 1000
+CONSUMERS = 3
+BENCH_CHANNEL = "hope_lidar_bench"
+LAG_EVERY = 10   # scans between lags() samples
+
+
+def queue_consumer(queue, n, done):
+    for _ in range(n):
+        scan = queue.get()
+        np.asarray(scan)
+    done.put(time.perf_counter())
+
+
+def shm_consumer(name, i, n, ready, done):
+    channel = ScanChannel(name)
+    sub = channel.subscribe(f"consumer{i}")
+    ready.put(i)
+    for _ in range(n):
+        sub.next(timeout=5.0, copy=False)
+    done.put((time.perf_counter(), sub.missed))
+    sub.close()
+    channel.close()
+
+
+def run_queues(scans, consumers):
+    ctx = multiprocessing.get_context("fork")
+    queues = [ctx.Queue() for _ in range(consumers)]
+    done = ctx.Queue()
+    procs = [ctx.Process(target=queue_consumer, args=(q, len(scans), done)) for q in queues]
+    for p in procs:
+        p.start()
+    t0 = time.perf_counter()
+    for scan in scans:
+        for q in queues:
+            q.put(scan)
+    t_pub = time.perf_counter() - t0
+    t_end = max(done.get() for _ in procs)
+    for p in procs:
+        p.join()
+    return t_pub, t_end - t0, 0, None
+
+
+def run_shm(scans, consumers):
+    ctx = multiprocessing.get_context("fork")
+    channel = ScanChannel(BENCH_CHANNEL, create=True, slots=len(scans))
+    ready, done = ctx.Queue(), ctx.Queue()
+    procs = [ctx.Process(target=shm_consumer, args=(BENCH_CHANNEL, i, len(scans), ready, done))
+             for i in range(consumers)]
+    for p in procs:
+        p.start()
+    for _ in procs:
+        ready.get()
+    arrays = [np.asarray(scan, dtype=np.float32) for scan in scans]
+    worst = {}
+    t0 = time.perf_counter()
+    for k, points in enumerate(arrays):
+        channel.publish(points)
+        if k % LAG_EVERY == 0:
+            for name, (behind, missed) in channel.lags().items():
+                worst[name] = max(worst.get(name, 0), behind)
+    t_pub = time.perf_counter() - t0
+    results = [done.get() for _ in procs]
+    for p in procs:
+        p.join()
+    channel.close()
+    return t_pub, max(t for t, _ in results) - t0, sum(m for _, m in results), worst
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else N_SCANS
+    consumers = int(sys.argv[2]) if len(sys.argv) > 2 else CONSUMERS
+    scans = synthetic_scans(n)
+    print(f"{n} scans of {len(scans[0])} points to {consumers} consumer processes")
+    for name, run in (("Queue per consumer", run_queues), ("shared-memory ring", run_shm)):
+        t_pub, t_all, missed, worst = run(scans, consumers)
+        print(f"  {name:18s}: producer {t_pub / n * 1e6:7.1f} us/scan, "
+              f"all consumers done at {n / t_all:8.1f} scans/s, {missed} missed")
+        if worst:
+            print(f"  {'':18s}  worst lag behind the head: "
+                  + ", ".join(f"{c} {lag} scans" for c, lag in sorted(worst.items())))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,6 @@
-import serial
-import time
+from hardware.serial_broker import open_serial
 
-arduino = serial.Serial('/dev/ttyACM0', 9600, timeout=1)
-time.sleep(2) #wait for arduino to reset
+arduino = open_serial('/dev/ttyACM0', 9600, timeout=1) #waits for arduino to reset unless the serial broker has it open
 
 def send_command(cmd):
 	arduino.write(cmd.encode())
@@ -0,0 +1,93 @@
+# Driver for the two DRV8833 H-bridges on the 4WD Pi motor HAT.
+#
+# The eight direction inputs (AN11..BN22) are claimed as one lgpio group,
+# so any combination of motor states goes out as a single masked
+# group_write: one syscall per command, and both bridges switch together
+# instead of passing through half-updated states pin by pin.
+
+import lgpio as GPIO
+
+#define the pin for drv8833#1
+NSLEEP1 = 12  #Enabling signal pin for drv8833
+AN11 = 17
+AN12 = 27
+BN11 = 22
+BN12 = 23
+#define the pin for drv8833#2
+NSLEEP2 = 13
+AN21 = 24
+AN22 = 25
+BN21 = 26
+BN22 = 16
+
+# group order: bit i of a group write drives DIR_PINS[i].
+# motor n uses bits 2*(n-1) (IN1) and 2*(n-1)+1 (IN2).
+DIR_PINS = [AN11, AN12, BN11, BN12, AN21, AN22, BN21, BN22]
+PINS = [NSLEEP1, NSLEEP2] + DIR_PINS
+NSLEEP = {1: NSLEEP1, 2: NSLEEP2}
+MOTORS = (1, 2, 3, 4)
+
+# per-motor bit pattern, bit 0 = IN1 and bit 1 = IN2
+# 'f' = IN1 high, 'b' = IN2 high, 's' = both low (coast)
+STATES = {'f': 0b01, 'b': 0b10, 's': 0b00}
+
+PWM_FREQ = 1000
+
+
+class DRV8833:
+    """Both DRV8833 bridges of the motor HAT, driven as one lgpio group."""
+
+    def __init__(self, h, duty=20, freq=PWM_FREQ):
+        self.h = h
+        self.freq = freq
+        self.bits = 0
+        self.duty = {1: 0, 2: 0}
+
+        #Define pin as output signal, all motors start stopped
+        GPIO.gpio_claim_output(h, NSLEEP1)
+        GPIO.gpio_claim_output(h, NSLEEP2)
+        GPIO.group_claim_output(h, DIR_PINS, [0] * len(DIR_PINS))
+
+        self.set_duty(duty)
+
+    def set(self, states):
+        """Apply {motor: 'f'|'b'|'s'} to any subset of motors in one write."""
+        bits = 0
+        mask = 0
+        for motor, state in states.items():
+            if motor not in MOTORS:
+                raise ValueError(f"unknown motor {motor!r}")
+            if state not in STATES:
+                raise ValueError(f"unknown motor state {state!r}")
+            shift = 2 * (motor - 1)
+            mask |= 0b11 << shift
+            bits |= STATES[state] << shift
+        GPIO.group_write(self.h, DIR_PINS[0], bits, mask)
+        self.bits = (self.bits & ~mask) | bits
+
+    def set_all(self, state):
+        self.set({motor: state for motor in MOTORS})
+
+    def stop(self):
+        self.set_all('s')
+
+    def state(self, motor):
+        """Return the last state written to `motor`."""
+        value = (self.bits >> 2 * (motor - 1)) & 0b11
+        for name, bits in STATES.items():
+            if bits == value:
+                return name
+        return None
+
+    def set_duty(self, duty, channel=None):
+        """Set the NSLEEP PWM duty cycle (%) on one channel, or both."""
+        channels = NSLEEP if channel is None else (channel,)
+        for ch in channels:
+            GPIO.tx_pwm(self.h, NSLEEP[ch], self.freq, duty)
+            self.duty[ch] = duty
+
+    def close(self):
+        self.stop()
+        GPIO.group_free(self.h, DIR_PINS[0])
+        GPIO.gpio_free(self.h, NSLEEP1)
+        GPIO.gpio_free(self.h, NSLEEP2)
@@ -0,0 +1,59 @@
+# Micro-benchmark: per-command latency of the old pin-by-pin control_motor()
+# writes against a single DRV8833 group write.
+#
+# Runs anywhere: lgpio is replaced by hardware.fake_lgpio, which counts calls
+# and spins for SYSCALL_US per call to stand in for the ioctl cost on the Pi.
+#
+#   python -m suction.drv8833_bench [n_commands] [syscall_us]
+
+import sys
+import time
+
+from hardware import fake_lgpio
+
+SYSCALL_US = 5.0
+N_COMMANDS = 20000
+
+
+def legacy_set_all(GPIO, h, pins, level_in1):
+    # what control_motor('f'/'b') used to do: one gpio_write per pin
+    for i, pin in enumerate(pins):
+        GPIO.gpio_write(h, pin, level_in1 if i % 2 == 0 else 1 - level_in1)
+
+
+def bench(fn, n):
+    t0 = time.perf_counter()
+    for i in range(n):
+        fn(i)
+    return (time.perf_counter() - t0) / n * 1e6
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else N_COMMANDS
+    syscall_us = float(sys.argv[2]) if len(sys.argv) > 2 else SYSCALL_US
+
+    GPIO = fake_lgpio.install(syscall_us)
+    from suction import drv8833
+
+    h = GPIO.gpiochip_open(0)
+    drv = drv8833.DRV8833(h)
+    states = ['f', 'b', 's']
+
+    GPIO.calls = 0
+    old_us = bench(lambda i: legacy_set_all(GPIO, h, drv8833.DIR_PINS, i & 1), n)
+    old_calls = GPIO.calls / n
+
+    GPIO.calls = 0
+    new_us = bench(lambda i: drv.set_all(states[i % 3]), n)
+    new_calls = GPIO.calls / n
+
+    print(f"mock syscall cost: {syscall_us:.1f} us, {n} commands")
+    print(f"  per-pin gpio_write : {old_us:8.2f} us/command  {old_calls:.0f} calls/command"
+          f"  {old_calls - 1:.0f} intermediate pin states")
+    print(f"  DRV8833 group write: {new_us:8.2f} us/command  {new_calls:.0f} calls/command"
+          f"  0 intermediate pin states")
+    print(f"  speed-up           : {old_us / new_us:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# Non-blocking duty-cycle ramps for the NSLEEP1/NSLEEP2 PWM channels.
+#
+# A background thread steps each channel's tx_pwm duty towards its target
+# at a fixed tick, so callers can start a pump or actuator spinning up and
+# go straight on to the next arm move instead of sitting in sleep().
+
+import threading
+import time
+
+TICK = 0.02        # seconds between duty updates (50 Hz)
+MIN_STEP = 0.1     # skip tx_pwm calls for changes smaller than this (%)
+
+
+class _Ramp:
+    def __init__(self, start, target, ramp_time, t0):
+        self.start = start
+        self.target = target
+        self.ramp_time = ramp_time
+        self.t0 = t0
+
+    def duty_at(self, now):
+        if self.ramp_time <= 0 or now - self.t0 >= self.ramp_time:
+            return self.target
+        frac = (now - self.t0) / self.ramp_time
+        return self.start + (self.target - self.start) * frac
+
+
+class PwmRamp(threading.Thread):
+    """Ramp scheduler for the NSLEEP channels of a DRV8833 driver."""
+
+    def __init__(self, drv, tick=TICK):
+        super().__init__(daemon=True)
+        self.drv = drv
+        self.tick = tick
+        self.ramps = {}
+        self.cond = threading.Condition()
+        self.running = True
+
+    def ramp(self, channel, duty, ramp_time=0.0):
+        """Start moving `channel` to `duty` (%) over `ramp_time` seconds; returns at once."""
+        duty = max(0.0, min(100.0, float(duty)))
+        with self.cond:
+            current = self.ramps.get(channel)
+            start = current.duty_at(time.monotonic()) if current else self.drv.duty[channel]
+            self.ramps[channel] = _Ramp(start, duty, ramp_time, time.monotonic())
+            self.cond.notify_all()
+
+    def ramp_all(self, duty, ramp_time=0.0):
+        for channel in self.drv.duty:
+            self.ramp(channel, duty, ramp_time)
+
+    def busy(self, channel=None):
+        with self.cond:
+            return self._pending(channel)
+
+    def wait(self, channel=None, timeout=None):
+        """Block until the ramp on `channel` (or every ramp) has finished."""
+        with self.cond:
+            return self.cond.wait_for(lambda: not self._pending(channel), timeout)
+
+    def _pending(self, channel):
+        return bool(self.ramps) if channel is None else channel in self.ramps
+
+    def run(self):
+        next_tick = time.monotonic()
+        while self.running:
+            with self.cond:
+                while self.running and not self.ramps:
+                    self.cond.wait()
+                    next_tick = time.monotonic()
+                now = time.monotonic()
+                finished = False
+                for channel, ramp in list(self.ramps.items()):
+                    duty = ramp.duty_at(now)
+                    done = duty == ramp.target
+                    if done or abs(duty - self.drv.duty[channel]) >= MIN_STEP:
+                        self.drv.set_duty(duty, channel)
+                    if done:
+                        del self.ramps[channel]
+                        finished = True
+                if finished:
+                    self.cond.notify_all()
+                if not self.ramps:
+                    continue
+            # fixed tick on absolute deadlines, so write time does not stretch the ramp
+            next_tick += self.tick
+            delay = next_tick - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_tick = time.monotonic()
+
+    def stop(self):
+        with self.cond:
+            self.running = False
+            self.ramps.clear()
+            self.cond.notify_all()
@@ -1,13 +1,16 @@
 import lgpio as GPIO
 import time
 
+from hardware import gpio_registry
+
 LED_PIN = 18
 
-h = GPIO.gpiochip_open(0)
+led = gpio_registry.declare("led", outputs=[LED_PIN])
 
 try:
+    h = led.h
     GPIO.gpio_write(h, LED_PIN, 1)
     time.sleep(5.00)
     GPIO.gpio_write(h, LED_PIN, 0)
 except KeyboardInterrupt:
-    GPIO.gpiochip_close(h)
+    gpio_registry.close()
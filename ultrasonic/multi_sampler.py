@@ -0,0 +1,100 @@
+# Round-robin sampling of several HC-SR04s without crosstalk.
+#
+# Only one sensor is ever pinging. The next sensor fires as soon as the
+# previous echo is in (or timed out), plus a guard: RECOVERY_TIME after the
+# echo, and never less than MAX_FLIGHT after the previous trigger so a far
+# reflection of one ping can't land in the next sensor's window. Sensors
+# therefore share the air time back to back instead of each sleeping on a
+# fixed period, which maximizes the aggregate sample rate.
+
+import threading
+import time
+
+import numpy as np
+
+from ultrasonic.sampler import BUFFER_SIZE, RECOVERY_TIME, RangeBuffer
+
+# round trip to the HC-SR04's 4 m maximum range
+MAX_FLIGHT = 0.025
+
+
+class MultiSampler(threading.Thread):
+    """Ping {name: ranger} in turn; each sensor gets its own RangeBuffer."""
+
+    def __init__(self, rangers, size=BUFFER_SIZE):
+        super().__init__(daemon=True)
+        self.rangers = dict(rangers)
+        self.buffers = {name: RangeBuffer(size) for name in self.rangers}
+        self.running = True
+        self.t_start = None
+        self.errors = {name: 0 for name in self.rangers}    # pings whose measure() raised
+        self.last_error = {name: None for name in self.rangers}
+
+    def run(self):
+        self.t_start = time.monotonic()
+        next_ping = self.t_start
+        while self.running:
+            for name, ranger in self.rangers.items():
+                if not self.running:
+                    break
+                delay = next_ping - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                t = time.monotonic()
+                try:
+                    distance = ranger.measure()
+                except Exception as e:
+                    # recorded as a missed echo; the other sensors keep sampling
+                    distance = None
+                    self.errors[name] += 1
+                    self.last_error[name] = e
+                self.buffers[name].append(t, distance)
+                next_ping = max(t + MAX_FLIGHT, time.monotonic() + RECOVERY_TIME)
+
+    def latest(self, name, max_age=None):
+        """Latest distance in cm from `name`, or None if there is none (or it is older than max_age s)."""
+        sample = self.buffers[name].latest()
+        if sample is None:
+            return None
+        t, distance = sample
+        if max_age is not None and time.monotonic() - t > max_age:
+            return None
+        return distance
+
+    def median(self, name, n=5, max_age=None):
+        """Median of the valid readings among `name`'s last `n`, leaving out any older than max_age s."""
+        t, d = self.buffers[name].samples(n)
+        keep = ~np.isnan(d)
+        if max_age is not None:
+            keep &= t >= time.monotonic() - max_age
+        return float(np.median(d[keep])) if keep.any() else None
+
+    def readings(self, n=None):
+        """{name: structured array of (t, distance)} for the last `n` pings per sensor."""
+        out = {}
+        for name, buf in self.buffers.items():
+            t, d = buf.samples(n)
+            arr = np.empty(len(t), dtype=[("t", "f8"), ("distance", "f8")])
+            arr["t"] = t
+            arr["distance"] = d
+            out[name] = arr
+        return out
+
+    def rates(self):
+        """Achieved pings per second for each sensor since start."""
+        if self.t_start is None:
+            return {name: 0.0 for name in self.buffers}
+        elapsed = max(time.monotonic() - self.t_start, 1e-9)
+        return {name: buf.count / elapsed for name, buf in self.buffers.items()}
+
+    def stop(self):
+        self.running = False
+
+    def close(self):
+        """Stop sampling and release every ranger."""
+        self.stop()
+        if self.is_alive() and self is not threading.current_thread():
+            self.join(timeout=1.0)
+        for ranger in self.rangers.values():
+            if hasattr(ranger, "close"):
+                ranger.close()
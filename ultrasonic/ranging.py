@@ -0,0 +1,93 @@
+# HC-SR04 ranging backends.
+#
+# AlertRanger times the echo pulse from the kernel's edge timestamps
+# (gpio_claim_alert + callback), so the caller just waits on an event:
+# no core pegged on gpio_read, no Python-loop jitter in the measurement,
+# and a bounded wait that returns None when the echo never comes back.
+#
+# busy_wait_distance() is the original gpio_read polling loop with a
+# timeout added, kept as a fallback and as the benchmark baseline.
+
+import threading
+import time
+
+import lgpio as GPIO
+
+# multiply with the sonic speed (34300 cm/s)
+# and divide by 2 to avoid counting both distances there and back
+CM_PER_SECOND = 17150
+
+# the HC-SR04 holds ECHO high for ~38 ms when nothing is in range
+ECHO_TIMEOUT = 0.05
+
+
+def trigger(h, trig):
+    # send 10us pulse to trig
+    GPIO.gpio_write(h, trig, 1)
+    time.sleep(0.00001)
+    GPIO.gpio_write(h, trig, 0)
+
+
+class AlertRanger:
+    """Echo pulse timing from lgpio alert timestamps.
+
+    TRIG must already be claimed as an output; ECHO is claimed here as an
+    alert on both edges.
+    """
+
+    def __init__(self, h, trig, echo, timeout=ECHO_TIMEOUT):
+        self.h = h
+        self.trig = trig
+        self.echo = echo
+        self.timeout = timeout
+        self._rise = None
+        self._pulse_ns = None
+        self._done = threading.Event()
+        GPIO.gpio_claim_alert(h, echo, GPIO.BOTH_EDGES)
+        self._cb = GPIO.callback(h, echo, GPIO.BOTH_EDGES, self._edge)
+
+    def _edge(self, chip, gpio, level, timestamp):
+        # timestamp is the kernel's edge time in ns
+        if level == 1:
+            self._rise = timestamp
+        elif level == 0 and self._rise is not None and not self._done.is_set():
+            self._pulse_ns = timestamp - self._rise
+            self._done.set()
+
+    def measure(self):
+        """Trigger one ping; return the distance in cm, or None on a missed echo."""
+        self._rise = None
+        self._pulse_ns = None
+        self._done.clear()
+        trigger(self.h, self.trig)
+        if not self._done.wait(self.timeout):
+            return None
+        distance = self._pulse_ns / 1e9 * CM_PER_SECOND
+        return round(distance, 2)
+
+    def close(self):
+        self._cb.cancel()
+        GPIO.gpio_free(self.h, self.echo)
+
+
+def busy_wait_distance(h, trig, echo, timeout=ECHO_TIMEOUT):
+    """Polling measurement (ECHO claimed as an input); None on timeout."""
+    trigger(h, trig)
+
+    # start recording the time when the wave is sent
+    deadline = time.monotonic() + timeout
+    pulse_start = time.monotonic()
+    while GPIO.gpio_read(h, echo) == 0:
+        pulse_start = time.monotonic()
+        if pulse_start > deadline:
+            return None
+
+    # record time of arrival
+    pulse_end = pulse_start
+    while GPIO.gpio_read(h, echo) == 1:
+        pulse_end = time.monotonic()
+        if pulse_end > deadline:
+            return None
+
+    distance = (pulse_end - pulse_start) * CM_PER_SECOND
+    return round(distance, 2)
@@ -0,0 +1,77 @@
+# CPU use and measurement spread: busy-wait polling vs alert timestamps.
+#
+# Runs on hardware.fake_lgpio with a simulated HC-SR04 at a fixed distance.
+# The echo source flips ECHO from its own thread, so the polling loop sees
+# the edges with Python scheduling jitter while the alert callbacks get the
+# exact edge times, as they would from the kernel. Every `miss_every`-th
+# ping gets no echo, to show the timeout path.
+#
+#   python -m ultrasonic.ranging_bench [n_pings] [distance_cm]
+
+import statistics
+import sys
+import time
+
+from hardware import fake_lgpio
+
+TRIG = 20
+ECHO = 21
+N_PINGS = 200
+DISTANCE = 50.0
+MISS_EVERY = 25
+SYSCALL_US = 2.0
+
+
+def run(measure, n):
+    readings = []
+    misses = 0
+    cpu0 = time.thread_time()
+    wall0 = time.perf_counter()
+    for _ in range(n):
+        d = measure()
+        if d is None:
+            misses += 1
+        else:
+            readings.append(d)
+    cpu = time.thread_time() - cpu0
+    wall = time.perf_counter() - wall0
+    return readings, misses, cpu, wall
+
+
+def report(label, readings, misses, cpu, wall, n):
+    mean = statistics.mean(readings)
+    stdev = statistics.stdev(readings)
+    print(f"  {label:10s}: cpu {cpu / n * 1e3:6.3f} ms/ping ({cpu / wall * 100:5.1f}% of a core)  "
+          f"mean {mean:7.3f} cm  stdev {stdev:6.3f} cm  misses {misses}")
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else N_PINGS
+    distance = float(sys.argv[2]) if len(sys.argv) > 2 else DISTANCE
+
+    GPIO = fake_lgpio.install(SYSCALL_US)
+    from ultrasonic.ranging import AlertRanger, busy_wait_distance
+
+    count = [0]
+
+    def distance_fn():
+        count[0] += 1
+        return None if count[0] % MISS_EVERY == 0 else distance
+
+    fake_lgpio.add_echo(TRIG, ECHO, distance_fn)
+    h = GPIO.gpiochip_open(0)
+    GPIO.gpio_claim_output(h, TRIG)
+
+    print(f"simulated echo at {distance:.1f} cm, {n} pings, 1 in {MISS_EVERY} missed")
+
+    GPIO.gpio_claim_input(h, ECHO)
+    report("busy-wait", *run(lambda: busy_wait_distance(h, TRIG, ECHO), n), n)
+
+    count[0] = 0
+    ranger = AlertRanger(h, TRIG, ECHO)
+    report("alerts", *run(ranger.measure, n), n)
+    ranger.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+# Continuous background ultrasonic sampling.
+#
+# A thread pings the sensor at a fixed rate and drops each reading into a
+# fixed-size ring buffer, so callers read the latest (or a filtered)
+# distance straight from memory instead of waiting seconds for a ping.
+
+import threading
+import time
+
+import numpy as np
+
+RATE = 20.0            # pings per second
+# quiet time after an echo (or timeout) before the next ping, so late
+# reflections of the previous ping die out before the sensor listens again
+RECOVERY_TIME = 0.02
+BUFFER_SIZE = 64
+
+
+class RangeBuffer:
+    """Fixed-size ring of (monotonic time, distance cm); NaN marks a missed echo."""
+
+    def __init__(self, size=BUFFER_SIZE):
+        self.size = size
+        self.t = np.full(size, np.nan)
+        self.d = np.full(size, np.nan)
+        self.count = 0
+        self.last_valid = -1
+        self.lock = threading.Lock()
+
+    def append(self, t, distance):
+        with self.lock:
+            i = self.count % self.size
+            self.t[i] = t
+            self.d[i] = np.nan if distance is None else distance
+            if distance is not None:
+                self.last_valid = self.count
+            self.count += 1
+
+    def latest(self):
+        """Most recent valid (t, distance), or None."""
+        with self.lock:
+            if self.last_valid < 0 or self.count - self.last_valid > self.size:
+                return None
+            i = self.last_valid % self.size
+            return float(self.t[i]), float(self.d[i])
+
+    def samples(self, n=None):
+        """(t, distance) arrays of the last `n` samples (default all), oldest first."""
+        with self.lock:
+            n = min(self.size if n is None else n, self.count, self.size)
+            idx = (np.arange(self.count - n, self.count)) % self.size
+            return self.t[idx], self.d[idx]
+
+    def recent(self, n):
+        """Valid distances among the last `n` samples, oldest first."""
+        t, d = self.samples(n)
+        return d[~np.isnan(d)]
+
+
+class UltrasonicSampler(threading.Thread):
+    """Pings `ranger` (anything with measure() -> cm or None) in the background."""
+
+    def __init__(self, ranger, rate=RATE, size=BUFFER_SIZE):
+        super().__init__(daemon=True)
+        self.ranger = ranger
+        self.period = 1.0 / rate
+        self.buffer = RangeBuffer(size)
+        self.running = True
+        self.fresh = threading.Condition()
+        self.errors = 0          # pings whose measure() raised; recorded as missed echoes
+        self.last_error = None
+
+    def run(self):
+        next_ping = time.monotonic()
+        while self.running:
+            delay = next_ping - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            t = time.monotonic()
+            try:
+                distance = self.ranger.measure()
+            except Exception as e:
+                # one bad ping must not end sampling for good
+                distance = None
+                self.errors += 1
+                self.last_error = e
+            self.buffer.append(t, distance)
+            with self.fresh:
+                self.fresh.notify_all()
+            # fixed rate on absolute deadlines, but never sooner than the
+            # sensor's recovery time after this echo finished
+            next_ping = max(next_ping + self.period, time.monotonic() + RECOVERY_TIME)
+
+    def wait_next(self, timeout=1.0):
+        """Block until the next sample lands; returns False on timeout."""
+        with self.fresh:
+            return self.fresh.wait(timeout)
+
+    def wait_ready(self, timeout=1.0):
+        """Block until at least one valid reading is buffered."""
+        deadline = time.monotonic() + timeout
+        while self.buffer.latest() is None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not self.wait_next(remaining):
+                return False
+        return True
+
+    def latest(self, max_age=None):
+        """Latest distance in cm, or None if there is none (or it is older than max_age s)."""
+        sample = self.buffer.latest()
+        if sample is None:
+            return None
+        t, distance = sample
+        if max_age is not None and time.monotonic() - t > max_age:
+            return None
+        return distance
+
+    def recent(self, n, max_age=None):
+        """Valid distances among the last `n` samples, leaving out any older than max_age s."""
+        t, d = self.buffer.samples(n)
+        keep = ~np.isnan(d)
+        if max_age is not None:
+            keep &= t >= time.monotonic() - max_age
+        return d[keep]
+
+    def median(self, n=5, max_age=None):
+        d = self.recent(n, max_age)
+        return float(np.median(d)) if len(d) else None
+
+    def filtered(self, n=9, k=3.0, max_age=None):
+        """Mean of the last `n` readings after dropping outliers more than
+        `k` scaled MADs from their median; None if none is newer than max_age s."""
+        d = self.recent(n, max_age)
+        if not len(d):
+            return None
+        med = np.median(d)
+        mad = 1.4826 * np.median(np.abs(d - med))
+        if mad > 0:
+            d = d[np.abs(d - med) <= k * mad]
+        return round(float(np.mean(d)), 2)
+
+    def stop(self):
+        self.running = False
+
+    def close(self):
+        """Stop sampling and release the ranger."""
+        self.stop()
+        if self.is_alive() and self is not threading.current_thread():
+            self.join(timeout=1.0)
+        if hasattr(self.ranger, "close"):
+            self.ranger.close()
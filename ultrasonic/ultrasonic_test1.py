@@ -1,56 +1,43 @@
-import lgpio as GPIO
 import time
 
+from hardware import gpio_registry
+from ultrasonic.ranging import AlertRanger
+from ultrasonic.sampler import UltrasonicSampler
+
 # set pins
 TRIG = 20
 ECHO = 21
+MAX_AGE = 0.5  # s; older readings count as no reading
+
+def _setup(h):
+	# ping continuously in the background at 20 Hz
+	sampler = UltrasonicSampler(AlertRanger(h, TRIG, ECHO), rate=20)
+	sampler.start()
+	return sampler
 
-# open the gpio chip and set the gpio direction
-h = GPIO.gpiochip_open(0)
-GPIO.gpio_claim_output(h, TRIG)
-GPIO.gpio_claim_input(h, ECHO)
+# reserve the pins; the shared gpio chip is opened, TRIG claimed, ECHO
+# set up for edge alerts and the sampler started on the first reading
+sensor = gpio_registry.declare("ultrasonic", outputs=[TRIG], reserved=[ECHO], setup=_setup)
 
 def get_distance():
-	# set trig low
-	GPIO.gpio_write(h, TRIG, 0)
-	time.sleep(2)
-	
-	
-	# send 10us pulse to trig
-	GPIO.gpio_write(h, TRIG, 1)
-	time.sleep(0.00001)
-	GPIO.gpio_write(h, TRIG, 0)
-	print("trig sent")
-	
-	
-	# start recording the time when the wave is sent
-	while GPIO.gpio_read(h, ECHO) == 0:
-		pulse_start = time.time()
-		
-		
-	# record time of arrival
-	while GPIO.gpio_read(h, ECHO) == 1:
-		pulse_end = time.time()
-	
-
-	# calculate the difference in times
-	pulse_duration = pulse_end - pulse_start
-	
-	# multiply with the sonic speed (34300 cm/s)
-	# and divide by 2 to avoid counting both distances there and back
-	distance = pulse_duration * 17150
-	distance = round(distance, 2)
-	
-	return distance
+	sampler = sensor.device
+
+	# only the first call waits for a ping; after that this is a buffer read
+	# of the latest echo, None if it is missing or stale
+	sampler.wait_ready()
+	return sampler.latest(max_age=MAX_AGE)
 
 if __name__ == '__main__':
 	#try:
 	while True:
 		dist = get_distance()
-		print("Measured distance = {:.2f} cm".format(dist))
+		if dist is None:
+			print("No echo")
+		else:
+			print("Measured distance = {:.2f} cm".format(dist))
 		time.sleep(1)
 	# reset by pressing ctrl c
 	#except KeyboardInterrupt:
 		#("Measurement stopped by user")
-		#GPIO.gpiochip_close(h)
+		#gpio_registry.close()
 
@@ -0,0 +1,49 @@
+import time
+
+from hardware import gpio_registry
+from ultrasonic.multi_sampler import MultiSampler
+from ultrasonic.ranging import AlertRanger
+
+# set pins: name -> (TRIG, ECHO)
+# front is the sensor in ultrasonic/, arm is the one on the xarm
+SENSORS = {
+	"front": (20, 21),
+	"arm": (23, 24),
+}
+MAX_AGE = 0.5  # s; older readings count as no reading
+
+def _setup(h):
+	# one scheduler owns every sensor so only one ping is in the air at a time
+	rangers = {name: AlertRanger(h, trig, echo) for name, (trig, echo) in SENSORS.items()}
+	sampler = MultiSampler(rangers)
+	sampler.start()
+	return sampler
+
+sensors = gpio_registry.declare(
+	"ultrasonic_array",
+	outputs=[trig for trig, _ in SENSORS.values()],
+	reserved=[echo for _, echo in SENSORS.values()],
+	setup=_setup,
+)
+
+def get_distances():
+	# latest reading of every sensor in cm, None for a missed echo or a stale reading
+	sampler = sensors.device
+	return {name: sampler.latest(name, max_age=MAX_AGE) for name in SENSORS}
+
+if __name__ == '__main__':
+	try:
+		while True:
+			time.sleep(1)
+			for name, dist in get_distances().items():
+				if dist is None:
+					print(f"{name}: no echo")
+				else:
+					print(f"{name}: {dist:.2f} cm")
+			rates = sensors.device.rates()
+			print("rates: " + "  ".join(f"{name} {hz:.1f} Hz" for name, hz in rates.items()))
+	# reset by pressing ctrl c
+	except KeyboardInterrupt:
+		print("Measurement stopped by user")
+		sensors.device.stop()
+		gpio_registry.close()
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+bringup.py
+Visual Vectoring v2.3 — Headless Bring-Up Suite
+
+PURPOSE: Runs the Phase 1 and Phase 2 checks without prompts, judging each
+         against thresholds instead of a y/n answer: PING, STATUS at rest,
+         every wheel forward / reverse / faster with TEST_WHEEL, every
+         MOTION_TESTS pattern through a velocity profile, emergency stop,
+         watchdog and the odometry sanity check. Exits non-zero if any
+         check fails, so it can run unattended.
+
+         The motion checks compare the commanded motion with the Teensy's
+         ODOM reports. Those come from the step counts, so they prove the
+         firmware and kinematics; a wheel that slips or doesn't turn at all
+         still needs the interactive tests (or eyes) to catch.
+
+         --emulate runs the same suite against the pty Teensy stand-in
+         (teensy_emulator.py) in accelerated time.
+
+USAGE:
+    python3 -m wheels.bringup                          # real Teensy on PORT
+    python3 -m wheels.bringup --emulate [--scale 20]   # no hardware, a few seconds
+"""
+
+import argparse
+import math
+import sys
+import time
+
+import numpy as np
+
+from hardware.periodic import Periodic
+from wheels.mecanum import Mecanum, WHEELS
+from wheels.teensy_emulator import TeensyEmulator, SimClock
+from wheels.test_phase2_all_wheels import TeensyLink, PORT, BAUD, KEEPALIVE_HZ, MOTION_TESTS, \
+    TEST_DURATION
+from wheels.velocity_profile import VelocityProfile
+
+# ── Configuration ─────────────────────────────────────────────
+SCALE = 20                       # emulator time per real second
+WHEEL_TIME = 3.0                 # s per TEST_WHEEL run, as in Phase 1
+WHEEL_RUNS = ((1, 400), (0, 400), (1, 800))   # (dir, steps/s): forward, reverse, faster
+SPEED_TOL = 0.3                  # reported/commanded body velocity within 1 ± this
+POS_TOL = 0.03                   # m, plus REL_TOL of the segment's travel
+YAW_TOL = 0.10                   # rad, plus REL_TOL of the segment's turn
+REL_TOL = 0.20
+WATCHDOG_MAX = 1.0               # s from the last command to FAULT
+ESTOP_DRIFT = 0.01               # m travelled after CMD_STOP has landed
+ODOM_LAG = 0.15                  # s for a report to reflect a command
+MISMATCH_TOL = 0.05              # m, pose vs integrated velocity in the odometry check
+
+
+# ── Phase 1 ───────────────────────────────────────────────────
+def check_ping(link):
+    t0 = link.clock.monotonic()
+    link.send("PING")
+    got = link.wait_for("PONG", t0)
+    if got is None:
+        return False, "no PONG"
+    return True, f"PONG after {(got[0] - t0) * 1000:.0f} ms"
+
+
+def check_status(link):
+    t0 = link.clock.monotonic()
+    link.send("STATUS")
+    if link.wait_for("EN pin", t0) is None:
+        return False, "no STATUS reply"
+    lines = [line for t, line in link.lines if t >= t0]
+    ok = any("Motors: DISABLED" in l for l in lines) and any("EN pin: HIGH" in l for l in lines)
+    return ok, " / ".join(lines)
+
+
+def check_wheel(link, index):
+    """Each TEST_WHEEL run must move the base the way that wheel alone should."""
+    kin = Mecanum()
+    ratios = []
+    for direction, speed in WHEEL_RUNS:
+        wheels = np.zeros(4)
+        wheels[index] = kin.from_steps(speed, direction)
+        expected = kin.forward(wheels) * (1, 1, kin.k)
+
+        t0 = link.clock.monotonic()
+        # resent at the keep-alive rate, so the watchdog doesn't cut the run short
+        for _ in Periodic(KEEPALIVE_HZ, clock=link.clock.monotonic, sleep=link.clock.sleep).ticks(WHEEL_TIME):
+            link.send(f"TEST_WHEEL {index} {direction} {speed}")
+        link.send("TEST_STOP")
+        link.clock.sleep(0.3)
+
+        w = link.odom.window(t0 + ODOM_LAG, t0 + WHEEL_TIME)
+        if not len(w):
+            return None, "no ODOM during TEST_WHEEL; check by eye (Phase 1)"
+        reported = np.array([w["vx"].mean(), w["vy"].mean(), w["omega"].mean()]) * (1, 1, kin.k)
+        ratios.append(reported @ expected / (expected @ expected))
+    ok = all(abs(r - 1.0) <= SPEED_TOL for r in ratios)
+    return ok, "reported/commanded " + "  ".join(
+        f"{name} {r:.2f}" for name, r in zip(("fwd", "rev", "fast"), ratios))
+
+
+def check_watchdog_wheel(link):
+    link.send("TEST_WHEEL 0 1 400")
+    return watchdog_fault(link, link.clock.monotonic())
+
+
+# ── Phase 2 ───────────────────────────────────────────────────
+def check_motion(link, test):
+    """Every segment of the profiled motion within tolerance of ODOM."""
+    link.fault = False
+    profile = VelocityProfile([(test["vx"], test["vy"], test["omega"], TEST_DURATION)])
+    log = profile.run(link)
+    if link.fault:
+        return False, "FAULT during the motion"
+    worst = 0.0
+    for entry in log:
+        if entry["reported"] is None:
+            return False, "no odometry"
+        ex = entry["expected"]
+        pos_limit = POS_TOL + REL_TOL * math.hypot(ex[0], ex[1])
+        yaw_limit = YAW_TOL + REL_TOL * abs(ex[2])
+        worst = max(worst, entry["error"] / pos_limit, abs(entry["yaw_error"]) / yaw_limit)
+    return worst <= 1.0, f"worst segment at {worst * 100:.0f}% of tolerance"
+
+
+def check_estop(link):
+    link.fault = False
+    link.send_vel(0.10, 0.0, 0.0, 1.5)
+    t_stop = link.clock.monotonic()
+    link.stop()
+    link.clock.sleep(0.5)
+    landed = link.odom.pose_at(t_stop + ODOM_LAG)
+    now = link.odom.pose_at(link.clock.monotonic())
+    if landed is None:
+        return False, "no odometry"
+    drift = math.hypot(now[0] - landed[0], now[1] - landed[1])
+    return drift <= ESTOP_DRIFT, f"{drift * 1000:.1f} mm after CMD_STOP"
+
+
+def check_watchdog(link):
+    for _ in Periodic(10, clock=link.clock.monotonic, sleep=link.clock.sleep).ticks(0.5):
+        link.send("CMD_VEL 0.10 0.0 0.0")
+    return watchdog_fault(link, link.clock.monotonic())
+
+
+def watchdog_fault(link, t_last):
+    got = link.wait_for("FAULT", t_last, timeout=WATCHDOG_MAX + 1.0)
+    if got is None:
+        return False, "no FAULT after going silent"
+    delay = got[0] - t_last
+    return delay <= WATCHDOG_MAX, f"{got[1]} {delay * 1000:.0f} ms after the last command"
+
+
+def check_odometry(link):
+    t0 = link.clock.monotonic()
+    VelocityProfile([(0.10, 0.0, 0.0, 3.0)]).run(link)
+    moved = link.odom.integrate(t0, link.clock.monotonic())
+    if moved is None:
+        return False, "no odometry"
+    dx = moved["reported"][0]
+    ok = 0.15 < abs(dx) < 0.50 and moved["error"] <= MISMATCH_TOL
+    return ok, f"dx {dx:.3f} m (expected 0.30), pose vs velocity mismatch {moved['error'] * 1000:.0f} mm"
+
+
+def checks():
+    """(name, check) in bring-up order; each check returns (passed, detail)."""
+    suite = [("Connectivity", check_ping), ("Enable pin", check_status)]
+    suite += [(f"Wheel {i} {name}", lambda link, i=i: check_wheel(link, i)) for i, name in enumerate(WHEELS)]
+    suite += [("Watchdog (TEST_WHEEL)", check_watchdog_wheel)]
+    suite += [(test["name"], lambda link, test=test: check_motion(link, test)) for test in MOTION_TESTS]
+    suite += [("Emergency Stop", check_estop), ("Watchdog", check_watchdog), ("Odometry", check_odometry)]
+    return suite
+
+
+def run(link):
+    results = {}
+    for name, check in checks():
+        print(f"\n── {name}")
+        passed, detail = check(link)
+        passed = None if passed is None else bool(passed)
+        results[name] = passed
+        mark = "✅" if passed else ("⏭ " if passed is None else "❌")
+        print(f"  {mark} {detail}")
+        if name == "Connectivity" and not passed:
+            print("\n⛔ Cannot proceed without serial connectivity.")
+            break
+    return results
+
+
+# ── Main ──────────────────────────────────────────────────────
+def main():
+    parser = argparse.ArgumentParser(description="Unattended Phase 1 + 2 bring-up.")
+    parser.add_argument("--port", default=PORT)
+    parser.add_argument("--emulate", action="store_true", help="run against the pty emulator")
+    parser.add_argument("--scale", type=float, default=SCALE,
+                        help="emulator speed-up over real time (default %(default)s)")
+    args = parser.parse_args()
+
+    emu = None
+    clock = time
+    port = args.port
+    if args.emulate:
+        clock = SimClock(args.scale)
+        emu = TeensyEmulator(clock=clock)
+        emu.start()
+        port = emu.port
+    t_start = time.monotonic()
+    print(f"Opening {port} at {BAUD} baud...")
+    link = TeensyLink(port, BAUD, clock=clock)
+    try:
+        link.send("CMD_MODE SAFE")
+        clock.sleep(0.2)
+        results = run(link)
+    finally:
+        link.close()
+        if emu:
+            emu.stop()
+
+    print("\n" + "="*50)
+    print("BRING-UP SUMMARY")
+    print("="*50)
+    for key, val in results.items():
+        status = "✅ PASS" if val is True else ("❌ FAIL" if val is False else "⏭  SKIP")
+        print(f"  {key:25s} {status}")
+    print("="*50)
+    failed = [key for key, val in results.items() if val is False]
+    skipped = [key for key, val in results.items() if val is None]
+    print(f"\n  {len(results) - len(failed) - len(skipped)}/{len(results)} checks passed, "
+          f"{len(skipped)} skipped, {time.monotonic() - t_start:.1f} s wall time")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
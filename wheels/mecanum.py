@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+mecanum.py
+Mecanum kinematics for the base, on whole NumPy arrays at once.
+
+PURPOSE: The same wheel <-> body velocity mapping the firmware uses, on
+         the Pi: predict wheel speeds for a command or a whole profile,
+         turn wheel speeds (or TEST_WHEEL step rates) back into a body
+         velocity, and check ODOM against what was commanded.
+
+         Frames as everywhere else: x forward, y left, omega CCW; wheels
+         in WHEELS order, positive = rolling the robot forward. Inputs are
+         (..., 3) body velocities or (..., 4) wheel speeds (rad/s), so one
+         call covers one command or a million.
+
+USAGE:
+    kin = Mecanum()                           # defaults: the firmware's geometry
+    w = kin.inverse([0.10, 0.0, 0.3])         # -> 4 wheel speeds, rad/s
+    v = kin.forward(w)                        # -> vx, vy, omega
+    kin.inverse(setpoints)                    # (N, 3) -> (N, 4)
+"""
+
+import collections
+
+import numpy as np
+
+# ── Configuration ─────────────────────────────────────────────
+# Stand-ins for the firmware's WHEEL_RADIUS / geometry / MICROSTEPS;
+# set them to the values in the Teensy sketch
+WHEEL_RADIUS = 0.040            # m
+TRACK = 0.240                   # m, left to right wheel centres
+WHEELBASE = 0.200               # m, front to rear axle
+STEPS_PER_REV = 200 * 8         # full steps x microsteps
+WHEELS = ("FL", "FR", "RL", "RR")
+
+SLIP_TOL = 0.03                 # m/s of wheel surface speed, plus SLIP_REL of the command
+SLIP_REL = 0.20
+SLIP_LAG = 0.25                 # s a command may take to show up in ODOM
+SLIP_REPORTS = 3                # consecutive ODOM reports over tolerance to flag a mismatch
+
+
+class Mecanum:
+    """Forward/inverse kinematics for one set of wheel geometry."""
+
+    def __init__(self, radius=WHEEL_RADIUS, track=TRACK, wheelbase=WHEELBASE,
+                 steps_per_rev=STEPS_PER_REV):
+        self.radius = radius
+        self.track = track
+        self.wheelbase = wheelbase
+        self.steps_per_rev = steps_per_rev
+        k = (track + wheelbase) / 2
+        self.k = k
+        # wheel speeds = (body velocity) @ INV.T / radius
+        self.inv = np.array([[1.0, -1.0, -k],
+                             [1.0, 1.0, k],
+                             [1.0, 1.0, -k],
+                             [1.0, -1.0, k]]) / radius
+        self.fwd = np.linalg.pinv(self.inv)
+
+    def inverse(self, v):
+        """(..., 3) body velocities -> (..., 4) wheel speeds (rad/s)."""
+        return np.asarray(v, dtype=float) @ self.inv.T
+
+    def forward(self, w):
+        """(..., 4) wheel speeds (rad/s) -> (..., 3) body velocities; a
+        least-squares fit when the four wheels disagree."""
+        return np.asarray(w, dtype=float) @ self.fwd.T
+
+    def steps(self, w):
+        """Wheel speeds (rad/s) -> step rates (steps/s)."""
+        return np.asarray(w, dtype=float) * (self.steps_per_rev / (2 * np.pi))
+
+    def from_steps(self, steps_per_s, direction=1):
+        """TEST_WHEEL speed (steps/s) and dir (1 forward, 0 reverse) -> rad/s."""
+        sign = np.where(np.asarray(direction) > 0, 1.0, -1.0)
+        return sign * np.asarray(steps_per_s, dtype=float) * (2 * np.pi / self.steps_per_rev)
+
+    def residual(self, commanded, reported):
+        """Per-wheel surface-speed mismatch (m/s) between commanded and
+        reported body velocities; the part the forward fit can't explain
+        (wheels fighting each other) shows up too."""
+        return (self.inverse(reported) - self.inverse(commanded)) * self.radius
+
+
+class SlipDetector:
+    """Flags an ODOM/command mismatch: ODOM that no recent command explains.
+
+    The Teensy's ODOM comes from its own step counts, so this can't see a
+    wheel slipping on the floor; it catches the firmware not doing what
+    was asked (speed or acceleration limits, different wheel geometry,
+    dropped or misparsed commands).
+
+    command() records each velocity sent (None while the wheels are driven
+    some other way, e.g. TEST_WHEEL). check() takes each ODOM velocity; a
+    wheel is out of tolerance when its reported speed lies outside the
+    range of the speeds commanded over the last SLIP_LAG (so ramps and
+    serial latency don't count), and check() returns True while
+    SLIP_REPORTS reports in a row have such a wheel.
+    """
+
+    def __init__(self, kinematics=None, tol=SLIP_TOL, rel=SLIP_REL, lag=SLIP_LAG,
+                 reports=SLIP_REPORTS):
+        self.kin = kinematics or Mecanum()
+        self.tol = tol
+        self.rel = rel
+        self.lag = lag
+        self.reports = reports
+        self.history = collections.deque(maxlen=256)  # (t, velocity or None)
+        self.over = 0            # consecutive reports out of tolerance
+        self.slipping = False
+        self.episodes = 0
+        self.worst = None        # per-wheel residual (m/s) of the latest out-of-tolerance report
+
+    def command(self, t, velocity):
+        self.history.append((t, None if velocity is None else np.asarray(velocity, dtype=float)))
+
+    def commanded(self, t0, t1):
+        """Velocities in force at some point between t0 and t1, or None if
+        the wheels weren't under CMD_VEL control for all of it."""
+        active, found = None, []
+        for t_cmd, v in self.history:
+            if t_cmd <= t0:
+                active = v
+            elif t_cmd <= t1:
+                found.append(v)
+        found.insert(0, active)
+        if any(v is None for v in found):
+            return None
+        return np.array(found)
+
+    def check(self, t, reported):
+        commanded = self.commanded(t - self.lag, t)
+        if commanded is None:
+            self.over = 0
+            self.slipping = False
+            return False
+        surface = self.kin.inverse(commanded) * self.kin.radius
+        lo, hi = surface.min(axis=0), surface.max(axis=0)
+        actual = self.kin.inverse(reported) * self.kin.radius
+        # distance outside the commanded range, per wheel
+        residual = np.maximum(actual - hi, 0.0) + np.minimum(actual - lo, 0.0)
+        limit = self.tol + self.rel * np.maximum(np.abs(lo), np.abs(hi))
+        if np.any(np.abs(residual) > limit):
+            self.over += 1
+            self.worst = residual
+        else:
+            self.over = 0
+        slipping = self.over >= self.reports
+        if slipping and not self.slipping:
+            self.episodes += 1
+        self.slipping = slipping
+        return slipping
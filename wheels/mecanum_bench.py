@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+mecanum_bench.py
+Mecanum kinematics: per-command Python vs one NumPy call on a batch.
+
+Converts N random (vx, vy, omega) commands to wheel speeds and back, once
+with a Python loop over the scalar formulas and once with Mecanum on the
+whole (N, 3) array, and checks they agree. Then runs a forward profile
+against the pty Teensy stand-in with the emulated firmware running the
+left wheels at 40% of their command (as a firmware with different wheel
+geometry would) and reports when TeensyLink's ODOM/command mismatch
+check flags it. ODOM comes from step counts, so real floor slip is not
+something this check can see.
+
+USAGE:
+    python3 -m wheels.mecanum_bench [n_commands]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from wheels.mecanum import Mecanum
+from wheels.teensy_emulator import TeensyEmulator, SimClock
+from wheels.test_phase2_all_wheels import TeensyLink, BAUD
+from wheels.velocity_profile import VelocityProfile
+
+N_COMMANDS = 10 ** 6
+SCALE = 10
+ODOM_GAIN = [0.4, 1.0, 0.4, 1.0]  # FL, FR, RL, RR
+
+
+def python_loop(commands, kin):
+    r, k = kin.radius, kin.k
+    wheels, back = [], []
+    for vx, vy, omega in commands:
+        w = ((vx - vy - k * omega) / r, (vx + vy + k * omega) / r,
+             (vx + vy - k * omega) / r, (vx - vy + k * omega) / r)
+        fl, fr, rl, rr = w
+        wheels.append(w)
+        back.append((r / 4 * (fl + fr + rl + rr), r / 4 * (-fl + fr + rl - rr),
+                     r / 4 * (-fl + fr - rl + rr) / k))
+    return np.array(wheels), np.array(back)
+
+
+def numpy_batch(commands, kin):
+    wheels = kin.inverse(commands)
+    return wheels, kin.forward(wheels)
+
+
+def mismatch_run():
+    clock = SimClock(SCALE)
+    emu = TeensyEmulator(clock=clock)
+    emu.start()
+    link = TeensyLink(emu.port, BAUD, clock=clock)
+    try:
+        VelocityProfile([(0.10, 0.0, 0.0, 1.0)]).run(link, verbose=False)
+        clean = link.slip.episodes
+        emu.odom_gain = ODOM_GAIN
+        VelocityProfile([(0.10, 0.0, 0.0, 2.0)]).run(link, verbose=False)
+        return clean, link.slip.episodes - clean, link.slip.worst
+    finally:
+        link.close()
+        emu.stop()
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else N_COMMANDS
+    kin = Mecanum()
+    rng = np.random.default_rng(0)
+    commands = rng.uniform(-1, 1, size=(n, 3)) * (0.3, 0.3, 1.0)
+
+    t0 = time.perf_counter()
+    loop_wheels, loop_back = python_loop(commands, kin)
+    t_loop = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    np_wheels, np_back = numpy_batch(commands, kin)
+    t_np = time.perf_counter() - t0
+
+    print(f"{n} commands -> wheel speeds -> body velocity")
+    print(f"  Python loop : {t_loop * 1000:8.1f} ms ({t_loop / n * 1e9:6.0f} ns/command)")
+    print(f"  NumPy batch : {t_np * 1000:8.1f} ms ({t_np / n * 1e9:6.0f} ns/command), {t_loop / t_np:.0f}x")
+    print(f"  max difference: wheels {np.abs(loop_wheels - np_wheels).max():.2e} rad/s, "
+          f"round trip {np.abs(np_back - commands).max():.2e}")
+
+    clean, mismatched, worst = mismatch_run()
+    print(f"ODOM/command mismatch check against the emulator ({SCALE}x time):")
+    print(f"  firmware as commanded    : {clean} mismatch episodes")
+    print(f"  wheel gain {ODOM_GAIN}: {mismatched} mismatch episodes, last flagged error "
+          + "  ".join(f"{r:+.3f}" for r in worst) + " m/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+odom_buffer.py
+Timestamped ring buffer of parsed Teensy ODOM reports.
+
+PURPOSE: Each `ODOM x y yaw vx vy omega` line is parsed once, stamped
+         with the host receive time (time.monotonic()) and stored in a
+         preallocated NumPy structured array. The latest report is an
+         O(1) read, time windows are binary searches, and the default
+         size keeps about 20 minutes of history at 50 Hz.
+
+         x, y, yaw are the firmware's integrated pose; vx, vy, omega
+         its body-frame velocity estimate.
+"""
+
+import threading
+
+import numpy as np
+
+# ── Configuration ─────────────────────────────────────────────
+SIZE = 1 << 16
+
+ODOM_DTYPE = np.dtype([("t", "<f8"), ("x", "<f8"), ("y", "<f8"), ("yaw", "<f8"),
+                       ("vx", "<f8"), ("vy", "<f8"), ("omega", "<f8")])
+FIELDS = ODOM_DTYPE.names[1:]
+
+
+class OdomBuffer:
+    """Fixed-size ring of ODOM reports, oldest overwritten first."""
+
+    def __init__(self, size=SIZE):
+        self.size = size
+        self.data = np.zeros(size, dtype=ODOM_DTYPE)
+        self.count = 0          # reports ever appended
+        self.last = None        # newest report as a plain tuple, for cheap polling
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return min(self.count, self.size)
+
+    def append(self, t, x, y, yaw, vx, vy, omega):
+        record = (t, x, y, yaw, vx, vy, omega)
+        with self.lock:
+            self.data[self.count % self.size] = record
+            self.count += 1
+            self.last = record
+
+    def append_line(self, line, t):
+        """Parse an ODOM line received at `t`; False if it isn't one."""
+        parts = line.split()
+        if len(parts) < 7 or parts[0] != "ODOM":
+            return False
+        try:
+            values = [float(v) for v in parts[1:7]]
+        except ValueError:
+            return False
+        self.append(t, *values)
+        return True
+
+    def latest(self):
+        """Newest report as a structured record (a copy), or None."""
+        with self.lock:
+            if not self.count:
+                return None
+            return self.data[(self.count - 1) % self.size].copy()
+
+    def get_last_odom(self):
+        """Newest report as the dict TeensyLink.get_last_odom() always returned."""
+        last = self.last
+        if last is None:
+            return None
+        return dict(zip(FIELDS, last[1:]))
+
+    def _segments(self):
+        # the stored reports in time order, as one or two views
+        if self.count <= self.size:
+            return [self.data[:self.count]]
+        i = self.count % self.size
+        return [self.data[i:], self.data[:i]]
+
+    def window(self, t0=None, t1=None):
+        """Reports with t0 <= t <= t1 (either bound open if None), oldest first."""
+        parts = []
+        with self.lock:
+            for seg in self._segments():
+                lo = 0 if t0 is None else np.searchsorted(seg["t"], t0, side="left")
+                hi = len(seg) if t1 is None else np.searchsorted(seg["t"], t1, side="right")
+                if hi > lo:
+                    parts.append(seg[lo:hi].copy())
+        return np.concatenate(parts) if parts else np.zeros(0, dtype=ODOM_DTYPE)
+
+    def pose_at(self, t):
+        """(x, y, yaw) interpolated at time `t` between the two reports
+        around it (clamped to the oldest/newest), or None if empty."""
+        with self.lock:
+            n = len(self)
+            if not n:
+                return None
+            first = self.count - n
+            # reports received before t, over the one or two time-ordered segments
+            i = sum(int(np.searchsorted(seg["t"], t)) for seg in self._segments())
+            lo, hi = max(i - 1, 0), min(i, n - 1)
+            around = self.data[[(first + lo) % self.size, (first + hi) % self.size]]
+        if around["t"][1] <= around["t"][0]:
+            rec = around[1] if t >= around["t"][1] else around[0]
+            return float(rec["x"]), float(rec["y"]), float(rec["yaw"])
+        yaw = np.unwrap(around["yaw"])
+        return (float(np.interp(t, around["t"], around["x"])),
+                float(np.interp(t, around["t"], around["y"])),
+                float(np.interp(t, around["t"], yaw)))
+
+    def integrate(self, t0, t1):
+        """Check the reported pose change between t0 and t1 against the
+        reported velocities integrated over the same reports.
+
+        Returns {"reported": (dx, dy, dyaw), "integrated": (dx, dy, dyaw),
+        "error": distance between the two (m)}, or None with < 2 reports.
+        Displacements are in the frame of the first report (dx = forward).
+        """
+        w = self.window(t0, t1)
+        if len(w) < 2:
+            return None
+        yaw = np.unwrap(w["yaw"])
+        # body-frame velocities into the first report's frame, trapezoid rule
+        c, s = np.cos(yaw - yaw[0]), np.sin(yaw - yaw[0])
+        wx = c * w["vx"] - s * w["vy"]
+        wy = s * w["vx"] + c * w["vy"]
+        dt = np.diff(w["t"])
+        integrated = (float(np.sum((wx[1:] + wx[:-1]) / 2 * dt)),
+                      float(np.sum((wy[1:] + wy[:-1]) / 2 * dt)),
+                      float(np.sum((w["omega"][1:] + w["omega"][:-1]) / 2 * dt)))
+        dx, dy = w["x"][-1] - w["x"][0], w["y"][-1] - w["y"][0]
+        c0, s0 = np.cos(yaw[0]), np.sin(yaw[0])
+        reported = (float(c0 * dx + s0 * dy), float(-s0 * dx + c0 * dy), float(yaw[-1] - yaw[0]))
+        error = float(np.hypot(reported[0] - integrated[0], reported[1] - integrated[1]))
+        return {"reported": reported, "integrated": integrated, "error": error}
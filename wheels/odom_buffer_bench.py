@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+odom_buffer_bench.py
+ODOM handling: raw line list (old TeensyLink) vs OdomBuffer.
+
+Feeds N synthetic ODOM lines (a constant-velocity arc at ODOM_HZ) through
+both, reading the last pose after every line the way a control loop
+would, then times window queries and the velocity integration check on
+the full buffer. The old list only ever holds the last 20 lines.
+
+USAGE:
+    python3 -m wheels.odom_buffer_bench [n_lines]
+"""
+
+import math
+import sys
+import time
+
+from wheels.odom_buffer import OdomBuffer
+
+N_LINES = 50000
+ODOM_HZ = 50
+VX, OMEGA = 0.10, 0.05
+REPEAT = 1000
+
+
+def odom_lines(n):
+    lines = []
+    for i in range(n):
+        t = i / ODOM_HZ
+        yaw = OMEGA * t
+        x = VX / OMEGA * math.sin(yaw)
+        y = VX / OMEGA * (1 - math.cos(yaw))
+        lines.append((t, f"ODOM {x:.4f} {y:.4f} {yaw:.4f} {VX:.4f} 0.0000 {OMEGA:.4f}"))
+    return lines
+
+
+def parse_last(odom_lines):
+    # TeensyLink.get_last_odom() before: re-parse the newest line on every read
+    parts = odom_lines[-1].split()
+    if len(parts) >= 7:
+        return {
+            "x": float(parts[1]), "y": float(parts[2]), "yaw": float(parts[3]),
+            "vx": float(parts[4]), "vy": float(parts[5]), "omega": float(parts[6]),
+        }
+    return None
+
+
+def old_list(lines):
+    # TeensyLink before: append, trim by slicing, re-parse on every read
+    odom_lines = []
+    last = None
+    for _, line in lines:
+        odom_lines.append(line)
+        if len(odom_lines) > 20:
+            odom_lines = odom_lines[-20:]
+        last = parse_last(odom_lines)
+    return last, odom_lines
+
+
+def new_buffer(lines):
+    odom = OdomBuffer()
+    last = None
+    for t, line in lines:
+        odom.append_line(line, t)
+        last = odom.get_last_odom()
+    return last, odom
+
+
+def timed(fn, *args, repeat=1):
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        result = fn(*args)
+    return result, (time.perf_counter() - t0) / repeat
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else N_LINES
+    lines = odom_lines(n)
+    (old_last, kept), t_old = timed(old_list, lines)
+    _, t_old_read = timed(parse_last, kept, repeat=REPEAT)
+    (new_last, odom), t_new = timed(new_buffer, lines)
+    assert old_last == new_last
+
+    duration = lines[-1][0]
+    mid = duration / 2
+    w, t_window = timed(odom.window, mid, mid + 10.0, repeat=REPEAT)
+    _, t_new_read = timed(odom.get_last_odom, repeat=REPEAT)
+    pose, t_pose = timed(odom.pose_at, mid + 0.013, repeat=REPEAT)
+    check, t_check = timed(odom.integrate, 0.0, duration)
+
+    print(f"{n} ODOM lines ({duration / 60:.1f} min at {ODOM_HZ} Hz), last pose read after each")
+    print(f"  line list  : {t_old / n * 1e6:6.2f} us/line, {t_old_read * 1e6:5.2f} us/read, keeps {len(kept)} lines")
+    print(f"  OdomBuffer : {t_new / n * 1e6:6.2f} us/line, {t_new_read * 1e6:5.2f} us/read, keeps {len(odom)} reports")
+    print(f"  window(10 s)      : {len(w)} reports in {t_window * 1e6:7.1f} us")
+    print(f"  pose_at           : {t_pose * 1e6:7.1f} us -> {pose[0]:.4f} {pose[1]:.4f} {pose[2]:.4f}")
+    print(f"  integrate(whole)  : {t_check * 1e3:7.2f} ms, pose vs velocity mismatch {check['error'] * 1000:.2f} mm")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+teensy_emulator.py
+Stand-in for the Teensy base firmware on a pseudo-terminal.
+
+PURPOSE: Lets the serial code (TeensyLink, the async link, benchmarks,
+         the headless bring-up suite) run without the robot. Answers PING,
+         STATUS, CMD_VEL, CMD_STOP, CMD_MODE, TEST_WHEEL and TEST_STOP,
+         drives four mecanum wheels from them, streams ODOM by integrating
+         the body velocity the wheels produce, and trips the 500 ms
+         watchdog like the firmware.
+
+         With a SimClock the firmware's time runs `scale` times faster
+         than real time; give the host side (TeensyLink) the same clock.
+
+USAGE:
+    python3 -m wheels.teensy_emulator        # prints the port to open
+
+    from wheels.teensy_emulator import TeensyEmulator
+    emu = TeensyEmulator(); emu.start()
+    link = TeensyLink(emu.port, 115200)
+"""
+
+import math
+import os
+import select
+import threading
+import time
+import tty
+
+from wheels.mecanum import Mecanum
+
+# ── Configuration ─────────────────────────────────────────────
+ODOM_HZ = 20
+WATCHDOG = 0.5   # seconds without a motion command before the motors are stopped
+
+
+class SimClock:
+    """time.monotonic()/time.sleep() running `scale` times faster than real time."""
+
+    def __init__(self, scale=1.0):
+        self.scale = scale
+        self.t0 = time.monotonic()
+
+    def monotonic(self):
+        return self.t0 + (time.monotonic() - self.t0) * self.scale
+
+    def sleep(self, seconds):
+        time.sleep(seconds / self.scale)
+
+
+class TeensyEmulator(threading.Thread):
+    """Firmware stand-in; open `port` like /dev/ttyACM0."""
+
+    def __init__(self, odom_hz=ODOM_HZ, watchdog=WATCHDOG, clock=time, kinematics=None):
+        super().__init__(daemon=True)
+        self.master, self.slave = os.openpty()
+        tty.setraw(self.slave)
+        # nobody reading the port must not stall the firmware; drop output instead
+        os.set_blocking(self.master, False)
+        self.port = os.ttyname(self.slave)
+        self.odom_period = 1.0 / odom_hz
+        self.watchdog = watchdog
+        self.clock = clock
+        self.scale = getattr(clock, "scale", 1.0)
+        self.kin = kinematics or Mecanum()
+
+        self.pose = [0.0, 0.0, 0.0]        # x, y, yaw
+        self.wheels = [0.0] * 4            # rad/s, mecanum.WHEELS order
+        self.odom_gain = [1.0] * 4         # share of each commanded wheel speed the firmware carries out
+        self.velocity = (0.0, 0.0, 0.0)    # body velocity the wheels produce
+        self.enabled = False
+        self.mode = "SAFE"
+        self.last_cmd = 0.0
+        self.received = []                 # (clock time, line) of every command
+        self.running = True
+        self._buffer = b""
+
+    # ── Serial side ──
+    def reply(self, line):
+        try:
+            os.write(self.master, f"{line}\n".encode())
+        except BlockingIOError:
+            pass
+
+    def run(self):
+        t = self.clock.monotonic()
+        next_odom = t + self.odom_period
+        while self.running:
+            timeout = max(0.0, next_odom - self.clock.monotonic()) / self.scale
+            readable, _, _ = select.select([self.master], [], [], timeout)
+            now = self.clock.monotonic()
+            if readable:
+                try:
+                    data = os.read(self.master, 4096)
+                except OSError:
+                    break
+                self._buffer += data
+                while b"\n" in self._buffer:
+                    line, self._buffer = self._buffer.split(b"\n", 1)
+                    line = line.decode("utf-8", errors="replace").strip()
+                    if line:
+                        self.received.append((now, line))
+                        self.handle(line, now)
+            self.step(now - t)
+            t = now
+            if self.enabled and now - self.last_cmd > self.watchdog:
+                self.set_wheels([0.0] * 4)
+                self.enabled = False
+                self.reply("FAULT WATCHDOG")
+                self.reply("Motors: DISABLED")
+            if now >= next_odom:
+                self.send_odom()
+                next_odom += self.odom_period
+                if next_odom < now:
+                    next_odom = now + self.odom_period
+
+    # ── Firmware behaviour ──
+    def handle(self, line, now):
+        parts = line.split()
+        cmd = parts[0]
+        if cmd == "PING":
+            self.reply("PONG")
+        elif cmd == "STATUS":
+            self.reply(f"Motors: {'ENABLED' if self.enabled else 'DISABLED'}")
+            self.reply(f"EN pin: {'LOW' if self.enabled else 'HIGH'}")
+            self.reply(f"Mode: {self.mode}")
+        elif cmd == "CMD_VEL" and len(parts) == 4:
+            self.set_wheels(self.kin.inverse([float(v) for v in parts[1:]]))
+            self.enabled = True
+            self.last_cmd = now
+        elif cmd == "TEST_WHEEL" and len(parts) == 4 and parts[1] in "0123":
+            wheels = [0.0] * 4
+            wheels[int(parts[1])] = self.kin.from_steps(float(parts[3]), int(parts[2]))
+            self.set_wheels(wheels)
+            self.enabled = True
+            self.last_cmd = now
+        elif cmd in ("CMD_STOP", "TEST_STOP"):
+            self.set_wheels([0.0] * 4)
+            self.enabled = False
+        elif cmd == "CMD_MODE" and len(parts) == 2:
+            self.mode = parts[1]
+        else:
+            self.reply(f"ERR {line}")
+
+    def set_wheels(self, wheels):
+        self.wheels = [float(w) for w in wheels]
+        moved = [w * k for w, k in zip(self.wheels, self.odom_gain)]
+        self.velocity = tuple(float(v) for v in self.kin.forward(moved))
+
+    def step(self, dt):
+        vx, vy, omega = self.velocity
+        x, y, yaw = self.pose
+        c, s = math.cos(yaw), math.sin(yaw)
+        self.pose = [x + (c * vx - s * vy) * dt, y + (s * vx + c * vy) * dt, yaw + omega * dt]
+
+    def send_odom(self):
+        x, y, yaw = self.pose
+        vx, vy, omega = self.velocity
+        self.reply(f"ODOM {x:.4f} {y:.4f} {yaw:.4f} {vx:.4f} {vy:.4f} {omega:.4f}")
+
+    def commands(self, name):
+        """Receive times of every `name` command so far."""
+        return [t for t, line in self.received if line.split()[0] == name]
+
+    def stop(self):
+        self.running = False
+        self.join()
+        os.close(self.master)
+        os.close(self.slave)
+
+
+if __name__ == "__main__":
+    emu = TeensyEmulator()
+    emu.start()
+    print(emu.port)
+    try:
+        while True:
+            time.sleep(1.0)
+    except KeyboardInterrupt:
+        emu.stop()
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+teensy_link.py
+Asyncio serial link to the Teensy base firmware.
+
+PURPOSE: One reader callback on the event loop owns the port, so replies
+         can't be stolen: PONG and STATUS replies resolve the futures of
+         the ping()/status() calls waiting for them (in order), FAULT
+         lines resolve wait_fault(), ODOM lines go into an OdomBuffer.
+         Writes go through one writer task. set_velocity() only replaces
+         the pending CMD_VEL, so a burst of updates goes out as the latest
+         one, and the keep-alive resends it on absolute deadlines only
+         when nothing else has refreshed the watchdog. Nothing here blocks
+         the event loop: port writes run on the default executor. If the
+         port fails, every pending request fails with SerialException.
+
+USAGE:
+    link = await AsyncTeensyLink.open("/dev/ttyACM0")
+    rtt = await link.ping()
+    link.set_velocity(0.10, 0.0, 0.0)
+    await asyncio.sleep(2.5)
+    await link.stop()
+    await link.close()
+"""
+
+import asyncio
+import collections
+import functools
+import time
+
+import serial
+
+from hardware.serial_broker import BrokerPort, open_serial
+from wheels.odom_buffer import OdomBuffer
+
+# ── Configuration ─────────────────────────────────────────────
+PORT = "/dev/ttyACM0"
+BAUD = 115200
+RESET_WAIT = 2.0     # Teensy resets on open
+KEEPALIVE_HZ = 5     # watchdog is 500 ms
+REPLY_TIMEOUT = 1.0
+STATUS_QUIET = 0.05  # STATUS reply is complete after this long without a line
+
+
+class AsyncTeensyLink:
+    """Serial link driven by the running event loop; create with open()."""
+
+    def __init__(self, ser, keepalive_hz=KEEPALIVE_HZ):
+        self.ser = ser
+        self.loop = asyncio.get_running_loop()
+        self.keepalive = 1.0 / keepalive_hz
+        self.odom = OdomBuffer()            # every ODOM report, host-timestamped
+        self.fault = False
+        self.faults = []                    # every FAULT line, in order
+        self.velocity = None                # (vx, vy, omega) being kept alive, None when stopped
+        self.on_line = None                 # optional callback for other lines
+        self.error = None                   # exception that took the port down
+
+        self._buffer = b""
+        self._queue = collections.deque()   # commands in order
+        self._pending_vel = None            # coalesced CMD_VEL, sent after the queue
+        self._last_vel = self.loop.time()
+        self._wake = asyncio.Event()
+        self._pings = collections.deque()   # futures waiting for PONG
+        self._status = collections.deque()  # (future, lines) waiting for STATUS output
+        self._status_timer = None
+        self._fault_waiters = []
+        self._closing = False
+
+        self._fd = self.ser.fileno()
+        self.loop.add_reader(self._fd, self._on_readable)
+        self._writer = asyncio.ensure_future(self._write_loop())
+        self._keeper = asyncio.ensure_future(self._keepalive_loop())
+
+    @classmethod
+    async def open(cls, port=PORT, baud=BAUD, reset_wait=RESET_WAIT, **kwargs):
+        # the broker handshake can take up to its reset wait; keep it off the loop
+        loop = asyncio.get_running_loop()
+        ser = await loop.run_in_executor(
+            None, functools.partial(open_serial, port, baud, timeout=0, reset_wait=0))
+        if not isinstance(ser, BrokerPort):
+            await asyncio.sleep(reset_wait)  # the broker's port has already reset
+        ser.reset_input_buffer()
+        return cls(ser, **kwargs)
+
+    # ── Reading ──
+    def _on_readable(self):
+        try:
+            data = self.ser.read(self.ser.in_waiting or 1)
+        except (serial.SerialException, OSError) as e:
+            self._lost(e)
+            return
+        self._buffer += data
+        while b"\n" in self._buffer:
+            raw, self._buffer = self._buffer.split(b"\n", 1)
+            line = raw.decode("utf-8", errors="replace").strip()
+            if line:
+                self._dispatch(line)
+
+    def _dispatch(self, line):
+        if line.startswith("ODOM"):
+            self.odom.append_line(line, time.monotonic())
+        elif "PONG" in line:
+            while self._pings:
+                future = self._pings.popleft()
+                if not future.done():
+                    future.set_result(self.loop.time())
+                    break
+        elif "FAULT" in line:
+            self.fault = True
+            self.faults.append(line)
+            for future in self._fault_waiters:
+                if not future.done():
+                    future.set_result(line)
+            self._fault_waiters = []
+            print(f"  ⚠ [Teensy] {line}")
+        elif self._status:
+            # everything else while a STATUS is outstanding belongs to it
+            self._status[0][1].append(line)
+            self._restart_status_timer()
+        elif self.on_line:
+            self.on_line(line)
+        else:
+            print(f"  [Teensy] {line}")
+
+    def _restart_status_timer(self):
+        if self._status_timer:
+            self._status_timer.cancel()
+        self._status_timer = self.loop.call_later(STATUS_QUIET, self._finish_status)
+
+    def _finish_status(self):
+        self._status_timer = None
+        if self._status:
+            future, lines = self._status.popleft()
+            if not future.done():
+                future.set_result(lines)
+
+    def _lost(self, error):
+        """The port failed: stop using it and fail everything waiting on it."""
+        if self.error is not None:
+            return
+        self.error = error
+        self.fault = True
+        self.faults.append(f"LINK LOST: {error}")
+        self.velocity = None
+        self.loop.remove_reader(self._fd)
+        if self._status_timer:
+            self._status_timer.cancel()
+            self._status_timer = None
+        waiting = list(self._pings) + [future for future, _ in self._status] + self._fault_waiters
+        self._pings.clear()
+        self._status.clear()
+        self._fault_waiters = []
+        for future in waiting:
+            self._fail(future)
+        self._wake.set()
+        print(f"  ⚠ [Teensy] link lost: {error}")
+
+    def _fail(self, future):
+        if not future.done():
+            future.set_exception(serial.SerialException(f"Teensy link lost: {self.error}"))
+
+    def _future(self):
+        future = self.loop.create_future()
+        if self.error is not None:
+            self._fail(future)
+        return future
+
+    # ── Writing ──
+    async def _write_loop(self):
+        while self.error is None:
+            if not self._queue and not self._pending_vel:
+                if self._closing:
+                    return
+                await self._wake.wait()
+                self._wake.clear()
+                continue
+            lines = list(self._queue)
+            self._queue.clear()
+            if self._pending_vel:
+                lines.append(self._pending_vel)
+                self._pending_vel = None
+            data = "".join(f"{cmd}\n" for cmd in lines).encode()
+            try:
+                # a full port would block write(); keep it off the event loop
+                await self.loop.run_in_executor(None, self.ser.write, data)
+            except (serial.SerialException, OSError) as e:
+                self._lost(e)
+
+    async def _keepalive_loop(self):
+        # resend the velocity 1/KEEPALIVE_HZ after the last one, on absolute
+        # deadlines; a set_velocity() in between pushes the deadline back
+        while True:
+            deadline = self._last_vel + self.keepalive
+            delay = deadline - self.loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+            if self.velocity is not None and self._pending_vel is None:
+                self._pending_vel = self._vel_command()
+                self._last_vel = deadline
+                self._wake.set()
+            else:
+                self._last_vel = self.loop.time()
+
+    def _vel_command(self):
+        vx, vy, omega = self.velocity
+        return f"CMD_VEL {vx:.4f} {vy:.4f} {omega:.4f}"
+
+    def send(self, cmd):
+        """Queue a raw command line; returns immediately."""
+        self._queue.append(cmd)
+        self._wake.set()
+
+    def set_velocity(self, vx, vy, omega):
+        """Drive at (vx, vy, omega) until changed or stopped; kept alive automatically."""
+        self.velocity = (vx, vy, omega)
+        self._pending_vel = self._vel_command()
+        self._last_vel = self.loop.time()
+        self._wake.set()
+
+    async def stop(self):
+        """Drop any pending CMD_VEL and send CMD_STOP ahead of queued commands."""
+        self.velocity = None
+        self._pending_vel = None
+        self._queue.appendleft("CMD_STOP")
+        self._wake.set()
+        await asyncio.sleep(0)
+
+    # ── Requests ──
+    async def ping(self, timeout=REPLY_TIMEOUT):
+        """Round-trip time of PING -> PONG in seconds; raises asyncio.TimeoutError."""
+        future = self._future()
+        self._pings.append(future)
+        t0 = self.loop.time()
+        self.send("PING")
+        try:
+            return await asyncio.wait_for(future, timeout) - t0
+        except asyncio.TimeoutError:
+            if future in self._pings:
+                self._pings.remove(future)
+            raise
+
+    async def status(self, timeout=REPLY_TIMEOUT):
+        """Lines of the STATUS reply."""
+        future = self._future()
+        self._status.append((future, []))
+        self.send("STATUS")
+        try:
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self._status = collections.deque(s for s in self._status if s[0] is not future)
+
+    async def wait_fault(self, timeout=None):
+        """Next FAULT line, or raises asyncio.TimeoutError."""
+        future = self._future()
+        self._fault_waiters.append(future)
+        return await asyncio.wait_for(future, timeout)
+
+    def get_last_odom(self):
+        return self.odom.get_last_odom()
+
+    async def close(self, timeout=REPLY_TIMEOUT):
+        """Send CMD_STOP, give the writer up to `timeout` s to flush it, close the port."""
+        self._keeper.cancel()
+        await self.stop()
+        self._closing = True
+        self._wake.set()
+        try:
+            await asyncio.wait_for(self._writer, timeout)
+        except asyncio.TimeoutError:
+            print("  ⚠ [Teensy] CMD_STOP not flushed before close")
+        self.loop.remove_reader(self._fd)
+        self.ser.close()
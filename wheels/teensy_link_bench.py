@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+teensy_link_bench.py
+Command round-trip latency: threaded TeensyLink vs AsyncTeensyLink.
+
+Both run against the pty Teensy stand-in (wheels/teensy_emulator.py).
+The threaded link's ping() waits on its reader thread's line list
+(wait_for), waking a condition per line. The async link matches every
+PONG to its request from the event loop; its pings are
+also timed while velocity updates stream at UPDATE_HZ, where the
+emulator log shows how many CMD_VELs actually went out (coalescing) and
+the longest keep-alive gap.
+
+USAGE:
+    python3 -m wheels.teensy_link_bench [n_pings]
+"""
+
+import asyncio
+import sys
+import time
+
+import numpy as np
+
+from wheels.teensy_emulator import TeensyEmulator
+from wheels.teensy_link import AsyncTeensyLink
+from wheels.test_phase2_all_wheels import TeensyLink, BAUD
+
+N_PINGS = 200
+N_OLD_PINGS = 10
+UPDATE_HZ = 50
+DRIVE_TIME = 1.0
+BURST = 1000
+
+
+def summary(rtts):
+    ms = np.array(rtts) * 1000
+    return f"mean {ms.mean():7.3f} ms  p50 {np.median(ms):7.3f}  p99 {np.percentile(ms, 99):7.3f}  max {ms.max():7.3f}"
+
+
+def gaps(times):
+    return np.diff(times).max() * 1000 if len(times) > 1 else float("nan")
+
+
+def old_link(n):
+    emu = TeensyEmulator()
+    emu.start()
+    link = TeensyLink(emu.port, BAUD)
+    rtts, lost = [], 0
+    for _ in range(n):
+        t0 = time.monotonic()
+        ok = link.ping()
+        if ok:
+            rtts.append(time.monotonic() - t0)
+        else:
+            lost += 1
+    t0 = time.monotonic()
+    link.send_vel(0.10, 0.0, 0.0, DRIVE_TIME, verbose=False)
+    sent = [t for t in emu.commands("CMD_VEL") if t >= t0]
+    link.close()
+    emu.stop()
+    return rtts, lost, sent
+
+
+async def new_link(n):
+    emu = TeensyEmulator()
+    emu.start()
+    link = await AsyncTeensyLink.open(emu.port, reset_wait=0)
+    idle = [await link.ping() for _ in range(n)]
+
+    # velocity updates at UPDATE_HZ while pinging
+    async def drive():
+        t_end = time.monotonic() + DRIVE_TIME
+        i = 0
+        while time.monotonic() < t_end:
+            link.set_velocity(0.10, 0.0, 0.001 * i)
+            i += 1
+            await asyncio.sleep(1.0 / UPDATE_HZ)
+        return i
+
+    t0 = time.monotonic()
+    driver = asyncio.ensure_future(drive())
+    busy = []
+    while not driver.done():
+        busy.append(await link.ping())
+    updates = driver.result()
+    streamed = [t for t in emu.commands("CMD_VEL") if t >= t0]
+
+    # a burst of updates inside one loop iteration goes out as one command
+    t0 = time.monotonic()
+    for i in range(BURST):
+        link.set_velocity(0.10, 0.0, 0.001 * i)
+    await asyncio.sleep(0.05)
+    burst = len([t for t in emu.commands("CMD_VEL") if t >= t0])
+
+    # keep-alive only
+    t0 = time.monotonic()
+    await asyncio.sleep(DRIVE_TIME)
+    kept = [t for t in emu.commands("CMD_VEL") if t >= t0]
+    await link.stop()
+    await link.close()
+    emu.stop()
+    return idle, busy, (updates, streamed), burst, kept
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else N_PINGS
+    old_rtts, lost, old_sent = old_link(N_OLD_PINGS)
+    idle, busy, (updates, streamed), burst, kept = asyncio.run(new_link(n))
+
+    print(f"PING -> PONG against the pty emulator")
+    print(f"  TeensyLink      : {len(old_rtts)}/{N_OLD_PINGS} answered, {lost} lost"
+          + (f"\n                    {summary(old_rtts)}" if old_rtts else ""))
+    print(f"  AsyncTeensyLink : {len(idle)}/{n} answered\n                    {summary(idle)}")
+    print(f"  ... with {UPDATE_HZ} Hz velocity updates: {summary(busy)}")
+    print(f"CMD_VEL over {DRIVE_TIME:.1f} s")
+    print(f"  send_vel loop         : {len(old_sent)} sent, longest gap {gaps(old_sent):6.1f} ms")
+    print(f"  set_velocity, {UPDATE_HZ} Hz   : {updates} updates -> {len(streamed)} sent, "
+          f"longest gap {gaps(streamed):6.1f} ms")
+    print(f"  set_velocity, burst   : {BURST} updates in one loop step -> {burst} sent")
+    print(f"  keep-alive only       : {len(kept)} sent, longest gap {gaps(kept):6.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
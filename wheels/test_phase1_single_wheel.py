@@ -7,7 +7,9 @@ PURPOSE: Verify Pi ↔ Teensy serial link, then test each wheel individually.
          Run this FIRST before testing all 4 wheels.
 
 USAGE:
-    python3 test_phase1_single_wheel.py
+    python3 -m wheels.test_phase1_single_wheel   # from the repo root
+    python3 -m wheels.bringup [--emulate]        # unattended, Phase 1 + 2
+    python3 -m hardware.serial_broker /dev/ttyACM0:115200   # optional: keep the port open between runs
 
 PREREQUISITES:
     - Teensy 4.1 loaded with woundbot_test_firmware.ino
@@ -19,12 +21,11 @@ PREREQUISITES:
 pip install pyserial
 """
 
-import serial
 import time
 import sys
 import threading
 
-time.sleep(2) 
+from hardware.serial_broker import open_serial
 
 # ── Configuration ─────────────────────────────────────────────
 PORT = "/dev/ttyACM0"    # Change if your Teensy enumerates differently
@@ -235,8 +236,7 @@ def main():
     # Open serial
     print(f"\nOpening {PORT} at {BAUD} baud...")
     try:
-        ser = serial.Serial(PORT, BAUD, timeout=TIMEOUT)
-        time.sleep(2.0)  # Teensy resets on serial open
+        ser = open_serial(PORT, BAUD, timeout=TIMEOUT)  # waits out the Teensy's reset unless brokered
         flush_input(ser)
         print("  Serial port opened.\n")
     except Exception as e:
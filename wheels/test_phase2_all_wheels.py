@@ -8,21 +8,28 @@ PURPOSE: Test all 4 wheels together using CMD_VEL (mecanum kinematics).
          Run this AFTER Phase 1 passes for all individual wheels.
 
 USAGE:
-    python3 test_phase2_all_wheels.py
+    python3 -m wheels.test_phase2_all_wheels     # from the repo root
+    python3 -m wheels.bringup [--emulate]        # unattended, Phase 1 + 2
+    python3 -m hardware.serial_broker /dev/ttyACM0:115200   # optional: keep the port open between runs
 
 PREREQUISITES:
     - Phase 1 passed for all 4 wheels
     - Robot on blocks OR in an open area (it WILL move)
     - 12V power applied, E-Stop within reach
 
-pip install pyserial
+pip install pyserial numpy
 """
 
-import serial
 import time
 import sys
 import threading
 
+from hardware.periodic import Periodic
+from hardware.serial_broker import open_serial
+from wheels.mecanum import SlipDetector
+from wheels.odom_buffer import OdomBuffer
+from wheels.velocity_profile import VelocityProfile
+
 # ── Configuration ─────────────────────────────────────────────
 PORT = "/dev/ttyACM0"
 BAUD = 115200
@@ -39,12 +46,20 @@ KEEPALIVE_HZ = 5  # 200ms interval
 class TeensyLink:
     """Manages serial connection with background reader and keep-alive."""
 
-    def __init__(self, port, baud):
-        self.ser = serial.Serial(port, baud, timeout=TIMEOUT)
-        time.sleep(2.0)  # Teensy resets on open
+    def __init__(self, port, baud, clock=time):
+        # `clock` provides monotonic() and sleep(); the emulator's SimClock
+        # runs the whole exchange in accelerated time
+        self.clock = clock
+        # through the serial broker if it's running, else opened here and
+        # waited on while the Teensy resets
+        self.ser = open_serial(port, baud, timeout=TIMEOUT, sleep=self.clock.sleep)
         self.ser.reset_input_buffer()
-        self.odom_lines = []
+        self.odom = OdomBuffer()  # every ODOM report, parsed and timestamped
+        self.slip = SlipDetector()  # ODOM/command mismatch, in wheel space
         self.fault = False
+        self.lines = []           # (time, line) of everything else the Teensy sent
+        self.new_line = threading.Condition()
+        self.keepalive = Periodic(KEEPALIVE_HZ, clock=clock.monotonic, sleep=clock.sleep)
         self._reader_running = True
         self._reader = threading.Thread(target=self._read_loop, daemon=True)
         self._reader.start()
@@ -56,62 +71,82 @@ class TeensyLink:
                 if not line:
                     continue
                 if line.startswith("ODOM"):
-                    self.odom_lines.append(line)
-                    # Only keep last 20
-                    if len(self.odom_lines) > 20:
-                        self.odom_lines = self.odom_lines[-20:]
-                elif "FAULT" in line:
+                    t = self.clock.monotonic()
+                    if self.odom.append_line(line, t):
+                        self._check_slip(t)
+                    continue
+                if "FAULT" in line:
                     self.fault = True
+                    self.slip.command(self.clock.monotonic(), (0.0, 0.0, 0.0))
                     print(f"  ⚠ [Teensy] {line}")
                 else:
                     print(f"  [Teensy] {line}")
+                with self.new_line:
+                    self.lines.append((self.clock.monotonic(), line))
+                    self.new_line.notify_all()
             except Exception:
                 pass
 
+    def wait_for(self, keyword, since, timeout=2.0):
+        """(time, line) of the first line containing `keyword` received
+        after `since`, waiting up to `timeout`; None if none arrives."""
+        deadline = self.clock.monotonic() + timeout
+        with self.new_line:
+            while True:
+                for t, line in self.lines:
+                    if t >= since and keyword in line:
+                        return t, line
+                remaining = deadline - self.clock.monotonic()
+                if remaining <= 0:
+                    return None
+                self.new_line.wait(remaining / getattr(self.clock, "scale", 1.0))
+
+    def _check_slip(self, t):
+        was_slipping = self.slip.slipping
+        if self.slip.check(t, self.odom.last[4:7]) and not was_slipping:
+            wheels = "  ".join(f"{r:+.3f}" for r in self.slip.worst)
+            print(f"  ⚠ ODOM/command mismatch: wheel speed error {wheels} m/s (FL FR RL RR)")
+
     def send(self, cmd):
+        parts = cmd.split()
+        if parts[0] == "CMD_VEL" and len(parts) == 4:
+            self.slip.command(self.clock.monotonic(), [float(v) for v in parts[1:]])
+        elif parts[0] in ("CMD_STOP", "TEST_STOP"):
+            self.slip.command(self.clock.monotonic(), (0.0, 0.0, 0.0))
+        elif parts[0] == "TEST_WHEEL":
+            self.slip.command(self.clock.monotonic(), None)
         self.ser.write(f"{cmd}\n".encode())
         self.ser.flush()
 
-    def send_vel(self, vx, vy, omega, duration):
-        """Send CMD_VEL repeatedly for `duration` seconds (keep-alive)."""
+    def send_vel(self, vx, vy, omega, duration, verbose=True):
+        """Send CMD_VEL repeatedly for `duration` seconds (keep-alive),
+        on absolute deadlines; stats are left in self.keepalive and
+        printed unless verbose is False."""
         cmd = f"CMD_VEL {vx:.4f} {vy:.4f} {omega:.4f}"
-        interval = 1.0 / KEEPALIVE_HZ
-        t0 = time.time()
-        while time.time() - t0 < duration:
-            self.ser.write(f"{cmd}\n".encode())
-            self.ser.flush()
-            time.sleep(interval)
+        self.keepalive.reset()
+        for _ in self.keepalive.ticks(duration):
+            self.send(cmd)
+        if verbose:
+            print(f"  ⏱ Keep-alive: {self.keepalive.summary()}")
 
     def stop(self):
         self.send("CMD_STOP")
-        time.sleep(0.2)
+        self.clock.sleep(0.2)
 
-    def ping(self):
-        self.ser.reset_input_buffer()
+    def ping(self, timeout=2.0):
+        """True if a PONG arrives within `timeout`; the reader thread owns the port."""
+        t0 = self.clock.monotonic()
         self.send("PING")
-        t0 = time.time()
-        while time.time() - t0 < 2.0:
-            line = self.ser.readline().decode("utf-8", errors="replace").strip()
-            if "PONG" in line:
-                return True
-        return False
+        return self.wait_for("PONG", t0, timeout) is not None
 
     def get_last_odom(self):
-        """Parse last ODOM line → dict."""
-        if not self.odom_lines:
-            return None
-        parts = self.odom_lines[-1].split()
-        if len(parts) >= 7:
-            return {
-                "x": float(parts[1]), "y": float(parts[2]), "yaw": float(parts[3]),
-                "vx": float(parts[4]), "vy": float(parts[5]), "omega": float(parts[6]),
-            }
-        return None
+        """Last ODOM report → dict."""
+        return self.odom.get_last_odom()
 
     def close(self):
         self._reader_running = False
         self.send("CMD_STOP")
-        time.sleep(0.3)
+        self.clock.sleep(0.3)
         self.ser.close()
 
 
@@ -185,25 +220,18 @@ def run_motion_test(link, test, test_num, total):
     print()
     input("  Press Enter to run (Ctrl+C to abort)...")
 
-    # Clear odom
-    link.odom_lines.clear()
     link.fault = False
 
-    # Run motion
+    # Run motion: ramp up, hold, ramp down; logs expected vs odometry per segment
     print(f"  🔄 Running: {test['name']}...")
-    link.send_vel(test["vx"], test["vy"], test["omega"], TEST_DURATION)
-    link.stop()
+    profile = VelocityProfile([(test["vx"], test["vy"], test["omega"], TEST_DURATION)])
+    profile.run(link)
 
     # Check fault
     if link.fault:
         print("  ⚠ FAULT detected during test!")
         return False
 
-    # Show odometry delta
-    odom = link.get_last_odom()
-    if odom:
-        print(f"  📍 Odometry: x={odom['x']:.3f}  y={odom['y']:.3f}  yaw={odom['yaw']:.2f}")
-
     # User confirms
     ok = input("  Did the motion match the expected behavior? (y/n): ").strip().lower()
     return ok == "y"
@@ -238,9 +266,8 @@ def test_watchdog(link):
     input("  Press Enter to run...")
 
     # Send a few commands to get moving
-    for _ in range(5):
+    for _ in Periodic(10).ticks(0.5):
         link.send("CMD_VEL 0.10 0.0 0.0")
-        time.sleep(0.1)
 
     print("  🔄 Moving... now going silent (no more commands)...")
     print("  Waiting for watchdog...")
@@ -260,23 +287,20 @@ def test_odom_sanity(link):
     print(f"{'─'*50}")
     input("  Press Enter to run...")
 
-    # Reset by noting current odom
-    link.odom_lines.clear()
+    # Reset by noting the time; the buffer keeps everything since
     time.sleep(0.2)
+    t0 = time.monotonic()
 
-    odom_before = link.get_last_odom()
-    x0 = odom_before["x"] if odom_before else 0.0
-
-    link.send_vel(0.10, 0.0, 0.0, 3.0)
-    link.stop()
-    time.sleep(0.3)
+    VelocityProfile([(0.10, 0.0, 0.0, 3.0)]).run(link)
 
-    odom_after = link.get_last_odom()
-    if odom_after:
-        dx = odom_after["x"] - x0
+    moved = link.odom.integrate(t0, time.monotonic())
+    if moved:
+        dx, dy, dyaw = moved["reported"]
         print(f"  📍 Odom delta X: {dx:.3f} m (expected ~0.30)")
-        print(f"  📍 Odom Y:       {odom_after['y']:.3f} m (expected ~0.00)")
-        print(f"  📍 Odom Yaw:     {odom_after['yaw']:.3f} rad (expected ~0.00)")
+        print(f"  📍 Odom delta Y: {dy:.3f} m (expected ~0.00)")
+        print(f"  📍 Odom Yaw:     {dyaw:.3f} rad (expected ~0.00)")
+        print(f"  📍 Velocity-integrated X: {moved['integrated'][0]:.3f} m "
+              f"(pose vs velocity mismatch {moved['error']:.3f} m)")
 
         reasonable = 0.15 < abs(dx) < 0.50
         if reasonable:
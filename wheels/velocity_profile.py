@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+velocity_profile.py
+Acceleration/jerk-limited velocity profiles for the mecanum base.
+
+PURPOSE: Replaces "CMD_VEL step, wait, CMD_STOP" with a setpoint stream
+         precomputed from a list of (vx, vy, omega, duration) segments or
+         from a waypoint path. Every change of velocity follows an S-curve
+         that keeps each axis inside its acceleration and jerk limits and
+         moves along a straight line in (vx, vy, omega), so a strafe stays
+         a strafe while it speeds up. The ramps are symmetric, so a segment
+         still covers velocity x duration, and the last segment ramps down
+         to zero before CMD_STOP.
+
+         run() streams the setpoints at RATE Hz on absolute deadlines
+         (hardware/periodic.py) and compares, per segment, the expected
+         displacement with the one in the Teensy's ODOM reports.
+
+USAGE:
+    profile = VelocityProfile([(0.10, 0.0, 0.0, 2.5), (0.0, 0.10, 0.0, 2.0)])
+    profile = VelocityProfile.from_waypoints([(0.5, 0.0), (0.5, 0.5, 1.57)])
+    log = profile.run(link)      # a TeensyLink (test_phase2_all_wheels.py)
+"""
+
+import math
+import time
+
+import numpy as np
+
+from hardware.periodic import Periodic
+from wheels.mecanum import Mecanum
+
+# ── Configuration ─────────────────────────────────────────────
+RATE = 50                          # setpoints per second
+ACCEL = (0.25, 0.25, 1.0)          # m/s², m/s², rad/s² for vx, vy, omega
+JERK = (1.0, 1.0, 4.0)             # m/s³, m/s³, rad/s³
+SPEED = 0.10                       # waypoint cruise speed, m/s
+TURN_RATE = 0.30                   # waypoint turn rate, rad/s
+SETTLE = 0.3                       # wait for the last ODOM reports after the stream
+
+
+def s_curve(accel, jerk):
+    """Duration and shape of a jerk-limited transition from 0 to 1, given
+    the acceleration and jerk limits of the normalized progress."""
+    t_j = accel / jerk
+    if accel * t_j >= 1.0:
+        # never reaches full acceleration
+        t_j = math.sqrt(1.0 / jerk)
+        t_a = 0.0
+    else:
+        t_a = 1.0 / accel - t_j
+    a_peak = jerk * t_j
+    total = 2 * t_j + t_a
+
+    def shape(t):
+        t = np.clip(t, 0.0, total)
+        rising = jerk * t ** 2 / 2
+        cruise = jerk * t_j ** 2 / 2 + a_peak * (t - t_j)
+        falling = 1.0 - jerk * (total - t) ** 2 / 2
+        return np.where(t < t_j, rising, np.where(t < t_j + t_a, cruise, falling))
+
+    return total, shape
+
+
+def transition(v0, v1, accel=ACCEL, jerk=JERK):
+    """(duration, shape) of the S-curve from v0 to v1: progress is limited
+    by whichever axis is closest to its limits."""
+    dv = np.abs(np.subtract(v1, v0))
+    moving = dv > 1e-9
+    if not moving.any():
+        return 0.0, lambda t: np.ones_like(t)
+    return s_curve(np.min(np.asarray(accel)[moving] / dv[moving]),
+                   np.min(np.asarray(jerk)[moving] / dv[moving]))
+
+
+def integrate(setpoints, dt, pose=(0.0, 0.0, 0.0)):
+    """Poses (N+1, 3) reached by holding each body-frame setpoint for dt."""
+    poses = np.empty((len(setpoints) + 1, 3))
+    poses[0] = pose
+    yaw = pose[2] + np.concatenate(([0.0], np.cumsum(setpoints[:, 2] * dt)))
+    mid = (yaw[:-1] + yaw[1:]) / 2
+    c, s = np.cos(mid), np.sin(mid)
+    vx, vy = setpoints[:, 0], setpoints[:, 1]
+    poses[1:, 0] = pose[0] + np.cumsum((c * vx - s * vy) * dt)
+    poses[1:, 1] = pose[1] + np.cumsum((s * vx + c * vy) * dt)
+    poses[:, 2] = yaw
+    return poses
+
+
+def relative(a, b):
+    """Pose b in the frame of pose a."""
+    dx, dy = b[0] - a[0], b[1] - a[1]
+    c, s = math.cos(a[2]), math.sin(a[2])
+    return c * dx + s * dy, -s * dx + c * dy, b[2] - a[2]
+
+
+class VelocityProfile:
+    """Setpoint stream for a list of (vx, vy, omega, duration) segments.
+
+    A segment's duration counts from the start of its ramp; if the ramp is
+    longer, the segment lasts as long as the ramp.
+    """
+
+    def __init__(self, segments, rate=RATE, accel=ACCEL, jerk=JERK):
+        self.rate = rate
+        self.dt = 1.0 / rate
+        self.segments = [tuple(float(v) for v in seg) for seg in segments]
+        if any(seg[3] < 0 for seg in self.segments):
+            raise ValueError("segment durations must be >= 0")
+        # ramp to a stop at the end unless the path already does
+        if not self.segments or any(self.segments[-1][:3]):
+            self.segments.append((0.0, 0.0, 0.0, 0.0))
+
+        chunks, bounds, v0 = [], [0], np.zeros(3)
+        for vx, vy, omega, duration in self.segments:
+            v1 = np.array([vx, vy, omega])
+            ramp, shape = transition(v0, v1, accel, jerk)
+            n = max(1, round(max(duration, ramp) * rate))
+            # sample mid-interval, since each setpoint is held for dt
+            t = (np.arange(n) + 0.5) * self.dt
+            chunks.append(v0 + np.outer(shape(t), v1 - v0))
+            bounds.append(bounds[-1] + n)
+            v0 = v1
+        self.setpoints = np.concatenate(chunks)
+        self.bounds = bounds                       # sample index where each segment starts
+        self.expected = integrate(self.setpoints, self.dt)
+
+    @classmethod
+    def from_waypoints(cls, waypoints, speed=SPEED, turn_rate=TURN_RATE, **kwargs):
+        """Profile visiting (x, y) or (x, y, yaw) waypoints, in the frame the
+        robot starts in: for each, turn in place to the new yaw (if given),
+        stop, strafe/drive straight to the point, stop."""
+        accel = kwargs.get("accel", ACCEL)
+        jerk = kwargs.get("jerk", JERK)
+        segments = []
+        x, y, yaw = 0.0, 0.0, 0.0
+        for point in waypoints:
+            if len(point) > 2 and abs(point[2] - yaw) > 1e-6:
+                turn = point[2] - yaw
+                omega = cls._leg_speed(abs(turn), turn_rate, (0.0, 0.0, 1.0), accel, jerk)
+                segments += [(0.0, 0.0, math.copysign(omega, turn), abs(turn) / omega),
+                             (0.0, 0.0, 0.0, 0.0)]
+                yaw = point[2]
+            dx, dy, _ = relative((x, y, yaw), (point[0], point[1], yaw))
+            dist = math.hypot(dx, dy)
+            if dist > 1e-6:
+                v = cls._leg_speed(dist, speed, (dx / dist, dy / dist, 0.0), accel, jerk)
+                segments += [(v * dx / dist, v * dy / dist, 0.0, dist / v),
+                             (0.0, 0.0, 0.0, 0.0)]
+            x, y = point[0], point[1]
+        return cls(segments, **kwargs)
+
+    @staticmethod
+    def _leg_speed(length, speed, direction, accel, jerk):
+        # slow down legs too short to finish the ramp within length / speed,
+        # otherwise the ramp would stretch the segment and overshoot
+        while speed > 1e-3:
+            ramp, _ = transition((0.0, 0.0, 0.0), np.multiply(direction, speed), accel, jerk)
+            if length / speed >= ramp:
+                break
+            speed *= 0.8
+        return speed
+
+    @property
+    def duration(self):
+        return len(self.setpoints) * self.dt
+
+    def wheel_speeds(self, kinematics=None):
+        """(N, 4) wheel speeds (rad/s) the setpoints ask for, FL FR RL RR."""
+        return (kinematics or Mecanum()).inverse(self.setpoints)
+
+    def segment_slices(self):
+        return [slice(a, b) for a, b in zip(self.bounds[:-1], self.bounds[1:])]
+
+    def run(self, link, verbose=True):
+        """Stream the setpoints to `link` (send(cmd), odom, stop()) and return
+        one dict per segment: expected and reported (dx, dy, dyaw) in the
+        segment's start frame, plus the position and heading error."""
+        clock = getattr(link, "clock", time)
+        n = len(self.setpoints)
+        sent = np.full(n, np.nan)                  # host time each setpoint went out
+        timer = Periodic(self.rate, clock=clock.monotonic, sleep=clock.sleep)
+        t0 = None
+        try:
+            for k in timer.ticks(self.duration):
+                # index by deadline, so a missed tick skips a setpoint rather
+                # than delaying the whole profile
+                i = k + timer.missed
+                if i >= n:
+                    break
+                if t0 is None:
+                    t0 = timer.last
+                vx, vy, omega = self.setpoints[i]
+                link.send(f"CMD_VEL {vx:.4f} {vy:.4f} {omega:.4f}")
+                sent[i] = clock.monotonic()
+        finally:
+            link.stop()
+        clock.sleep(SETTLE)
+
+        log = []
+        for i, (part, seg) in enumerate(zip(self.segment_slices(), self.segments)):
+            expected = relative(self.expected[part.start], self.expected[part.stop])
+            start = link.odom.pose_at(t0 + part.start * self.dt)
+            end = link.odom.pose_at(t0 + part.stop * self.dt)
+            entry = {"segment": i, "command": seg[:3], "expected": expected,
+                     "reported": None, "error": None, "yaw_error": None,
+                     "skipped": int(np.isnan(sent[part]).sum())}
+            if start is not None and end is not None:
+                reported = relative(start, end)
+                entry["reported"] = reported
+                entry["error"] = math.hypot(reported[0] - expected[0], reported[1] - expected[1])
+                entry["yaw_error"] = reported[2] - expected[2]
+            log.append(entry)
+            if verbose:
+                print_segment(entry)
+        if verbose:
+            print(f"  ⏱ Setpoints: {timer.summary()}")
+        return log
+
+
+def print_segment(entry):
+    ex = entry["expected"]
+    line = (f"  📐 seg {entry['segment']}: expected dx={ex[0]:+.3f} dy={ex[1]:+.3f} "
+            f"dyaw={ex[2]:+.2f}")
+    if entry["reported"] is None:
+        line += "  (no odometry)"
+    else:
+        rep = entry["reported"]
+        line += (f" | odom dx={rep[0]:+.3f} dy={rep[1]:+.3f} dyaw={rep[2]:+.2f}"
+                 f" | err {entry['error'] * 1000:.0f} mm, {math.degrees(entry['yaw_error']):+.1f}°")
+    if entry["skipped"]:
+        line += f"  [{entry['skipped']} setpoints skipped]"
+    print(line)
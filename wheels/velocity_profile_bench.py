@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+velocity_profile_bench.py
+Step-and-stop vs jerk-limited profile for one motion test.
+
+For the 2.5 s forward test, prints the largest velocity change between
+two consecutive commands and the commanded peak acceleration and jerk of
+the profile: the step asks for full speed (and then zero, at CMD_STOP) in
+one command, which the motors can only follow by jerking. Also times
+planning a long waypoint path and runs a small profile against the pty
+Teensy stand-in to show the per-segment log.
+
+USAGE:
+    python3 -m wheels.velocity_profile_bench
+"""
+
+import time
+
+import numpy as np
+
+from wheels.teensy_emulator import TeensyEmulator
+from wheels.test_phase2_all_wheels import TeensyLink, BAUD, KEEPALIVE_HZ, TEST_DURATION
+from wheels.velocity_profile import VelocityProfile, RATE
+
+VX = 0.10
+N_WAYPOINTS = 200
+
+
+def peaks(v, rate):
+    acc = np.diff(v) * rate
+    jerk = np.diff(acc) * rate
+    return np.abs(acc).max(), np.abs(jerk).max()
+
+
+def main():
+    # step: 0 -> VX at the first command, VX -> 0 at CMD_STOP
+    step = np.concatenate(([0.0], np.full(int(TEST_DURATION * KEEPALIVE_HZ), VX), [0.0]))
+    profile = VelocityProfile([(VX, 0.0, 0.0, TEST_DURATION)])
+    v = profile.setpoints[:, 0]
+    acc, jerk = peaks(v, RATE)
+    print(f"Forward test, {VX} m/s for {TEST_DURATION} s")
+    print(f"  step + CMD_STOP : largest change {np.abs(np.diff(step)).max():.4f} m/s per command, "
+          f"{TEST_DURATION * VX:.3f} m at {KEEPALIVE_HZ} Hz keep-alive")
+    print(f"  profile         : largest change {np.abs(np.diff(v)).max():.4f} m/s per command, "
+          f"{profile.expected[-1, 0]:.3f} m in {profile.duration:.2f} s at {RATE} Hz")
+    print(f"                    peak accel {acc:.2f} m/s², peak jerk {jerk:.2f} m/s³")
+
+    rng = np.random.default_rng(0)
+    waypoints = np.cumsum(rng.uniform(-0.3, 0.3, size=(N_WAYPOINTS, 2)), axis=0)
+    t0 = time.perf_counter()
+    path = VelocityProfile.from_waypoints([tuple(p) for p in waypoints])
+    t_plan = time.perf_counter() - t0
+    end_error = np.hypot(*(path.expected[-1, :2] - waypoints[-1]))
+    print(f"  {N_WAYPOINTS}-waypoint path: {len(path.setpoints)} setpoints ({path.duration:.0f} s) "
+          f"planned in {t_plan * 1000:.1f} ms, end error {end_error * 1000:.1f} mm")
+
+    print("Against the emulator:")
+    emu = TeensyEmulator()
+    emu.start()
+    link = TeensyLink(emu.port, BAUD)
+    try:
+        VelocityProfile([(VX, 0.0, 0.0, 1.0), (0.0, VX, 0.3, 1.0)]).run(link)
+    finally:
+        link.close()
+        emu.stop()
+
+
+if __name__ == "__main__":
+    main()
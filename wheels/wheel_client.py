@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+wheel_client.py
+Non-blocking client for the '1'/'0' Arduino wheels sketch (sketch_feb25a).
+
+PURPOSE: start() and stop() write one character and return at once. A
+         background reader keeps the last REPLIES_KEPT lines the sketch
+         printed in `replies` and resolves the acknowledgement futures:
+
+           '0' -> the sketch's stop() prints "EN pulled high" (x4); the
+                  future resolves with the first one
+           '1' -> the sketch prints nothing, so the future resolves with
+                  None as soon as the byte is written
+
+         The Arduino resets when the port opens; commands sent before its
+         setup() banner ("Forward") are held and written once it appears
+         (or after READY_TIMEOUT if it never does), instead of sleeping a
+         fixed 2 s up front. Through the serial broker the board is already
+         up, so commands go out straight away. If the port fails (or the
+         client is closed), unanswered futures fail with SerialException.
+
+USAGE:
+    wheels = WheelClient()              # returns immediately
+    wheels.start()
+    ...
+    wheels.stop().result(timeout=1.0)   # optional: wait for the sketch's ack
+    wheels.close()
+"""
+
+import collections
+import concurrent.futures
+import threading
+import time
+
+import serial
+
+from hardware.serial_broker import BrokerPort, open_serial
+
+# ── Configuration ─────────────────────────────────────────────
+PORT = "/dev/ttyACM0"
+BAUD = 9600
+READY_TIMEOUT = 3.0          # Arduino reset + setup()
+READY_BANNER = "Forward"     # last line setup() prints
+ACKS = {"1": None, "0": "EN pulled high"}
+REPLIES_KEPT = 100
+
+
+class WheelClient:
+    """'1'/'0' wheels sketch over serial, with a background reader."""
+
+    def __init__(self, port=PORT, baud=BAUD, ready_timeout=READY_TIMEOUT, verbose=False):
+        self.ser = open_serial(port, baud, timeout=0.1, reset_wait=0)
+        self.verbose = verbose
+        self.replies = collections.deque(maxlen=REPLIES_KEPT)  # (monotonic time, line), newest last
+        self.ready = threading.Event()
+        self.lock = threading.Lock()
+        self._held = []                  # (command, future) sent before the sketch was ready
+        self._acks = []                  # (keyword, future) waiting for a reply, oldest first
+        self.error = None                # why the port stopped, once it has
+        self.running = True
+        self._reader = threading.Thread(target=self._read_loop, daemon=True)
+        self._reader.start()
+        self._ready_timer = threading.Timer(ready_timeout, self._set_ready)
+        self._ready_timer.daemon = True
+        self._ready_timer.start()
+        if isinstance(self.ser, BrokerPort):
+            self._set_ready()            # the broker opened the port long ago; no banner is coming
+
+    # ── Reading ──
+    def _read_loop(self):
+        while self.running:
+            try:
+                raw = self.ser.readline()
+            except (serial.SerialException, OSError, TypeError) as e:
+                if self.running:
+                    self._fail(f"{self.ser.port} failed: {e}")
+                break
+            line = raw.decode("utf-8", errors="replace").strip()
+            if not line:
+                continue
+            self.replies.append((time.monotonic(), line))
+            if self.verbose:
+                print(f"Arduino response: {line}")
+            if line == READY_BANNER:
+                self._set_ready()
+            with self.lock:
+                for i, (keyword, future) in enumerate(self._acks):
+                    if keyword in line:
+                        del self._acks[i]
+                        future.set_result(line)
+                        break
+
+    def _fail(self, reason):
+        """Fail every unanswered future; later commands fail straight away."""
+        with self.lock:
+            if self.error is None:
+                self.error = reason
+            pending = self._held + self._acks
+            self._held, self._acks = [], []
+        for _, future in pending:
+            if not future.done():
+                future.set_exception(serial.SerialException(self.error))
+
+    def _set_ready(self):
+        with self.lock:
+            if self.ready.is_set():
+                return
+            self.ready.set()
+            held, self._held = self._held, []
+            for command, future in held:
+                self._write(command, future)
+
+    # ── Writing ──
+    def _write(self, command, future):
+        # called with self.lock held
+        try:
+            self.ser.write(command.encode("ascii"))
+        except (serial.SerialException, OSError) as e:
+            future.set_exception(serial.SerialException(f"{self.ser.port} write failed: {e}"))
+            return
+        keyword = ACKS.get(command)
+        if keyword is None:
+            future.set_result(None)
+        else:
+            self._acks.append((keyword, future))
+
+    def send(self, command):
+        """Send '1' or '0' without waiting; returns a Future for the ack."""
+        if command not in ACKS:
+            raise ValueError(f"the wheels sketch only understands '1' and '0', not {command!r}")
+        future = concurrent.futures.Future()
+        with self.lock:
+            if self.error is not None:
+                future.set_exception(serial.SerialException(self.error))
+            elif self.ready.is_set():
+                self._write(command, future)
+            else:
+                self._held.append((command, future))
+        if self.verbose:
+            print(f"Sent command: {command}")
+        return future
+
+    def start(self):
+        return self.send("1")
+
+    def stop(self):
+        return self.send("0")
+
+    def close(self):
+        self.running = False
+        self._ready_timer.cancel()
+        self._reader.join(timeout=1.0)
+        self._fail("wheel client closed")
+        self.ser.close()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+wheel_client_bench.py
+Blocking control_wheels() vs WheelClient against a pty stand-in for the
+'1'/'0' wheels sketch.
+
+The stand-in behaves like sketch_feb25a on an Uno: it ignores input for
+BOOT seconds after the port opens (bootloader), prints the setup() banner,
+says nothing on '1' and "EN pulled high" four times on '0', at 9600 baud.
+Reports how long the caller is held up opening the port and per command,
+and how long the '0' acknowledgement takes to arrive.
+
+USAGE:
+    python3 -m wheels.wheel_client_bench [n_commands]
+"""
+
+import os
+import sys
+import threading
+import time
+import tty
+
+import serial
+
+from wheels.wheel_client import WheelClient
+
+BOOT = 1.6                  # s, Uno bootloader before setup() runs
+CHAR_TIME = 10 / 9600       # s per character at 9600 baud
+N_COMMANDS = 4
+
+
+class ArduinoStandIn(threading.Thread):
+    """sketch_feb25a on a pseudo-terminal."""
+
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.master, self.slave = os.openpty()
+        tty.setraw(self.slave)
+        self.port = os.ttyname(self.slave)
+        self.running = True
+
+    def reply(self, *lines):
+        data = "".join(f"{line}\r\n" for line in lines).encode()
+        time.sleep(len(data) * CHAR_TIME)
+        os.write(self.master, data)
+
+    def run(self):
+        time.sleep(BOOT)
+        self.reply(*["EN pulled low"] * 4, "Forward")
+        while self.running:
+            try:
+                data = os.read(self.master, 64)
+            except OSError:
+                break
+            for c in data.decode("ascii", errors="replace"):
+                if c == "0":
+                    self.reply(*["EN pulled high"] * 4)
+
+    def stop(self):
+        self.running = False
+        os.close(self.slave)
+        os.close(self.master)
+
+
+def blocking(port, n):
+    """wheels_test1 before WheelClient: fixed 2 s after opening, 1 s per command."""
+    t0 = time.perf_counter()
+    ser = serial.Serial(port, 9600, timeout=1)
+    time.sleep(2)
+    t_open = time.perf_counter() - t0
+    held = []
+    for i in range(n):
+        command = "10"[i % 2]
+        t0 = time.perf_counter()
+        ser.write(command.encode('ascii'))
+        time.sleep(1)
+        if ser.in_waiting > 0:
+            ser.readline()
+        held.append(time.perf_counter() - t0)
+    ser.close()
+    return t_open, held, []
+
+
+def client(port, n):
+    t0 = time.perf_counter()
+    wheels = WheelClient(port, 9600)
+    t_open = time.perf_counter() - t0
+    wheels.ready.wait()
+    held, acks = [], []
+    for i in range(n):
+        command = "10"[i % 2]
+        t0 = time.perf_counter()
+        future = wheels.send(command)
+        held.append(time.perf_counter() - t0)
+        if future.result(timeout=1.0) is not None:
+            acks.append(time.perf_counter() - t0)
+    wheels.close()
+    return t_open, held, acks
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else N_COMMANDS
+    for name, run in (("control_wheels", blocking), ("WheelClient", client)):
+        arduino = ArduinoStandIn()
+        arduino.start()
+        t_open, held, acks = run(arduino.port, n)
+        arduino.stop()
+        print(f"{name}:")
+        print(f"  opening the port holds the caller {t_open * 1000:8.1f} ms")
+        print(f"  per command (mean of {n})        {sum(held) / n * 1000:8.3f} ms")
+        if acks:
+            print(f"  '0' acknowledged after         {sum(acks) / len(acks) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
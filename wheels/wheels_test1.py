@@ -1,18 +1,15 @@
-import serial
 import time
 
-ser = serial.Serial('/dev/ttyACM0', 9600, timeout=1)
-time.sleep(2)
+from wheels.wheel_client import WheelClient
+
+wheels = WheelClient('/dev/ttyACM0', 9600, verbose=True)
 
 def control_wheels(command):
-    ser.write(command.encode('ascii'))
-    print(f'Sent command: {command}')
-    time.sleep(1)
-    if ser.in_waiting > 0:
-        response = ser.readline().decode('utf-8').strip()
-        print(f'Arduino response: {response}')
+    # returns at once; .result(timeout) on the returned future waits for the Arduino's reply
+    return wheels.send(command)
 
 if __name__ == "__main__":
     control_wheels('1')
     time.sleep(10)
-    control_wheels('0')
\ No newline at end of file
+    control_wheels('0').result(timeout=1.0)
+    wheels.close()
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+dual_arm.py
+Both xarms at once, each on its own thread, with named sync points.
+
+PURPOSE: The patch scripts drive blue and black one move after another
+         with wait=True, so one arm sits idle through every move of the
+         other even when they don't depend on each other. An ArmPlan gives
+         each arm its own list of steps (moves, motor calls, sleeps) and
+         runs the lists side by side; wait("name") holds an arm until the
+         other has reached signal("name"), so only the real dependencies
+         ("black sprays once blue is at the spray pose") are serialised and
+         the sequence takes its critical path instead of the sum of every
+         move.
+
+         run() checks first that every wait() is signalled and that the
+         waits can't deadlock. If a step raises, or run() is interrupted
+         (Ctrl-C), the other arm stops before its next step; a failed step
+         makes run() raise RuntimeError. run(concurrent=False) runs the
+         same plan on one thread, one arm at a time, like the old scripts.
+
+USAGE:
+    plan = ArmPlan()
+    blue_moves = plan.arm("blue", blue)
+    black_moves = plan.arm("black", black)
+    blue_moves.move(4, 362, 2000)
+    blue_moves.signal("spray pose")
+    black_moves.wait("spray pose")
+    black_moves.move(1, 500)
+    plan.run()
+    print(plan.summary())
+"""
+
+import threading
+import time
+
+
+class ArmSteps:
+    """One arm's steps, in order; build with move/do/sleep/signal/wait."""
+
+    def __init__(self, plan, name, controller):
+        self.plan = plan
+        self.name = name
+        self.controller = controller
+        self.steps = []          # (kind, argument)
+        self.busy = 0.0          # s spent on steps in the last run
+        self.waited = 0.0        # s spent waiting for the other arm
+
+    def move(self, servos, position=None, duration=1000):
+        """controller.setPosition(servos, position, duration, wait=True)."""
+        self.steps.append(("move", (servos, position, duration)))
+        return self
+
+    def do(self, fn, *args):
+        """Call fn(*args) at this point, e.g. a suction motor command."""
+        self.steps.append(("do", (fn, args)))
+        return self
+
+    def sleep(self, seconds):
+        self.steps.append(("sleep", seconds))
+        return self
+
+    def signal(self, name):
+        self.steps.append(("signal", name))
+        return self
+
+    def wait(self, name):
+        self.steps.append(("wait", name))
+        return self
+
+    def execute(self, kind, arg):
+        t0 = self.plan.clock()
+        if kind == "move":
+            servos, position, duration = arg
+            self.controller.setPosition(servos, position, duration, wait=True)
+        elif kind == "do":
+            fn, args = arg
+            fn(*args)
+        elif kind == "sleep":
+            self.plan.sleep(arg)
+        elif kind == "signal":
+            self.plan.events[arg].set()
+        self.busy += self.plan.clock() - t0
+
+
+class ArmPlan:
+    """Steps for several arms, run concurrently with wait/signal ordering."""
+
+    def __init__(self, clock=time.monotonic, sleep=time.sleep):
+        self.clock = clock
+        self.sleep = sleep
+        self.arms = []
+        self.events = {}
+        self.abort = threading.Event()
+        self.errors = []
+        self.elapsed = None
+
+    def arm(self, name, controller):
+        steps = ArmSteps(self, name, controller)
+        self.arms.append(steps)
+        return steps
+
+    def check(self):
+        """Raise ValueError if some wait() could never be satisfied."""
+        signalled = set()
+        position = {arm.name: 0 for arm in self.arms}
+        progress = True
+        while progress:
+            progress = False
+            for arm in self.arms:
+                for kind, arg in arm.steps[position[arm.name]:]:
+                    if kind == "wait" and arg not in signalled:
+                        break
+                    if kind == "signal":
+                        signalled.add(arg)
+                    position[arm.name] += 1
+                    progress = True
+        for arm in self.arms:
+            if position[arm.name] < len(arm.steps):
+                name = arm.steps[position[arm.name]][1]
+                raise ValueError(f"{arm.name} would wait forever for {name!r}")
+
+    def run(self, concurrent=True):
+        """Run every arm's steps; returns the wall time in seconds."""
+        self.check()
+        self.events = {arg: threading.Event() for arm in self.arms
+                       for kind, arg in arm.steps if kind == "signal"}
+        self.abort.clear()
+        self.errors = []
+        for arm in self.arms:
+            arm.busy = arm.waited = 0.0
+        t0 = self.clock()
+        if concurrent:
+            threads = [threading.Thread(target=self._worker, args=(arm,), daemon=True)
+                       for arm in self.arms]
+            for thread in threads:
+                thread.start()
+            try:
+                for thread in threads:
+                    thread.join()
+            finally:
+                # on Ctrl-C too: each arm stops before its next step
+                self.abort.set()
+        else:
+            self._serial()
+        self.elapsed = self.clock() - t0
+        if self.errors:
+            name, error = self.errors[0]
+            raise RuntimeError(f"{name} arm failed: {error}") from error
+        return self.elapsed
+
+    def _worker(self, arm):
+        try:
+            for kind, arg in arm.steps:
+                if self.abort.is_set():
+                    return
+                if kind == "wait":
+                    t0 = self.clock()
+                    while not self.events[arg].wait(0.1):
+                        if self.abort.is_set():
+                            return
+                    arm.waited += self.clock() - t0
+                else:
+                    arm.execute(kind, arg)
+        except Exception as e:
+            self.errors.append((arm.name, e))
+            self.abort.set()
+
+    def _serial(self):
+        # one arm at a time, switching arms only where one has to wait
+        position = {arm.name: 0 for arm in self.arms}
+        remaining = True
+        while remaining:
+            remaining = False
+            for arm in self.arms:
+                for kind, arg in arm.steps[position[arm.name]:]:
+                    if kind == "wait" and not self.events[arg].is_set():
+                        remaining = True
+                        break
+                    try:
+                        if kind != "wait":
+                            arm.execute(kind, arg)
+                    except Exception as e:
+                        self.errors.append((arm.name, e))
+                        return
+                    position[arm.name] += 1
+
+    def summary(self):
+        if self.elapsed is None:
+            return "not run yet"
+        lines = [f"{arm.name:>6}: {arm.busy:6.1f} s moving, {arm.waited:6.1f} s waiting"
+                 for arm in self.arms]
+        total = sum(arm.busy for arm in self.arms)
+        lines.append(f"  {self.elapsed:.1f} s wall time, {total:.1f} s one arm after the other")
+        return "\n".join(lines)
@@ -0,0 +1,65 @@
+# Patch application (x_s_a_test1's sequence, built by patch_sequence) one
+# arm after the other vs both arms at once through ArmPlan.
+#
+# Simulated controllers: a move with wait=True takes its duration, motor
+# commands take no time, and everything runs SCALE times faster than real
+# time; the times printed are scaled back to robot seconds.
+#
+#   python -m xarm_scripts.dual_arm_bench
+
+import time
+
+from xarm_scripts.dual_arm import ArmPlan
+from xarm_scripts.xarm_suction.patch_sequence import patch_plan
+
+SCALE = 20
+
+
+class SimController:
+    def __init__(self):
+        self.position = {}
+
+    def setPosition(self, servos, position=None, duration=1000, wait=False):
+        self.position[servos] = position
+        if wait:
+            time.sleep(duration / 1000 / SCALE)
+
+
+class SimMotor:
+    """Suction motor driver whose commands take no time."""
+
+    def set_speed(self, level):
+        pass
+
+    def M1(self, direction):
+        pass
+
+    def M2(self, direction):
+        pass
+
+
+def sim_plan():
+    plan = ArmPlan(sleep=lambda seconds: time.sleep(seconds / SCALE))
+    return patch_plan(SimController(), SimController(), SimMotor(), plan)
+
+
+def main():
+    for name, concurrent in (("one arm after the other", False), ("ArmPlan, both arms", True)):
+        plan = sim_plan()
+        plan.run(concurrent=concurrent)
+        print(f"{name}: {plan.elapsed * SCALE:5.1f} s")
+        for arm in plan.arms:
+            print(f"  {arm.name:>5}: {arm.busy * SCALE:5.1f} s moving, {arm.waited * SCALE:5.1f} s waiting")
+
+    # each arm waiting for the other before it signals
+    plan = ArmPlan()
+    plan.arm("blue", SimController()).wait("sprayed").signal("blue at spray pose")
+    plan.arm("black", SimController()).wait("blue at spray pose").signal("sprayed")
+    try:
+        plan.check()
+    except ValueError as e:
+        print(f"deadlocked plan rejected before moving: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@
 from suction import motor_driver_test1
 import time
 import xarm
+from xarm_scripts.dual_arm import ArmPlan
 #from wheels import wheels_test1
 #from lidar import lidar_test2
 from display import display_test1
@@ -56,61 +57,75 @@ black_servo4 = xarm.Servo(4)
 black_servo5 = xarm.Servo(5)
 black_servo6 = xarm.Servo(6)
 
+# each arm runs its own list of moves on its own thread; wait() holds an
+# arm until the other reaches the matching signal()
+plan = ArmPlan()
+blue_moves = plan.arm("blue", blue)
+black_moves = plan.arm("black", black)
+
 # set default position for blue (do s5 before s6)
-blue.setPosition(5, 1000, wait=True)
-blue.setPosition(6, 136, wait=True)
-blue.setPosition(4, 486, wait = True)
-blue.setPosition(3, 103, wait = True)
-blue.setPosition(2, 679, wait = True)
-
-# set default for black
-black.setPosition(5, 881, wait=True)
-#black.setPosition(6, 500, wait = True)
-black.setPosition(4, 488, wait = True)
-black.setPosition(3, 859, wait = True)
-black.setPosition(2, 462, wait = True)
-black.setPosition(1, 315, wait = True)
+blue_moves.move(5, 1000)
+blue_moves.move(6, 136)
+blue_moves.move(4, 486)
+blue_moves.move(3, 103)
+blue_moves.move(2, 679)
+
+# set default for black, at the same time
+black_moves.move(5, 881)
+#black_moves.move(6, 500)
+black_moves.move(4, 488)
+black_moves.move(3, 859)
+black_moves.move(2, 462)
+black_moves.move(1, 315)
 '''
 # blue dispense sponge
-blue.setPosition(5, 1000, wait=True)
-blue.setPosition(4, 486, wait = True)
-blue.setPosition(3, 103, wait = True) '''
-motor_driver_test1.set_speed("h")
-'''motor_driver_test1.M2("f")
-time.sleep(5.00)
-motor_driver_test1.M2("b")
-time.sleep(5.00)
-motor_driver_test1.M2("s")
+blue_moves.move(5, 1000)
+blue_moves.move(4, 486)
+blue_moves.move(3, 103) '''
+blue_moves.do(motor_driver_test1.set_speed, "h")
+'''blue_moves.do(motor_driver_test1.M2, "f")
+blue_moves.sleep(5.00)
+blue_moves.do(motor_driver_test1.M2, "b")
+blue_moves.sleep(5.00)
+blue_moves.do(motor_driver_test1.M2, "s")
 '''
 
 # blue grab patch
-blue.setPosition(6, 871, 2000, wait=True) #865
-blue.setPosition(5, 517, 2000, wait = True) #500
-blue.setPosition(4, 807, 2000, wait = True) #900
-blue.setPosition(3, 73, 2000, wait =True) #100
-motor_driver_test1.M1("f")
-time.sleep(5.00)
+blue_moves.move(6, 871, 2000) #865
+blue_moves.move(5, 517, 2000) #500
+blue_moves.move(4, 807, 2000) #900
+blue_moves.move(3, 73, 2000) #100
+blue_moves.do(motor_driver_test1.M1, "f")
+blue_moves.sleep(5.00)
 
 # blue spray position
-#blue.setPosition(5, 600, wait=True)
-blue.setPosition(4, 362, 2000, wait=True)
-blue.setPosition(3, 751, 2000, wait=True)
-blue.setPosition(6, 490, 2000, wait = True)
-blue.setPosition(5, 870, 2000, wait = True)
-
-# black spray
-black.setPosition(4, 495, wait = True)
-black.setPosition(3, 830, wait = True)
-black.setPosition(2, 433, wait = True)
-black.setPosition(1, 500, wait = True)
-black.setPosition(1, 315, wait=True)
-time.sleep(2.00)
+#blue_moves.move(5, 600)
+blue_moves.move(4, 362, 2000)
+blue_moves.move(3, 751, 2000)
+blue_moves.move(6, 490, 2000)
+blue_moves.move(5, 870, 2000)
+blue_moves.signal("blue at spray pose")
+
+# black spray: lines up (a few units from its default) while blue works,
+# sprays only once blue holds the patch in the spray pose
+black_moves.move(4, 495)
+black_moves.move(3, 830)
+black_moves.move(2, 433)
+black_moves.wait("blue at spray pose")
+black_moves.move(1, 500)
+black_moves.move(1, 315)
+black_moves.signal("sprayed")
 
 # blue place patch
-blue.setPosition(6, 136, 2000, wait=True)
-blue.setPosition(5, 1000, 2000, wait=True)
-blue.setPosition(4, 486, 2000, wait = True)
-blue.setPosition(3, 103, 2000, wait = True)
-time.sleep(2.00)
-motor_driver_test1.M1("s")
+blue_moves.wait("sprayed")
+blue_moves.sleep(2.00)
+blue_moves.move(6, 136, 2000)
+blue_moves.move(5, 1000, 2000)
+blue_moves.move(4, 486, 2000)
+blue_moves.move(3, 103, 2000)
+blue_moves.sleep(2.00)
+blue_moves.do(motor_driver_test1.M1, "s")
+
+plan.run()
+print(plan.summary())
 display_test1.stop_image(display_proc)
@@ -0,0 +1,81 @@
+# x_s_a_test1's patch application as an ArmPlan, shared with
+# xarm_scripts.dual_arm_bench so the bench times the sequence the robot runs.
+#
+# `motor` is the suction motor driver (suction.motor_driver_test1 on the
+# robot): set_speed(level), M1(direction), M2(direction).
+#
+#   plan = patch_plan(blue, black, motor_driver_test1)
+#   plan.run()
+
+from xarm_scripts.dual_arm import ArmPlan
+
+
+def patch_plan(blue, black, motor, plan=None):
+    """Add the blue and black arms' patch sequence to `plan` (a new ArmPlan
+    if None) and return it."""
+    plan = plan or ArmPlan()
+    blue_moves = plan.arm("blue", blue)
+    black_moves = plan.arm("black", black)
+
+    # set default position for blue (do s5 before s6)
+    blue_moves.move(5, 1000)
+    blue_moves.move(6, 136)
+    blue_moves.move(4, 486)
+    blue_moves.move(3, 103)
+    blue_moves.move(2, 679)
+
+    # set default for black, at the same time
+    black_moves.move(5, 881)
+    # s6 is not moving
+    black_moves.move(4, 488)
+    black_moves.move(3, 859)
+    black_moves.move(2, 462)
+    black_moves.move(1, 315)
+
+    # blue dispense sponge
+    blue_moves.move(5, 1000)
+    blue_moves.move(4, 486)
+    blue_moves.move(3, 103)
+    blue_moves.do(motor.set_speed, "h")
+    blue_moves.do(motor.M2, "f")
+    blue_moves.sleep(5.00)
+    blue_moves.do(motor.M2, "b")
+    blue_moves.sleep(5.00)
+    blue_moves.do(motor.M2, "s")
+
+    # blue grab patch
+    blue_moves.move(6, 865, 2000)
+    blue_moves.move(5, 500, 2000)
+    blue_moves.move(4, 900, 2000)
+    blue_moves.move(3, 100, 2000)
+    blue_moves.do(motor.M1, "f")
+    blue_moves.sleep(5.00)
+
+    # blue spray position
+    #blue_moves.move(5, 600)
+    blue_moves.move(4, 362, 2000)
+    blue_moves.move(3, 751, 2000)
+    blue_moves.move(6, 490, 2000)
+    blue_moves.move(5, 870, 2000)
+    blue_moves.signal("blue at spray pose")
+
+    # black spray: lines up (a few units from its default) while blue works,
+    # sprays only once blue holds the patch in the spray pose
+    black_moves.move(4, 495)
+    black_moves.move(3, 830)
+    black_moves.move(2, 433)
+    black_moves.wait("blue at spray pose")
+    black_moves.move(1, 500)
+    black_moves.move(1, 315)
+    black_moves.signal("sprayed")
+
+    # blue place patch
+    blue_moves.wait("sprayed")
+    blue_moves.sleep(2.00)
+    blue_moves.move(6, 136, 2000)
+    blue_moves.move(5, 1000, 2000)
+    blue_moves.move(4, 486, 2000)
+    blue_moves.move(3, 103, 2000)
+    blue_moves.sleep(3.00)
+    blue_moves.do(motor.M1, "s")
+    return plan
@@ -2,6 +2,7 @@
 from suction import motor_driver_test1
 import time
 import xarm
+from xarm_scripts.xarm_suction.patch_sequence import patch_plan
 
 #initialization
 motor_driver_test1.init()
@@ -24,59 +25,9 @@ black_servo4 = xarm.Servo(4)
 black_servo5 = xarm.Servo(5)
 black_servo6 = xarm.Servo(6)
 
-# set default position for blue (do s5 before s6)
-blue.setPosition(5, 1000, wait=True)
-blue.setPosition(6, 136, wait=True)
-blue.setPosition(4, 486, wait = True)
-blue.setPosition(3, 103, wait = True)
-blue.setPosition(2, 679, wait = True)
+# each arm runs its own list of moves on its own thread; wait() holds an
+# arm until the other reaches the matching signal() (see patch_sequence.py)
+plan = patch_plan(blue, black, motor_driver_test1)
 
-# set default for black
-black.setPosition(5, 881, wait=True)
-# s6 is not moving
-black.setPosition(4, 488, wait = True)
-black.setPosition(3, 859, wait = True)
-black.setPosition(2, 462, wait = True)
-black.setPosition(1, 315, wait = True)
-
-# blue dispense sponge
-blue.setPosition(5, 1000, wait=True)
-blue.setPosition(4, 486, wait = True)
-blue.setPosition(3, 103, wait = True)
-motor_driver_test1.set_speed("h")
-motor_driver_test1.M2("f")
-time.sleep(5.00)
-motor_driver_test1.M2("b")
-time.sleep(5.00)
-motor_driver_test1.M2("s")
-
-# blue grab patch
-blue.setPosition(6, 865, 2000, wait=True)
-blue.setPosition(5, 500, 2000, wait = True)
-blue.setPosition(4, 900, 2000, wait = True)
-blue.setPosition(3, 100, 2000, wait =True)
-motor_driver_test1.M1("f")
-time.sleep(5.00)
-
-# blue spray position
-#blue.setPosition(5, 600, wait=True)
-blue.setPosition(4, 362, 2000, wait=True)
-blue.setPosition(3, 751, 2000, wait=True)
-blue.setPosition(6, 490, 2000, wait = True)
-blue.setPosition(5, 870, 2000, wait = True)
-
-# black spray
-black.setPosition(4, 495, wait = True)
-black.setPosition(3, 830, wait = True)
-black.setPosition(2, 433, wait = True)
-black.setPosition(1, 500, wait = True)
-black.setPosition(1, 315, wait=True)
-time.sleep(2.00)
-
-# blue place patch
-blue.setPosition(6, 136, 2000, wait=True)
-blue.setPosition(5, 1000, 2000, wait=True)
-blue.setPosition(4, 486, 2000, wait = True)
-blue.setPosition(3, 103, 2000, wait = True)
-time.sleep(3.00)
-motor_driver_test1.M1("s")
\ No newline at end of file
+plan.run()
+print(plan.summary())
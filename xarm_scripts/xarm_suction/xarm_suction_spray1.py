@@ -4,6 +4,7 @@
 # Will need to be modified to accomodate true patch dimensions
 
 import xarm
+from xarm_scripts.dual_arm import ArmPlan
 from suction import suction_test1
 import time
 
@@ -16,6 +17,12 @@ suction_test1.init()
 print("Battery voltage of blue: ", blue.getBatteryVoltage())
 print("Battery voltage of black: ", black.getBatteryVoltage())
 
+# each arm runs its own list of moves on its own thread; wait() holds an
+# arm until the other reaches the matching signal()
+plan = ArmPlan()
+blue_moves = plan.arm("blue", blue)
+black_moves = plan.arm("black", black)
+
 # Black default positions
 black_servo1 = xarm.Servo(1, 380)
 black_servo2 = xarm.Servo(2, 436)
@@ -23,9 +30,9 @@ black_servo3 = xarm.Servo(3, 500)
 black_servo4 = xarm.Servo(4, 500)
 black_servo5 = xarm.Servo(5, 500)
 black_servo6 = xarm.Servo(6, 500)
-black.setPosition([black_servo1, black_servo2, black_servo3, black_servo4, black_servo5, black_servo6], wait = True)
+black_moves.move([black_servo1, black_servo2, black_servo3, black_servo4, black_servo5, black_servo6])
 
-# Blue default positions
+# Blue default positions, at the same time
 # Note that there is no servo1 - no claw
 blue_servo2 = xarm.Servo(2)
 blue_servo3 = xarm.Servo(3, 883)
@@ -33,28 +40,33 @@ blue_servo4 = xarm.Servo(4, 500)
 blue_servo5 = xarm.Servo(5, 500)
 blue_servo6 = xarm.Servo(6, 550)
 # No need to modify servo2 - will stay constant
-blue.setPosition([blue_servo3, blue_servo4, blue_servo5, blue_servo6], wait = True)
+blue_moves.move([blue_servo3, blue_servo4, blue_servo5, blue_servo6])
 
 # Grab the patch
-blue.setPosition(5, 500, wait=True)
-blue.setPosition(6, 150, wait=True)
-blue.setPosition(4, 830, wait = True)
-blue.setPosition(3, 138, wait = 5.00)
-suction_test1.control_motor("h")
-suction_test1.control_motor("f")
-time.sleep(5.00)
+blue_moves.move(5, 500)
+blue_moves.move(6, 150)
+blue_moves.move(4, 830)
+blue_moves.move(3, 138)
+blue_moves.do(suction_test1.control_motor, "h")
+blue_moves.do(suction_test1.control_motor, "f")
+blue_moves.sleep(5.00)
 
 # Take it out
-blue.setPosition(3, 870, wait = True)
-blue.setPosition(4, 570, wait = True)
-blue.setPosition(6, 500, wait = True)
-time.sleep(1.00)
-suction_test1.control_motor("s")
+blue_moves.move(3, 870)
+blue_moves.move(4, 570)
+blue_moves.move(6, 500)
+blue_moves.sleep(1.00)
+blue_moves.do(suction_test1.control_motor, "s")
+blue_moves.signal("patch out")
+
 
 
 
+# Black position to spray, once blue has the patch out
+black_moves.wait("patch out")
+black_moves.move(6, 200)
+black_moves.move(3, 120)
+black_moves.move(2, 490)
 
-# Black position to spray
-black.setPosition(6, 200, wait = True)
-black.setPosition(3, 120, wait = True)
-black.setPosition(2, 490, wait = True)
+plan.run()
+print(plan.summary())
@@ -0,0 +1,71 @@
+# Distance-servoed approach for the xarm.
+#
+# Instead of moving servos 3/4 a fixed 10 degrees, waiting for the move,
+# and pinging again, the controller reads every fresh sample from the
+# background ultrasonic sampler and streams a small non-blocking move whose
+# size is proportional to the distance still to go. The arm slows as it
+# closes in and stops within TOLERANCE of the target instead of
+# overshooting by a whole step.
+
+import time
+
+TARGET = 8.0        # cm
+TOLERANCE = 0.5     # cm
+GAIN = 0.8          # degrees of servo travel per cm of remaining distance
+MAX_STEP = 5.0      # degrees per update
+MIN_STEP = 0.25     # degrees per update, so the last few cm still close
+MIN_ANGLE = -125.0  # servo travel limit in degrees
+TIMEOUT = 30.0      # seconds
+MEDIAN_OF = 3       # readings a fresh one is checked against
+OUTLIER = 4.0       # cm from that median before a reading counts as a spurious echo
+MAX_AGE = 0.2       # seconds
+
+
+def approach(arm, sampler, servos=(3, 4), target=TARGET, tolerance=TOLERANCE,
+             gain=GAIN, timeout=TIMEOUT):
+    """Lower `servos` until the sampler reads `target` cm (+ tolerance).
+
+    Returns (time_to_contact, final_distance); time_to_contact is None if
+    the target was not reached before the timeout or the servo limit.
+    """
+    t0 = time.monotonic()
+    angles = {s: arm.getPosition(s, True) for s in servos}
+    steps = 0
+    dist = None
+
+    while time.monotonic() - t0 < timeout:
+        if not sampler.wait_next():
+            continue
+        dist = sampler.latest(max_age=MAX_AGE)
+        med = sampler.median(MEDIAN_OF, max_age=MAX_AGE)
+        if dist is None or med is None:
+            # missed echo, hold position until the next sample
+            continue
+        if abs(dist - med) > OUTLIER:
+            # a lone short or long echo the neighbouring pings don't agree
+            # with; acting on it would end the approach early or take a
+            # full-size step, so hold until the readings agree again
+            continue
+
+        error = dist - target
+        if error <= tolerance:
+            # hold where the servos are now rather than finishing the last step
+            arm.setPosition([[s, arm.getPosition(s, True)] for s in servos], wait=False)
+            elapsed = time.monotonic() - t0
+            print(f"reached {dist:.2f} cm in {elapsed:.2f} s ({steps} updates)")
+            return elapsed, dist
+
+        step = min(MAX_STEP, max(MIN_STEP, gain * error))
+        if any(angles[s] - step < MIN_ANGLE for s in servos):
+            print(f"servo limit reached at {dist:.2f} cm")
+            return None, dist
+        for s in servos:
+            angles[s] -= step
+        # one sampler period per update, so the servo finishes each step
+        # just as the next reading comes in
+        arm.setPosition([[s, angles[s]] for s in servos],
+                        duration=int(sampler.period * 1000), wait=False)
+        steps += 1
+
+    print(f"approach timed out at {dist} cm")
+    return None, dist
@@ -0,0 +1,105 @@
+# Time-to-contact of the streamed approach vs the old fixed 10 degree loop.
+#
+# Simulated arm: servos 3/4 slew towards their commanded angles at
+# SERVO_SPEED and the ultrasonic distance shrinks by CM_PER_DEGREE for
+# every degree servo 3 travels; every SPURIOUS_EVERY-th ping reads a
+# spurious short echo. The streamed approach runs for real against a
+# simulated 20 Hz sampler; the old loop is costed from its
+# structure (2 s sleep per ping + a 10 degree move with wait=True).
+#
+#   python -m xarm_scripts.xarm_ultra.approach_bench [start_cm]
+
+import statistics
+import sys
+import time
+
+from xarm_scripts.xarm_ultra import approach as ctl
+
+START = 40.0          # cm
+CM_PER_DEGREE = 0.6
+SERVO_SPEED = 120.0   # degrees per second
+OLD_STEP = 10.0       # degrees
+OLD_PING_SLEEP = 2.0  # seconds, from the old get_distance()
+SPURIOUS_EVERY = 7
+SPURIOUS_CM = 3.0
+
+
+class SimArm:
+    def __init__(self):
+        self.t = time.monotonic()
+        self.angle = {3: 90.0, 4: 0.0}
+        self.goal = dict(self.angle)
+
+    def _update(self):
+        now = time.monotonic()
+        travel = SERVO_SPEED * (now - self.t)
+        self.t = now
+        for s, goal in self.goal.items():
+            delta = goal - self.angle[s]
+            self.angle[s] += max(-travel, min(travel, delta))
+
+    def getPosition(self, servo, degrees=False):
+        self._update()
+        return self.angle[servo]
+
+    def setPosition(self, servos, duration=1000, wait=False):
+        self._update()
+        for s, angle in servos:
+            self.goal[s] = angle
+
+
+class SimSampler:
+    period = 0.05
+
+    def __init__(self, arm, start):
+        self.arm = arm
+        self.start = start
+        self.readings = []
+
+    def distance(self):
+        travelled = 90.0 - self.arm.getPosition(3)
+        return round(self.start - CM_PER_DEGREE * travelled, 2)
+
+    def wait_next(self, timeout=1.0):
+        time.sleep(self.period)
+        spurious = len(self.readings) % SPURIOUS_EVERY == SPURIOUS_EVERY - 1
+        self.readings.append(SPURIOUS_CM if spurious else self.distance())
+        return True
+
+    def latest(self, max_age=None):
+        return self.readings[-1] if self.readings else None
+
+    def median(self, n=5, max_age=None):
+        return statistics.median(self.readings[-n:]) if self.readings else None
+
+
+def old_loop_time(start):
+    t = OLD_PING_SLEEP
+    dist = start
+    steps = 0
+    while dist > ctl.TARGET:
+        t += OLD_STEP / SERVO_SPEED + OLD_PING_SLEEP
+        dist -= CM_PER_DEGREE * OLD_STEP
+        steps += 1
+    return t, dist, steps
+
+
+def main():
+    start = float(sys.argv[1]) if len(sys.argv) > 1 else START
+    arm = SimArm()
+    sampler = SimSampler(arm, start)
+    elapsed, dist = ctl.approach(arm, sampler)
+    time.sleep(0.5)
+    dist = sampler.distance()
+    old_t, old_dist, old_steps = old_loop_time(start)
+    print(f"start {start:.1f} cm, target {ctl.TARGET:.1f} +/- {ctl.TOLERANCE:.1f} cm")
+    print(f"  fixed 10 deg loop: {old_t:6.2f} s  stops at {old_dist:6.2f} cm  ({old_steps} steps)")
+    if elapsed is None:
+        print(f"  streamed approach: did not reach the target, stopped at {dist:6.2f} cm")
+        return
+    print(f"  streamed approach: {elapsed:6.2f} s  settles at {dist:6.2f} cm")
+    print(f"  speed-up         : {old_t / elapsed:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
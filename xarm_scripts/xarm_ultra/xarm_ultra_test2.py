@@ -1,13 +1,18 @@
-import lgpio as GPIO
 import time
 import xarm
 
+from hardware import gpio_registry
+from ultrasonic.ranging import AlertRanger
+from ultrasonic.sampler import UltrasonicSampler
+from xarm_scripts.xarm_ultra.approach import approach
+
 # set arm output location
 arm = xarm.Controller("USB")
 
 # set pins
 TRIG = 23
 ECHO = 24
+MAX_AGE = 0.5  # s; older readings count as no reading
 
 # set arm starting location
 servo1 = xarm.Servo(1, 90.0)
@@ -19,66 +24,38 @@ servo6 = xarm.Servo(6, 90.0)
 arm.setPosition([servo1, servo2, servo3, servo4, servo5, servo6], wait = True)
 
 
-# open the gpio chip and set the gpio direction
-h = GPIO.gpiochip_open(0)
-GPIO.gpio_claim_output(h, TRIG)
-GPIO.gpio_claim_input(h, ECHO)
+def _setup(h):
+	# ping continuously in the background at 20 Hz
+	sampler = UltrasonicSampler(AlertRanger(h, TRIG, ECHO), rate=20)
+	sampler.start()
+	return sampler
+
+# reserve the pins; the shared gpio chip is opened, TRIG claimed, ECHO
+# set up for edge alerts and the sampler started on the first reading
+sensor = gpio_registry.declare("xarm_ultra", outputs=[TRIG], reserved=[ECHO], setup=_setup)
 
 def get_distance():
-	# set trig low
-	GPIO.gpio_write(h, TRIG, 0)
-	time.sleep(2)
-	
-	
-	# send 10us pulse to trig
-	GPIO.gpio_write(h, TRIG, 1)
-	time.sleep(0.00001)
-	GPIO.gpio_write(h, TRIG, 0)
-	
-	
-	# start recording the time when the wave is sent
-	while GPIO.gpio_read(h, ECHO) == 0:
-		pulse_start = time.time()
-		
-		
-	# record time of arrival
-	while GPIO.gpio_read(h, ECHO) == 1:
-		pulse_end = time.time()
-	
+	sampler = sensor.device
 
-	# calculate the difference in times
-	pulse_duration = pulse_end - pulse_start
-	
-	# multiply with the sonic speed (34300 cm/s)
-	# and divide by 2 to avoid counting both distances there and back
-	distance = pulse_duration * 17150
-	distance = round(distance, 2)
-	
-	return distance
+	# only the first call waits for a ping; after that this is a buffer read.
+	# median of the last 3 pings (~150 ms), None if none of them echoed
+	# or the sampler has stopped producing readings
+	sampler.wait_ready()
+	return sampler.median(3, max_age=MAX_AGE)
 
 if __name__ == '__main__':
 	try:
 		time.sleep(5)
 		dist = get_distance()
-		print("Measured distance = {:.2f} cm".format(dist))
-		while dist > 8.0:
-			print("Distance is bigger than 8.0 cm")
-			# find current angle
-			current_pos3 = arm.getPosition(servo3, True)
-			print("current pos of servo3: ", current_pos3)
-			current_pos4 = arm.getPosition(servo4, True)
-			print("current pos of servo4: ", current_pos4)
-			# set position to current angle +/- 1 degree
-			arm.setPosition([[3, current_pos3 - 10.0], [4, current_pos4 - 10.0]], wait = True)
-			
-			#arm.setPosition(1, current_pos3 + 10.0)
-			#arm.setPosition(3, current_pos3 - 20.0)
-			#arm.setPosition(4, current_pos4 - 10.0)
-			dist = get_distance()
+		if dist is not None:
 			print("Measured distance = {:.2f} cm".format(dist))
-		print("reached!")
+		# stream proportional moves to servos 3 and 4 on every fresh reading
+		# until the sensor is within 0.5 cm of 8.0 cm
+		time_to_contact, dist = approach(arm, sensor.device, servos=(3, 4), target=8.0)
+		if time_to_contact is not None:
+			print("reached!")
 				
 	# reset by pressing ctrl c
 	except KeyboardInterrupt:
 		print("action stopped by user")
-		GPIO.gpiochip_close(h)
+		gpio_registry.close()